@@ -9,7 +9,9 @@ import logging
 
 from ....core.database import get_mongodb
 from ....services.ai_service import AIAnalysisService
-from ....services.symptom_analyzer import SymptomAnalyzer
+from ....services.symptom_analyzer import SymptomAnalyzer, get_symptom_analyzer
+from ....services.analysis_cache import symptom_analysis_cache
+from ....services.analysis_executor import AnalysisOverloadedError, analysis_executor
 from ....services.prescription_analyzer import PrescriptionAnalyzer
 from ....services.medical_image_analyzer import MedicalImageAnalyzer
 from ....models.ai_models import (
@@ -30,17 +32,16 @@ logger = logging.getLogger(__name__)
 async def analyze_symptoms(
     request: SymptomAnalysisRequest,
     background_tasks: BackgroundTasks,
-    db=Depends(get_mongodb)
+    db=Depends(get_mongodb),
+    analyzer: SymptomAnalyzer = Depends(get_symptom_analyzer)
 ):
     """
     Advanced AI-powered symptom analysis
     """
     try:
-        # Initialize symptom analyzer
-        analyzer = SymptomAnalyzer()
-        
         # Perform analysis
-        analysis_result = await analyzer.analyze_symptoms(
+        analysis_result = await symptom_analysis_cache.analyze(
+            analyzer,
             symptoms=request.symptoms,
             patient_age=request.patient_age,
             patient_gender=request.patient_gender,
@@ -76,6 +77,9 @@ async def analyze_symptoms(
         
         return analysis_result
         
+    except AnalysisOverloadedError as e:
+        logger.warning(str(e))
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": str(e.retry_after)})
     except Exception as e:
         logger.error(f"Error in symptom analysis: {str(e)}")
         raise HTTPException(status_code=500, detail="Analysis failed")
@@ -123,6 +127,9 @@ async def analyze_prescription(
         
         return analysis_result
         
+    except AnalysisOverloadedError as e:
+        logger.warning(str(e))
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": str(e.retry_after)})
     except Exception as e:
         logger.error(f"Error in prescription analysis: {str(e)}")
         raise HTTPException(status_code=500, detail="Prescription analysis failed")
@@ -174,6 +181,9 @@ async def analyze_medical_image(
         
         return analysis_result
         
+    except AnalysisOverloadedError as e:
+        logger.warning(str(e))
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": str(e.retry_after)})
     except Exception as e:
         logger.error(f"Error in medical image analysis: {str(e)}")
         raise HTTPException(status_code=500, detail="Medical image analysis failed")
@@ -304,6 +314,13 @@ async def schedule_follow_up_recommendations(patient_id: str, analysis_result):
     except Exception as e:
         logger.error(f"Error scheduling follow-up: {str(e)}")
 
+@router.get("/executor-stats")
+async def get_executor_statistics():
+    """
+    Get analysis process pool queue depth, backpressure and queue-wait metrics
+    """
+    return analysis_executor.get_stats()
+
 @router.get("/ai-stats")
 async def get_ai_statistics(db=Depends(get_mongodb)):
     """
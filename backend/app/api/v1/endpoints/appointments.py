@@ -10,7 +10,9 @@ import logging
 from ....core.database import get_mongodb
 from ....services.integration_service import nextjs_integration, notification_integration
 from ....services.ai_service import AIAnalysisService
-from ....services.symptom_analyzer import SymptomAnalyzer
+from ....services.symptom_analyzer import SymptomAnalyzer, get_symptom_analyzer
+from ....services.analysis_cache import symptom_analysis_cache
+from ....services.analysis_executor import AnalysisOverloadedError
 from ....core.logging_config import healthcare_logger
 from ....models.ai_models import SymptomAnalysisRequest
 
@@ -21,7 +23,8 @@ logger = logging.getLogger(__name__)
 async def ai_enhanced_appointment_booking(
     appointment_data: Dict[str, Any],
     background_tasks: BackgroundTasks,
-    db=Depends(get_mongodb)
+    db=Depends(get_mongodb),
+    symptom_analyzer: SymptomAnalyzer = Depends(get_symptom_analyzer)
 ):
     """
     AI-enhanced appointment booking with symptom analysis and smart scheduling
@@ -40,7 +43,6 @@ async def ai_enhanced_appointment_booking(
         # AI-powered symptom analysis if symptoms provided
         ai_analysis = None
         if symptoms:
-            symptom_analyzer = SymptomAnalyzer()
             analysis_request = SymptomAnalysisRequest(
                 patient_id=patient_id,
                 symptoms=symptoms,
@@ -49,13 +51,19 @@ async def ai_enhanced_appointment_booking(
                 medical_history=appointment_data.get("medical_history", [])
             )
 
-            ai_analysis = await symptom_analyzer.analyze_symptoms(
-                symptoms=analysis_request.symptoms,
-                patient_age=analysis_request.patient_age,
-                patient_gender=analysis_request.patient_gender,
-                medical_history=analysis_request.medical_history
-            )
-
+            try:
+                ai_analysis = await symptom_analysis_cache.analyze(
+                    symptom_analyzer,
+                    symptoms=analysis_request.symptoms,
+                    patient_age=analysis_request.patient_age,
+                    patient_gender=analysis_request.patient_gender,
+                    medical_history=analysis_request.medical_history
+                )
+            except AnalysisOverloadedError as e:
+                # Booking must not fail because the analyzer is busy
+                logger.warning(f"Skipping AI analysis for booking: {e}")
+
+        if ai_analysis:
             # Log AI analysis
             healthcare_logger.log_medical_analysis("appointment_booking_analysis", {
                 "patient_id": patient_id,
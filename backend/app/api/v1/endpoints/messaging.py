@@ -3,33 +3,97 @@ Messaging endpoints for HealthConnect
 Handles in-app messaging between patients and doctors
 """
 
-from fastapi import APIRouter, HTTPException, UploadFile, File
+from fastapi import APIRouter, HTTPException, UploadFile, File, Query, Response
 from typing import List, Dict, Any, Optional
 from datetime import datetime
+from bson import ObjectId
+import base64
+import json
 import logging
 
+from ....core.config import settings
 from ....core.database import get_mongodb
 from ....models.ai_models import MessageRequest, MessageResponse
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+# Fields read for the inbox; unread_count is filtered to the user after loading
+CONVERSATION_FIELDS = {"participants": 1, "last_message": 1, "last_message_time": 1, "unread_count": 1}
+PARTICIPANT_FIELDS = {"name": 1, "role": 1, "avatar_url": 1, "is_online": 1}
+
+def _encode_cursor(conversation: Dict[str, Any]) -> str:
+    """Opaque cursor pointing just past a conversation in inbox order"""
+    last_time = conversation.get("last_message_time")
+    position = {
+        "t": last_time.isoformat() if isinstance(last_time, datetime) else None,
+        "id": str(conversation["_id"]),
+        "oid": isinstance(conversation["_id"], ObjectId)
+    }
+    return base64.urlsafe_b64encode(json.dumps(position).encode()).decode()
+
+def _decode_cursor(cursor: str) -> Dict[str, Any]:
+    """Query filter for the conversations after a cursor (newest first, then _id descending)"""
+    try:
+        position = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        last_id = ObjectId(position["id"]) if position["oid"] else position["id"]
+        last_time = datetime.fromisoformat(position["t"]) if position["t"] else None
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    
+    if last_time is None:
+        # Conversations without a last message sort after every dated one
+        return {"last_message_time": None, "_id": {"$lt": last_id}}
+    return {"$or": [
+        {"last_message_time": {"$lt": last_time}},
+        {"last_message_time": last_time, "_id": {"$lt": last_id}},
+        {"last_message_time": None}
+    ]}
+
 @router.get("/conversations/{user_id}", response_model=List[Dict[str, Any]])
-async def get_user_conversations(user_id: str):
-    """Get all conversations for a user"""
+async def get_user_conversations(
+    user_id: str,
+    response: Response,
+    limit: int = Query(settings.CONVERSATIONS_PAGE_SIZE, ge=1, le=settings.CONVERSATIONS_MAX_PAGE_SIZE),
+    cursor: Optional[str] = None
+):
+    """
+    Get a page of a user's conversations, most recent first.
+    
+    Pages hold at most ``limit`` conversations. When more remain, the
+    ``X-Next-Cursor`` response header carries the cursor for the next page
+    (pass it back as ``cursor``). The other participants of the whole page
+    are fetched with one ``$in`` query.
+    """
     try:
         db = await get_mongodb()
         
-        # Get conversations where user is a participant
-        conversations = await db.conversations.find({
-            "participants": user_id
-        }).sort("last_message_time", -1).to_list(length=None)
+        # Get conversations where user is a participant, one extra to detect a next page
+        query = {"participants": user_id}
+        if cursor:
+            query.update(_decode_cursor(cursor))
+        conversations = await db.conversations.find(
+            query, CONVERSATION_FIELDS
+        ).sort([("last_message_time", -1), ("_id", -1)]).limit(limit + 1).to_list(length=limit + 1)
+        
+        if len(conversations) > limit:
+            conversations = conversations[:limit]
+            response.headers["X-Next-Cursor"] = _encode_cursor(conversations[-1])
+        
+        # Get the other participants' info in one round trip
+        other_participant_ids = {
+            conv["_id"]: next((p for p in conv["participants"] if p != user_id), user_id)
+            for conv in conversations
+        }
+        users = await db.users.find(
+            {"_id": {"$in": list(set(other_participant_ids.values()))}}, PARTICIPANT_FIELDS
+        ).to_list(length=None)
+        users_by_id = {user["_id"]: user for user in users}
         
         formatted_conversations = []
         for conv in conversations:
-            # Get the other participant's info
-            other_participant_id = next(p for p in conv["participants"] if p != user_id)
-            other_user = await db.users.find_one({"_id": other_participant_id})
+            other_participant_id = other_participant_ids[conv["_id"]]
+            other_user = users_by_id.get(other_participant_id, {})
             
             formatted_conversations.append({
                 "id": str(conv["_id"]),
@@ -45,6 +109,8 @@ async def get_user_conversations(user_id: str):
         
         return formatted_conversations
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error getting conversations: {e}")
         raise HTTPException(status_code=500, detail=str(e))
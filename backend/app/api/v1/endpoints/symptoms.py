@@ -2,18 +2,35 @@
 Symptom analysis endpoints
 """
 
-from fastapi import APIRouter, Depends, HTTPException
-from typing import List
-from ....models.ai_models import SymptomAnalysisRequest, SymptomAnalysisResponse
-from ....services.symptom_analyzer import SymptomAnalyzer
+from fastapi import APIRouter, Depends, HTTPException, WebSocket, WebSocketDisconnect
+from typing import Any, Dict, List, Optional
+import asyncio
+import logging
+from ....models.ai_models import (
+    SymptomAnalysisRequest,
+    SymptomAnalysisResponse,
+    SymptomBatchAnalysisRequest,
+    SymptomBatchAnalysisResponse
+)
+from ....core.security import require_admin
+from ....services.symptom_analyzer import SymptomAnalyzer, get_symptom_analyzer, reload_symptom_analyzer
+from ....services.knowledge_base import KnowledgeBaseError, activate_version
+from ....services.analysis_cache import symptom_analysis_cache
+from ....services.analysis_executor import AnalysisOverloadedError
+from ....services.symptom_session import SymptomSession
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
 @router.post("/analyze", response_model=SymptomAnalysisResponse)
-async def analyze_symptoms(request: SymptomAnalysisRequest):
+async def analyze_symptoms(
+    request: SymptomAnalysisRequest,
+    analyzer: SymptomAnalyzer = Depends(get_symptom_analyzer)
+):
     """Analyze symptoms using AI"""
-    analyzer = SymptomAnalyzer()
-    return await analyzer.analyze_symptoms(
+    return await symptom_analysis_cache.analyze(
+        analyzer,
         symptoms=request.symptoms,
         patient_age=request.patient_age,
         patient_gender=request.patient_gender,
@@ -21,6 +38,120 @@ async def analyze_symptoms(request: SymptomAnalysisRequest):
         severity_level=request.severity_level
     )
 
+@router.post("/analyze-batch", response_model=SymptomBatchAnalysisResponse)
+async def analyze_symptoms_batch(
+    request: SymptomBatchAnalysisRequest,
+    analyzer: SymptomAnalyzer = Depends(get_symptom_analyzer)
+):
+    """Analyze symptoms for many patients in one vectorized pass"""
+    results = await symptom_analysis_cache.analyze_batch(analyzer, request.requests)
+    return SymptomBatchAnalysisResponse(results=results, total_count=len(results))
+
+@router.websocket("/analyze/ws")
+async def analyze_symptoms_incrementally(
+    websocket: WebSocket,
+    patient_age: Optional[int] = None,
+    patient_gender: Optional[str] = None
+):
+    """Incremental symptom analysis for a symptom checker UI.
+    
+    Client messages (JSON):
+        {"action": "add", "symptom": "..."}
+        {"action": "remove", "symptom": "..."}
+        {"action": "clear"}
+        {"action": "analyze", "medical_history": [...], "severity_level": "..."}
+    
+    Edits are applied to the session's scored state as deltas and answered with
+    an ``update`` carrying the current emergency level, top conditions and the
+    most discriminating follow-up questions;
+    ``analyze`` returns the full analysis for the current symptoms.
+    """
+    await websocket.accept()
+    session = SymptomSession(get_symptom_analyzer(), patient_age, patient_gender)
+    
+    try:
+        while True:
+            message = await websocket.receive_json()
+            session.refresh(get_symptom_analyzer())
+            action = message.get("action") if isinstance(message, dict) else None
+            
+            try:
+                if action == "add":
+                    session.add(str(message["symptom"]))
+                elif action == "remove":
+                    session.remove(str(message["symptom"]))
+                elif action == "clear":
+                    session.clear()
+                elif action == "analyze":
+                    if not session.symptoms:
+                        raise ValueError("No symptoms to analyze")
+                    result = await symptom_analysis_cache.analyze(
+                        session.analyzer,
+                        symptoms=list(session.symptoms),
+                        patient_age=patient_age,
+                        patient_gender=patient_gender,
+                        medical_history=message.get("medical_history"),
+                        severity_level=message.get("severity_level")
+                    )
+                    await websocket.send_json({"type": "analysis", "result": result.model_dump(mode="json")})
+                    continue
+                else:
+                    raise ValueError(f"Unknown action: {action}")
+            except (KeyError, ValueError) as e:
+                await websocket.send_json({"type": "error", "detail": str(e)})
+                continue
+            except AnalysisOverloadedError as e:
+                await websocket.send_json({"type": "error", "detail": str(e), "retry_after": e.retry_after})
+                continue
+            
+            await websocket.send_json({"type": "update", **session.snapshot()})
+    except WebSocketDisconnect:
+        pass
+    except Exception as e:
+        logger.error(f"Error in incremental symptom analysis: {str(e)}")
+        await websocket.close(code=1011)
+
+@router.get("/cache-stats")
+async def get_symptom_cache_stats():
+    """Get hit/miss statistics for the symptom analysis cache"""
+    return symptom_analysis_cache.get_stats()
+
+@router.get("/knowledge-base")
+async def get_knowledge_base_info(analyzer: SymptomAnalyzer = Depends(get_symptom_analyzer)):
+    """Get the medical knowledge base version this worker is serving"""
+    knowledge_base = analyzer.knowledge_base
+    return {
+        "version": knowledge_base.version,
+        "version_id": knowledge_base.version_id,
+        "checksum": knowledge_base.checksum,
+        "condition_count": len(knowledge_base.medical_knowledge_base["common_conditions"])
+    }
+
+@router.post("/knowledge-base/reload")
+async def reload_knowledge_base(
+    version: Optional[str] = None,
+    admin: Dict[str, Any] = Depends(require_admin)
+):
+    """Activate a knowledge base version (or re-read the active one) and hot-swap the analyzer.
+    
+    Admin only. ``version`` must name a directory directly under the
+    knowledge base root. Other workers pick up the new active version on
+    their next poll.
+    """
+    try:
+        if version:
+            await asyncio.to_thread(activate_version, version)
+        analyzer = await reload_symptom_analyzer(version)
+    except KnowledgeBaseError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    logger.info(f"Knowledge base reloaded to {analyzer.knowledge_base_version} by admin {admin.get('id')}")
+    
+    return {
+        "success": True,
+        "version_id": analyzer.knowledge_base_version
+    }
+
 @router.get("/common")
 async def get_common_symptoms():
     """Get list of common symptoms"""
@@ -17,7 +17,7 @@ class Settings(BaseSettings):
     HOST: str = "0.0.0.0"
     PORT: int = 8000
     
-    # Security
+    # Security (SECRET_KEY must match the Next.js JWT_SECRET to verify its tokens)
     SECRET_KEY: str = "your-secret-key-change-in-production"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     ALGORITHM: str = "HS256"
@@ -40,6 +40,12 @@ class Settings(BaseSettings):
     # Redis settings (for caching)
     REDIS_URL: str = "redis://localhost:6379"
     
+    # Symptom analysis result cache (in-process LRU backed by Redis)
+    SYMPTOM_CACHE_ENABLED: bool = True
+    SYMPTOM_CACHE_SIZE: int = 4096
+    SYMPTOM_CACHE_TTL_SECONDS: int = 3600
+    SYMPTOM_CACHE_REDIS_RETRY_SECONDS: int = 30
+    
     # AI/ML Settings
     OPENAI_API_KEY: Optional[str] = None
     HUGGINGFACE_API_KEY: Optional[str] = None
@@ -83,6 +89,17 @@ class Settings(BaseSettings):
     
     # Healthcare specific settings
     SYMPTOM_ANALYSIS_MODEL: str = "medical-bert-base"
+    KNOWLEDGE_BASE_DIR: str = str(Path(__file__).resolve().parent.parent / "knowledge_base")
+    KNOWLEDGE_BASE_POLL_SECONDS: int = 30
+    
+    # Analysis executor (process pool for CPU-bound analyzers)
+    ANALYSIS_EXECUTOR_ENABLED: bool = True
+    ANALYSIS_EXECUTOR_WORKERS: int = 2
+    ANALYSIS_QUEUE_LIMIT: int = 64
+    ANALYSIS_QUEUE_TIMEOUT_SECONDS: float = 5.0
+    SYMPTOM_ANALYSIS_CONCURRENCY: int = 2
+    PRESCRIPTION_ANALYSIS_CONCURRENCY: int = 1
+    IMAGE_ANALYSIS_CONCURRENCY: int = 1
     PRESCRIPTION_OCR_MODEL: str = "tesseract"
     
     # Bangladesh specific settings
@@ -90,6 +107,10 @@ class Settings(BaseSettings):
     DEFAULT_LANGUAGE: str = "en"
     SUPPORTED_LANGUAGES: List[str] = ["en", "bn"]
     
+    # Messaging inbox pagination
+    CONVERSATIONS_PAGE_SIZE: int = 50
+    CONVERSATIONS_MAX_PAGE_SIZE: int = 100
+    
     # API Rate limiting
     RATE_LIMIT_PER_MINUTE: int = 100
     RATE_LIMIT_PER_HOUR: int = 1000
@@ -58,6 +58,7 @@ async def init_db():
     except Exception as e:
         logger.warning(f"⚠️ Redis connection failed: {e}")
         logger.info("📝 Caching disabled")
+        redis_client = None
     
     # Create SQLAlchemy tables
     Base.metadata.create_all(bind=engine)
@@ -90,6 +91,11 @@ async def init_mongodb_collections():
         await mongodb_db.doctors.create_index("specialty")
         await mongodb_db.doctors.create_index("location.coordinates", "2dsphere")
         
+        # Conversations collection (inbox: a user's conversations, newest first)
+        await mongodb_db.conversations.create_index(
+            [("participants", 1), ("last_message_time", -1), ("_id", -1)]
+        )
+        
         # Appointments collection
         await mongodb_db.appointments.create_index([("doctorId", 1), ("date", 1), ("time", 1)])
         await mongodb_db.appointments.create_index("patientId")
@@ -0,0 +1,44 @@
+"""
+Request authentication for privileged endpoints
+"""
+
+import logging
+from typing import Any, Dict
+
+from fastapi import Depends, HTTPException
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from jose import JWTError, jwt
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+bearer_scheme = HTTPBearer(auto_error=False)
+
+def decode_access_token(token: str) -> Dict[str, Any]:
+    """Verify a JWT issued by the Next.js app (signed with SECRET_KEY) and return its claims"""
+    try:
+        return jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    except JWTError as e:
+        raise HTTPException(
+            status_code=401,
+            detail="Invalid or expired token",
+            headers={"WWW-Authenticate": "Bearer"}
+        ) from e
+
+async def require_admin(
+    credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme)
+) -> Dict[str, Any]:
+    """Dependency that only lets through bearer tokens with the admin role"""
+    if credentials is None:
+        raise HTTPException(
+            status_code=401,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"}
+        )
+
+    claims = decode_access_token(credentials.credentials)
+    if claims.get("role") != "admin":
+        logger.warning(f"Rejected admin request from user {claims.get('id')} with role {claims.get('role')}")
+        raise HTTPException(status_code=403, detail="Admin role required")
+    return claims
@@ -70,6 +70,15 @@ class SymptomAnalysisResponse(BaseModel):
     analysis_timestamp: datetime
     disclaimer: str
 
+class SymptomBatchAnalysisRequest(BaseModel):
+    """Request model for batched symptom analysis"""
+    requests: List[SymptomAnalysisRequest] = Field(..., min_items=1, max_items=1000, description="Per-patient analysis requests")
+
+class SymptomBatchAnalysisResponse(BaseModel):
+    """Response model for batched symptom analysis"""
+    results: List[SymptomAnalysisResponse]
+    total_count: int
+
 # Prescription Analysis Models
 class PrescriptionAnalysisRequest(BaseModel):
     """Request model for prescription analysis"""
@@ -232,6 +241,8 @@ __all__ = [
     "Priority",
     "SymptomAnalysisRequest",
     "SymptomAnalysisResponse",
+    "SymptomBatchAnalysisRequest",
+    "SymptomBatchAnalysisResponse",
     "MedicalCondition",
     "RecommendedAction",
     "PrescriptionAnalysisRequest",
@@ -0,0 +1,298 @@
+"""
+Two-tier result cache for symptom analysis (in-process LRU + Redis)
+"""
+
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Hashable, List, Optional
+
+from ..core.config import settings
+from ..core.database import get_redis
+from ..models.ai_models import SymptomAnalysisRequest, SymptomAnalysisResponse
+from .symptom_analyzer import SymptomAnalyzer
+
+logger = logging.getLogger(__name__)
+
+# Response fields that are per-call rather than derived from the cache key
+PER_CALL_FIELDS = {"analysis_id", "symptoms", "analysis_timestamp"}
+
+class LRUCache:
+    """Bounded least-recently-used mapping"""
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Get a value and mark it as recently used"""
+        value = self._entries.get(key)
+        if value is not None:
+            self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any):
+        """Store a value, evicting the least recently used entry when full"""
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drop all entries"""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+class SymptomAnalysisCache:
+    """Caches analysis results keyed on what actually influences them.
+
+    The key combines the normalized symptoms (order-insensitive), the age
+    bucket, gender, a hash of the medical history, the severity level and the
+    analyzer's knowledge-base version, so entries written against an older
+    knowledge base are never served. Descriptions and the order of tied
+    conditions follow the order the symptoms were reported in, so a hit is
+    re-ranked for the caller's order and rebuilt when that differs from the
+    cached entry (see ``_to_response``). Lookups go to the in-process LRU first,
+    then to Redis when it is connected. After a Redis error the Redis tier is
+    skipped for ``redis_retry_seconds`` instead of failing on every call.
+    """
+
+    def __init__(
+        self,
+        capacity: int = settings.SYMPTOM_CACHE_SIZE,
+        ttl_seconds: int = settings.SYMPTOM_CACHE_TTL_SECONDS,
+        enabled: bool = settings.SYMPTOM_CACHE_ENABLED,
+        redis_retry_seconds: int = settings.SYMPTOM_CACHE_REDIS_RETRY_SECONDS
+    ):
+        self.enabled = enabled
+        self.ttl_seconds = ttl_seconds
+        self.redis_retry_seconds = redis_retry_seconds
+        self._redis_retry_at = 0.0
+        self._local = LRUCache(capacity)
+        self._knowledge_base_version: Optional[str] = None
+        self.local_hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+        self.redis_errors = 0
+
+    def make_key(
+        self,
+        analyzer: SymptomAnalyzer,
+        symptoms: List[str],
+        patient_age: Optional[int],
+        patient_gender: Optional[str],
+        medical_history: Optional[List[str]],
+        severity_level: Optional[str]
+    ) -> str:
+        """Build the cache key; symptoms are sorted for the key only, never for analysis
+        (``_to_response`` adapts a hit to the caller's order)"""
+        canonical_symptoms = sorted(analyzer._normalize_symptoms(symptoms))
+        history = sorted({entry.lower() for entry in medical_history or []})
+        history_hash = hashlib.sha1(json.dumps(history).encode("utf-8")).hexdigest()[:16]
+
+        key_material = json.dumps([
+            canonical_symptoms,
+            analyzer.age_bucket(patient_age),
+            patient_gender.lower() if patient_gender else None,
+            history_hash,
+            severity_level
+        ])
+        digest = hashlib.sha256(key_material.encode("utf-8")).hexdigest()
+        return f"symptom_analysis:{analyzer.knowledge_base_version}:{digest}"
+
+    async def analyze(
+        self,
+        analyzer: SymptomAnalyzer,
+        symptoms: List[str],
+        patient_age: Optional[int] = None,
+        patient_gender: Optional[str] = None,
+        medical_history: Optional[List[str]] = None,
+        severity_level: Optional[str] = None
+    ) -> SymptomAnalysisResponse:
+        """Return a cached analysis, running the analyzer on a miss"""
+        if not self.enabled:
+            return await analyzer.analyze_symptoms(
+                symptoms, patient_age, patient_gender, medical_history, severity_level
+            )
+
+        self._check_version(analyzer)
+        key = self.make_key(
+            analyzer, symptoms, patient_age, patient_gender, medical_history, severity_level
+        )
+
+        payload = await self._lookup([key])
+        if key not in payload:
+            response = await analyzer.analyze_symptoms(
+                symptoms, patient_age, patient_gender, medical_history, severity_level
+            )
+            await self._store({key: response})
+            return response
+
+        return self._to_response(
+            analyzer, payload[key], symptoms, patient_age, patient_gender, medical_history
+        )
+
+    async def analyze_batch(
+        self,
+        analyzer: SymptomAnalyzer,
+        requests: List[SymptomAnalysisRequest]
+    ) -> List[SymptomAnalysisResponse]:
+        """Batch variant: serve hits from the cache and batch-analyze the distinct misses"""
+        if not self.enabled:
+            return await analyzer.analyze_symptoms_batch(requests)
+
+        self._check_version(analyzer)
+        keys = []
+        pending: Dict[str, SymptomAnalysisRequest] = {}
+        for request in requests:
+            key = self.make_key(
+                analyzer, request.symptoms, request.patient_age, request.patient_gender,
+                request.medical_history, request.severity_level
+            )
+            keys.append(key)
+            if key not in pending:
+                pending[key] = request
+
+        payload = await self._lookup(list(pending))
+        missing = [key for key in pending if key not in payload]
+        fresh: Dict[str, SymptomAnalysisResponse] = {}
+        if missing:
+            responses = await analyzer.analyze_symptoms_batch([pending[key] for key in missing])
+            fresh = dict(zip(missing, responses))
+            payload.update(await self._store(fresh))
+
+        return [
+            fresh[key] if key in fresh and pending[key] is request else self._to_response(
+                analyzer, payload[key], request.symptoms, request.patient_age,
+                request.patient_gender, request.medical_history
+            )
+            for key, request in zip(keys, requests)
+        ]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for sizing the cache"""
+        lookups = self.local_hits + self.redis_hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "knowledge_base_version": self._knowledge_base_version,
+            "local_size": len(self._local),
+            "local_capacity": self._local.capacity,
+            "local_hits": self.local_hits,
+            "redis_hits": self.redis_hits,
+            "misses": self.misses,
+            "redis_errors": self.redis_errors,
+            "redis_backing_off": time.monotonic() < self._redis_retry_at,
+            "lookups": lookups,
+            "hit_ratio": (self.local_hits + self.redis_hits) / lookups if lookups else 0.0,
+            "local_hit_ratio": self.local_hits / lookups if lookups else 0.0
+        }
+
+    def _check_version(self, analyzer: SymptomAnalyzer):
+        """Drop local entries when the analyzer's knowledge base changes"""
+        if analyzer.knowledge_base_version != self._knowledge_base_version:
+            if self._knowledge_base_version is not None:
+                logger.info(
+                    f"Knowledge base changed ({self._knowledge_base_version} -> "
+                    f"{analyzer.knowledge_base_version}), clearing symptom analysis cache"
+                )
+            self._local.clear()
+            self._knowledge_base_version = analyzer.knowledge_base_version
+
+    async def _get_redis(self):
+        """The Redis client, or None while backing off after an error"""
+        if time.monotonic() < self._redis_retry_at:
+            return None
+        return await get_redis()
+
+    def _redis_failed(self):
+        """Count a Redis error and skip the Redis tier until the retry time"""
+        self.redis_errors += 1
+        self._redis_retry_at = time.monotonic() + self.redis_retry_seconds
+
+    async def _lookup(self, keys: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Look keys up in the local tier, then Redis; counts one hit or miss per key"""
+        found: Dict[str, Dict[str, Any]] = {}
+        remote_keys = []
+        for key in keys:
+            payload = self._local.get(key)
+            if payload is not None:
+                found[key] = payload
+                self.local_hits += 1
+            else:
+                remote_keys.append(key)
+
+        redis_client = await self._get_redis()
+        if remote_keys and redis_client:
+            try:
+                for key, raw in zip(remote_keys, await redis_client.mget(remote_keys)):
+                    if raw is not None:
+                        found[key] = json.loads(raw)
+                        self._local.set(key, found[key])
+                        self.redis_hits += 1
+            except Exception as e:
+                self._redis_failed()
+                logger.warning(f"Symptom analysis cache read from Redis failed: {e}")
+
+        self.misses += sum(1 for key in remote_keys if key not in found)
+        return found
+
+    async def _store(self, responses: Dict[str, SymptomAnalysisResponse]) -> Dict[str, Dict[str, Any]]:
+        """Write fresh results to both tiers and return their cached payloads"""
+        payloads = {
+            key: response.model_dump(mode="json", exclude=PER_CALL_FIELDS)
+            for key, response in responses.items()
+        }
+        for key, payload in payloads.items():
+            self._local.set(key, payload)
+
+        redis_client = await self._get_redis()
+        if redis_client:
+            try:
+                async with redis_client.pipeline(transaction=False) as pipe:
+                    for key, payload in payloads.items():
+                        pipe.setex(key, self.ttl_seconds, json.dumps(payload))
+                    await pipe.execute()
+            except Exception as e:
+                self._redis_failed()
+                logger.warning(f"Symptom analysis cache write to Redis failed: {e}")
+
+        return payloads
+
+    def _to_response(
+        self,
+        analyzer: SymptomAnalyzer,
+        payload: Dict[str, Any],
+        symptoms: List[str],
+        patient_age: Optional[int],
+        patient_gender: Optional[str],
+        medical_history: Optional[List[str]]
+    ) -> SymptomAnalysisResponse:
+        """Rebuild a response for this call from a cached payload.
+
+        The payload may have been computed for the same symptoms in another
+        order. Ranking is cheap next to the whole analysis, so the conditions
+        are re-ranked for this order; if they differ from the cached ones
+        (descriptions, tie order), the response is rebuilt around them.
+        Everything else depends on the symptom set only.
+        """
+        normalized_symptoms = analyzer._normalize_symptoms(symptoms)
+        conditions = analyzer._analyze_symptom_patterns(normalized_symptoms, patient_age, patient_gender)
+        if [condition.model_dump(mode="json") for condition in conditions] != payload["primary_conditions"]:
+            return analyzer._build_response(
+                symptoms, normalized_symptoms, conditions, payload["emergency_level"],
+                patient_age, medical_history
+            )
+        return SymptomAnalysisResponse(
+            analysis_id=f"analysis_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}",
+            symptoms=symptoms,
+            analysis_timestamp=datetime.utcnow(),
+            **payload
+        )
+
+# Process-wide cache shared by the symptom analysis endpoints
+symptom_analysis_cache = SymptomAnalysisCache()
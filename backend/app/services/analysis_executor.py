@@ -0,0 +1,244 @@
+"""
+Process pool for CPU-bound analysis work, with per-analyzer admission control
+
+The analyzers' ``async def`` entry points hand their CPU work to this executor
+so the FastAPI event loop never runs it inline. Each analyzer gets its own
+lane: a concurrency limit on pool slots plus a bounded wait queue. When a lane
+is saturated, callers get ``AnalysisOverloadedError`` (surfaced as HTTP 429)
+instead of queueing without bound.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, List, Optional
+
+from ..core.config import settings
+
+logger = logging.getLogger(__name__)
+
+SYMPTOM_LANE = "symptom_analysis"
+PRESCRIPTION_LANE = "prescription_analysis"
+IMAGE_LANE = "medical_image_analysis"
+
+class AnalysisOverloadedError(Exception):
+    """Raised when an analyzer's queue is full or the queue wait times out"""
+
+    def __init__(self, lane: str, reason: str, retry_after: int = 1):
+        super().__init__(f"{lane} is overloaded: {reason}")
+        self.lane = lane
+        self.retry_after = retry_after
+
+class AnalysisLane:
+    """Concurrency limit, bounded wait queue and metrics for one analyzer"""
+
+    def __init__(self, name: str, concurrency: int, queue_limit: int):
+        self.name = name
+        self.concurrency = concurrency
+        self.queue_limit = queue_limit
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.waiting = 0
+        self.in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.total_run_seconds = 0.0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Queue depth, throughput and queue-wait metrics"""
+        started = self.completed + self.failed
+        return {
+            "concurrency": self.concurrency,
+            "queue_limit": self.queue_limit,
+            "waiting": self.waiting,
+            "in_flight": self.in_flight,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "avg_queue_wait_ms": round(1000 * self.total_wait_seconds / started, 3) if started else 0.0,
+            "max_queue_wait_ms": round(1000 * self.max_wait_seconds, 3),
+            "avg_run_ms": round(1000 * self.total_run_seconds / started, 3) if started else 0.0
+        }
+
+def _initialize_worker():
+    """Pool initializer: load and compile the knowledge base before any task arrives"""
+    from .symptom_analyzer import get_symptom_analyzer
+
+    analyzer = get_symptom_analyzer()
+    logging.getLogger(__name__).info(
+        f"Analysis worker {os.getpid()} ready with knowledge base {analyzer.knowledge_base_version}"
+    )
+
+def _worker_ready() -> int:
+    """Warm-up task; returns the worker's pid"""
+    return os.getpid()
+
+class AnalysisExecutor:
+    """Warm process pool shared by all analyzers"""
+
+    def __init__(
+        self,
+        workers: int = settings.ANALYSIS_EXECUTOR_WORKERS,
+        queue_timeout: float = settings.ANALYSIS_QUEUE_TIMEOUT_SECONDS
+    ):
+        self.workers = workers
+        self.queue_timeout = queue_timeout
+        self.lanes = {
+            SYMPTOM_LANE: AnalysisLane(
+                SYMPTOM_LANE, settings.SYMPTOM_ANALYSIS_CONCURRENCY, settings.ANALYSIS_QUEUE_LIMIT
+            ),
+            PRESCRIPTION_LANE: AnalysisLane(
+                PRESCRIPTION_LANE, settings.PRESCRIPTION_ANALYSIS_CONCURRENCY, settings.ANALYSIS_QUEUE_LIMIT
+            ),
+            IMAGE_LANE: AnalysisLane(
+                IMAGE_LANE, settings.IMAGE_ANALYSIS_CONCURRENCY, settings.ANALYSIS_QUEUE_LIMIT
+            )
+        }
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._restart_lock = asyncio.Lock()
+        self.restarts = 0
+
+    @property
+    def running(self) -> bool:
+        """Whether work is being dispatched to the process pool"""
+        return self._pool is not None
+
+    def _create_pool(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_initialize_worker
+        )
+
+    async def start(self):
+        """Start the pool and wait until every worker has loaded the knowledge base"""
+        if self._pool is not None:
+            return
+        pool = self._create_pool()
+        pids = await self._warm_up(pool)
+        self._pool = pool
+        logger.info(f"Analysis executor started with {len(set(pids))} warm workers")
+
+    async def _warm_up(self, pool: ProcessPoolExecutor, func: Callable = _worker_ready, *args) -> List[int]:
+        """Run one warm-up task per worker so every worker has loaded the knowledge base"""
+        loop = asyncio.get_running_loop()
+        return await asyncio.gather(*[
+            loop.run_in_executor(pool, func, *args) for _ in range(self.workers)
+        ])
+
+    async def warm_up(self, func: Callable, *args) -> int:
+        """Run ``func(*args)`` once per worker, outside the lanes, before new work needs it.
+
+        ``func`` returns the worker's pid; returns how many distinct workers ran
+        it (a worker done early may take a second task), 0 without a pool.
+        """
+        pool = self._pool
+        if pool is None:
+            return 0
+        return len(set(await self._warm_up(pool, func, *args)))
+
+    async def _restart(self, broken: ProcessPoolExecutor):
+        """Replace a broken pool with a warm one, once, however many requests saw it break"""
+        async with self._restart_lock:
+            if self._pool is not broken:
+                # Already replaced by another request, or shut down
+                return
+            logger.error("Analysis worker died; restarting process pool")
+            broken.shutdown(wait=False, cancel_futures=True)
+            pool = self._create_pool()
+            try:
+                await self._warm_up(pool)
+            except Exception as e:
+                pool.shutdown(wait=False, cancel_futures=True)
+                logger.error(f"Restarted analysis pool failed to warm up: {e}")
+                return
+            if self._pool is not broken:
+                # Shut down while warming up
+                pool.shutdown(wait=False, cancel_futures=True)
+                return
+            self._pool = pool
+            self.restarts += 1
+            logger.info("Analysis process pool restarted")
+
+    async def shutdown(self):
+        """Stop the pool, letting running tasks finish"""
+        pool, self._pool = self._pool, None
+        if pool is not None:
+            await asyncio.to_thread(pool.shutdown, True, cancel_futures=True)
+            logger.info("Analysis executor stopped")
+
+    async def run(self, lane_name: str, func: Callable, *args) -> Any:
+        """Run ``func(*args)`` in the pool under the lane's admission control.
+
+        Falls back to running inline when the pool has not been started (scripts,
+        benchmarks), which keeps the analyzers usable outside the server.
+        """
+        if self._pool is None:
+            return func(*args)
+
+        lane = self.lanes[lane_name]
+        queued_at = time.perf_counter()
+        if not lane.semaphore.locked():
+            # A slot is free: take it without entering the wait queue
+            await lane.semaphore.acquire()
+        else:
+            if lane.waiting >= lane.queue_limit:
+                lane.rejected += 1
+                raise AnalysisOverloadedError(lane_name, "queue is full")
+
+            lane.waiting += 1
+            try:
+                await asyncio.wait_for(lane.semaphore.acquire(), timeout=self.queue_timeout)
+            except asyncio.TimeoutError:
+                lane.rejected += 1
+                raise AnalysisOverloadedError(
+                    lane_name, f"queue wait exceeded {self.queue_timeout}s",
+                    retry_after=int(self.queue_timeout) or 1
+                )
+            finally:
+                lane.waiting -= 1
+
+        started_at = time.perf_counter()
+        wait_seconds = started_at - queued_at
+        lane.total_wait_seconds += wait_seconds
+        lane.max_wait_seconds = max(lane.max_wait_seconds, wait_seconds)
+        lane.in_flight += 1
+        pool = self._pool
+        try:
+            if pool is None:
+                # Shut down while this request waited for a slot
+                result = func(*args)
+            else:
+                result = await asyncio.get_running_loop().run_in_executor(pool, func, *args)
+            lane.completed += 1
+            return result
+        except BrokenProcessPool:
+            lane.failed += 1
+            await self._restart(pool)
+            raise
+        except Exception:
+            lane.failed += 1
+            raise
+        finally:
+            lane.in_flight -= 1
+            lane.total_run_seconds += time.perf_counter() - started_at
+            lane.semaphore.release()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Executor and per-lane metrics"""
+        return {
+            "running": self.running,
+            "workers": self.workers,
+            "restarts": self.restarts,
+            "queue_timeout_seconds": self.queue_timeout,
+            "lanes": {name: lane.get_stats() for name, lane in self.lanes.items()}
+        }
+
+# Process-wide executor; started and stopped by the application lifespan
+analysis_executor = AnalysisExecutor()
@@ -0,0 +1,146 @@
+"""
+Naive-Bayes condition ranking over the symptom incidence matrix
+"""
+
+import math
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .demographic_priors import DemographicPriors
+from .symptom_matrix import SymptomIncidenceMatrix
+
+# Default likelihood that a patient with a condition reports a symptom the
+# knowledge base links it to, and that they report an unlinked one
+DEFAULT_SENSITIVITY = 0.9
+DEFAULT_LEAK = 0.02
+
+class NaiveBayesInference:
+    """Posterior probability of condition names given the reported symptoms.
+
+    Symptoms (condition keys) are treated as conditionally independent given
+    the condition. A condition's prior is the sum of its demographically
+    adjusted entry probabilities (``P(c) = sum_k P(c | k) P(k)`` with uniform
+    ``P(k)``). Each (condition key, name) link carries the log-likelihood
+    ratio ``log P(k | c) - log leak``; unlinked pairs contribute the same
+    ``log leak`` to every condition and cancel in normalization, so the
+    evidence is a sum over matched entries only.
+
+    ``rank`` scores one request in plain Python over its matched entries
+    only, against per-name log priors precomputed for every (age group,
+    gender) row when the knowledge base loads. A request matches a handful
+    of entries, so this beats dense request x entry arrays even in batches,
+    and single, batch and session analysis all go through it, so they
+    produce bit-identical probabilities.
+
+    A knowledge base may ship ``condition_likelihoods`` as
+    ``{condition_key: {condition name: P(k | c)}}`` to override the default
+    sensitivity of individual links.
+    """
+
+    def __init__(
+        self,
+        matrix: SymptomIncidenceMatrix,
+        priors: DemographicPriors,
+        likelihoods: Optional[Mapping[str, Mapping[str, float]]] = None,
+        sensitivity: float = DEFAULT_SENSITIVITY,
+        leak: float = DEFAULT_LEAK
+    ):
+        self._matrix = matrix
+        self.leak = leak
+        likelihoods = likelihoods or {}
+
+        # A name listed twice under one key is one link, counted once
+        link_likelihood = np.full(matrix.entry_count, leak, dtype=np.float64)
+        link = np.zeros(matrix.entry_count, dtype=bool)
+        seen = set()
+        for entry, (key_index, name) in enumerate(zip(matrix.entry_condition, matrix.entry_names)):
+            condition_key = matrix.condition_keys[key_index]
+            if (condition_key, name) in seen:
+                continue
+            seen.add((condition_key, name))
+            link[entry] = True
+            link_likelihood[entry] = min(max(likelihoods.get(condition_key, {}).get(name, sensitivity), leak), 1.0)
+        self.entry_link = link
+        self.entry_likelihood = link_likelihood
+        self.entry_evidence = np.log(link_likelihood) - np.log(leak)
+        for array in (self.entry_link, self.entry_likelihood, self.entry_evidence):
+            array.flags.writeable = False
+
+        # Per-name prior mass and its log for every (age group, gender) row
+        table = priors.table
+        self._priors = priors
+        self._name_prior = np.add.reduceat(table[..., matrix._name_order], matrix._name_starts, axis=-1)
+        with np.errstate(divide="ignore"):
+            self._name_log_prior = np.log(self._name_prior)
+        self._prior_total = table.sum(axis=-1)
+        # Plain lists for ``rank``, which reads a few scattered entries per call
+        self._entry_name_list = matrix.entry_name.tolist()
+        self._entry_evidence_list = self.entry_evidence.tolist()
+        self._key_entry_starts = matrix.key_entry_starts.tolist()
+
+    def rank(
+        self, keys: Sequence[int], offsets: Sequence[int], demographics: Tuple[int, int], limit: int
+    ) -> List[Tuple[int, float, int]]:
+        """Top ``limit`` matched conditions of one request.
+
+        ``keys`` are the matched condition-key columns and ``offsets`` the
+        offset of the first symptom mentioning each; ``demographics`` is the
+        request's (age group, gender) row from ``DemographicPriors.index``.
+        Each condition name is represented by its most probable matched entry
+        (first mention on ties) and ranked by posterior, then first
+        appearance. Returns (entry, posterior, symptom offset) per condition.
+        """
+        if not len(keys):
+            return []
+        matrix = self._matrix
+        entry_count = matrix.entry_count
+        key_entry_starts = self._key_entry_starts
+        adjusted_probability = self._priors.table[demographics]
+
+        # name -> [log posterior, first code, winner probability, winner code]
+        # Keys in column order visit entries in entry order, so evidence sums the
+        # same way whatever order the symptoms were reported in
+        scores: Dict[int, List] = {}
+        for key, offset in sorted(zip(keys, offsets)):
+            start, end = key_entry_starts[key], key_entry_starts[key + 1]
+            for entry, name, evidence, probability in zip(
+                range(start, end),
+                self._entry_name_list[start:end],
+                self._entry_evidence_list[start:end],
+                adjusted_probability[start:end].tolist()
+            ):
+                code = offset * entry_count + entry
+                score = scores.get(name)
+                if score is None:
+                    scores[name] = [evidence, code, probability, code]
+                    continue
+                score[0] += evidence
+                if code < score[1]:
+                    score[1] = code
+                if probability > score[2] or (probability == score[2] and code < score[3]):
+                    score[2], score[3] = probability, code
+
+        name_prior = self._name_prior[demographics]
+        name_log_prior = self._name_log_prior[demographics]
+        matched_prior = 0.0
+        for name, score in scores.items():
+            matched_prior += name_prior.item(name)
+            score[0] = name_log_prior.item(name) + score[0]
+
+        # Unmatched names keep their prior mass in the normalizer
+        unmatched_prior = max(self._prior_total.item(demographics) - matched_prior, 0.0)
+        log_unmatched = math.log(unmatched_prior) if unmatched_prior > 0 else -math.inf
+        peak = max(log_unmatched, max(score[0] for score in scores.values()))
+        if not math.isfinite(peak):
+            return []
+        log_normalizer = peak + math.log(
+            math.exp(log_unmatched - peak) + sum(math.exp(score[0] - peak) for score in scores.values())
+        )
+
+        ranking = sorted(scores.values(), key=lambda score: (-score[0], score[1]))[:limit]
+        ranked = []
+        for log_posterior, _, _, winner_code in ranking:
+            symptom_offset, entry = divmod(winner_code, entry_count)
+            ranked.append((entry, math.exp(log_posterior - log_normalizer), symptom_offset))
+        return ranked
@@ -0,0 +1,137 @@
+"""
+Precomputed demographic adjustment tables for condition probabilities
+"""
+
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+AGE_DIMENSION = "age_group"
+GENDER_DIMENSION = "gender"
+UNKNOWN_LEVEL = "unknown"
+
+# Multipliers applied to a condition's base probability, per dimension and
+# level. A knowledge base may ship its own ``demographic_priors`` section in
+# this shape, adding further dimensions such as region or season.
+DEFAULT_DEMOGRAPHIC_PRIORS: Dict[str, Dict[str, Dict[str, float]]] = {
+    AGE_DIMENSION: {
+        "pediatric": {"Viral Fever": 1.2, "Common Cold": 1.2},
+        "elderly": {"Pneumonia": 1.3, "Heart Attack": 1.3}
+    },
+    GENDER_DIMENSION: {
+        "female": {"Migraine": 1.4},
+        "male": {"Heart Attack": 1.2}
+    }
+}
+
+def age_bucket(age: Optional[int]) -> str:
+    """Age group used by demographic adjustments (ages within a bucket score alike)"""
+    if not age:
+        return UNKNOWN_LEVEL
+    if age < 18:
+        return "pediatric"
+    if age > 65:
+        return "elderly"
+    return "adult"
+
+class DemographicPriors:
+    """Per-entry condition probabilities for every demographic combination.
+
+    Each dimension is a (levels x entries) multiplier array whose level 0 is
+    ``unknown`` (all ones). Age group and gender are folded into a
+    precomputed (age x gender x entry) probability table when the knowledge
+    base loads, so per-request scoring is a single index lookup. Additional
+    dimensions (region, season, ...) are applied at lookup as one vectorized
+    multiply per dimension.
+    """
+
+    def __init__(
+        self,
+        entry_names: Sequence[str],
+        base_probability: np.ndarray,
+        priors: Optional[Mapping[str, Mapping[str, Mapping[str, float]]]] = None
+    ):
+        priors = DEFAULT_DEMOGRAPHIC_PRIORS if priors is None else priors
+        self._levels: Dict[str, Dict[str, int]] = {}
+        self._rows: Dict[str, np.ndarray] = {}
+
+        # Age group and gender always exist so the base table has fixed axes
+        dimensions = [AGE_DIMENSION, GENDER_DIMENSION] + [
+            dimension for dimension in priors if dimension not in (AGE_DIMENSION, GENDER_DIMENSION)
+        ]
+        for dimension in dimensions:
+            levels = {UNKNOWN_LEVEL: 0}
+            rows: List[np.ndarray] = [np.ones(len(entry_names))]
+            for level, multipliers in priors.get(dimension, {}).items():
+                levels[level.lower()] = len(rows)
+                rows.append(np.array([multipliers.get(name, 1.0) for name in entry_names], dtype=np.float64))
+            self._levels[dimension] = levels
+            self._rows[dimension] = np.vstack(rows)
+
+        # Multiply in the same order as the per-pair rules did (base, age,
+        # gender) so table values are bit-identical to them
+        self._base_probability = base_probability
+        self._table = np.minimum(
+            base_probability[None, None, :]
+            * self._rows[AGE_DIMENSION][:, None, :]
+            * self._rows[GENDER_DIMENSION][None, :, :],
+            1.0
+        )
+        self._table.flags.writeable = False
+
+    @property
+    def dimensions(self) -> List[str]:
+        """Dimension names, age group and gender first"""
+        return list(self._levels)
+
+    @property
+    def context_dimensions(self) -> List[str]:
+        """Dimensions beyond age group and gender (e.g. region, season)"""
+        return self.dimensions[2:]
+
+    def level_index(self, dimension: str, level: Optional[str]) -> int:
+        """Row of ``level`` in a dimension; unknown levels map to the neutral row"""
+        if not level:
+            return 0
+        return self._levels[dimension].get(level.lower(), 0)
+
+    def index(self, age: Optional[int], gender: Optional[str]) -> Tuple[int, int]:
+        """(age group, gender) position of one patient in the precomputed table"""
+        return (
+            self.level_index(AGE_DIMENSION, age_bucket(age)),
+            self.level_index(GENDER_DIMENSION, gender)
+        )
+
+    def probabilities(self, age: Optional[int], gender: Optional[str], **context: Optional[str]) -> np.ndarray:
+        """Adjusted probability of every entry for one patient (read-only view).
+
+        ``context`` supplies levels for extra dimensions, e.g. ``region="sylhet"``;
+        unknown dimensions and levels leave probabilities unchanged.
+        """
+        age_index, gender_index = self.index(age, gender)
+        context_rows = [
+            self._rows[dimension][self.level_index(dimension, level)]
+            for dimension, level in context.items()
+            if dimension in self._levels and self.level_index(dimension, level)
+        ]
+        if not context_rows:
+            return self._table[age_index, gender_index]
+
+        adjusted = (
+            self._base_probability
+            * self._rows[AGE_DIMENSION][age_index]
+            * self._rows[GENDER_DIMENSION][gender_index]
+        )
+        for rows in context_rows:
+            adjusted = adjusted * rows
+        return np.minimum(adjusted, 1.0)
+
+    @property
+    def table(self) -> np.ndarray:
+        """The precomputed (age group x gender x entry) probability table"""
+        return self._table
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the precomputed tables"""
+        return self._table.nbytes + sum(rows.nbytes for rows in self._rows.values())
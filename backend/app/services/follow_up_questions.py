@@ -0,0 +1,130 @@
+"""
+Information-gain ordering of follow-up symptom questions
+"""
+
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+from .condition_inference import NaiveBayesInference
+from .symptom_matrix import SymptomIncidenceMatrix
+
+def _xlogx(values) -> np.ndarray:
+    """``x log x`` with ``0 log 0 = 0``"""
+    values = np.asarray(values, dtype=np.float64)
+    return values * np.log(np.maximum(values, np.finfo(np.float64).tiny))
+
+class FollowUpQuestionSelector:
+    """Picks the symptom terms whose yes/no answer best separates the likely conditions.
+
+    Candidate questions are the knowledge base's symptom terms (condition keys
+    and related symptoms), each linked to the condition keys it triggers. A
+    patient with condition ``c`` answers yes with the likelihood of the
+    strongest link between the term's keys and ``c``, otherwise at the leak
+    rate. Those (term, likelihood) links are resolved per condition name
+    once, when the knowledge base loads. The expected entropy after the
+    answer is then computed for every candidate at once from the links of
+    the listed conditions, so cost depends on how many terms the listed
+    conditions touch, not on the knowledge base size.
+    """
+
+    def __init__(
+        self,
+        matrix: SymptomIncidenceMatrix,
+        inference: NaiveBayesInference,
+        terms: Iterable[Tuple[str, str]]  # (symptom term, condition key it triggers)
+    ):
+        self.leak = inference.leak
+
+        key_index = {key: index for index, key in enumerate(matrix.condition_keys)}
+        term_index: Dict[str, int] = {}
+        key_terms: List[List[int]] = [[] for _ in matrix.condition_keys]
+        for term, condition_key in terms:
+            text = term.replace("_", " ")
+            if text not in term_index:
+                term_index[text] = len(term_index)
+            if term_index[text] not in key_terms[key_index[condition_key]]:
+                key_terms[key_index[condition_key]].append(term_index[text])
+        self.terms: List[str] = list(term_index)
+
+        # Terms triggered by each key, as one flat array with per-key ranges
+        lengths = np.array([len(indices) for indices in key_terms], dtype=np.intp)
+        key_term_starts = np.r_[0, np.cumsum(lengths)].astype(np.intp)
+        key_term_list = np.array([index for indices in key_terms for index in indices], dtype=np.intp)
+
+        # (name, term, likelihood) for every link of every linked entry
+        entries = np.flatnonzero(inference.entry_link)
+        keys = matrix.entry_condition[entries]
+        term_starts = key_term_starts[keys]
+        lengths = key_term_starts[keys + 1] - term_starts
+        run_starts = np.cumsum(lengths) - lengths
+        link_terms = key_term_list[np.repeat(term_starts - run_starts, lengths) + np.arange(lengths.sum())]
+        link_names = np.repeat(matrix.entry_name[entries], lengths)
+        link_likelihood = np.repeat(inference.entry_likelihood[entries], lengths)
+
+        # One link per (name, term): the strongest, grouped by name
+        order = np.lexsort((-link_likelihood, link_terms, link_names))
+        pairs = link_names[order] * len(self.terms) + link_terms[order]
+        first = np.diff(pairs, prepend=-1) != 0
+        self._link_terms = link_terms[order][first]
+        likelihood = link_likelihood[order][first]
+        self._name_link_starts = np.searchsorted(
+            link_names[order][first], np.arange(len(matrix.condition_names) + 1)
+        )
+
+        # Per link, the parts of a condition's yes/no entropy terms that do not
+        # depend on its probability p, using xlogx(p * l) = l * xlogx(p) + p * xlogx(l)
+        self._link_shift = likelihood - self.leak
+        self._link_yes = _xlogx(likelihood) - _xlogx(self.leak)
+        self._link_no = _xlogx(1 - likelihood) - _xlogx(1 - self.leak)
+
+    def gains(
+        self, names: np.ndarray, probabilities: np.ndarray, reported: Sequence[str], limit: int
+    ) -> List[Tuple[str, float]]:
+        """Best ``limit`` (term, information gain in nats) questions.
+
+        ``names`` and ``probabilities`` describe the current condition
+        distribution; the remaining mass is pooled into one class answering
+        yes at the leak rate. Terms already mentioned in ``reported`` are
+        skipped.
+        """
+        if not len(names):
+            return []
+        leak = self.leak
+        probabilities = np.asarray(probabilities, dtype=np.float64)
+        remainder = max(1.0 - float(probabilities.sum()), 0.0)
+        probability_logs = _xlogx(probabilities)
+        plogp = float(probability_logs.sum() + _xlogx(remainder))
+
+        # The precomputed links of the listed conditions, one flat run per condition
+        starts = self._name_link_starts[names]
+        lengths = self._name_link_starts[names + 1] - starts
+        run_starts = np.cumsum(lengths) - lengths
+        links = np.repeat(starts - run_starts, lengths) + np.arange(lengths.sum())
+        p = np.repeat(probabilities, lengths)
+        p_log_p = np.repeat(probability_logs, lengths)
+        shift = self._link_shift[links]
+
+        candidates, term_of_link = np.unique(self._link_terms[links], return_inverse=True)
+
+        def grouped(values: np.ndarray) -> np.ndarray:
+            return np.bincount(term_of_link, weights=values, minlength=len(candidates))
+
+        # Every class answering at the leak rate, corrected for the linked ones
+        yes = leak + grouped(p * shift)
+        no = 1.0 - yes
+        yes_terms = leak * (plogp + np.log(leak)) + grouped(p_log_p * shift + p * self._link_yes[links])
+        no_terms = (1 - leak) * (plogp + np.log(1 - leak)) + grouped(p * self._link_no[links] - p_log_p * shift)
+        gains = -plogp - (_xlogx(yes) - yes_terms + _xlogx(no) - no_terms)
+
+        # Walk the ranking only as far as needed to skip already reported terms.
+        # Gains equal up to rounding noise are ties, broken by term order, so
+        # the ranking does not depend on how the probabilities were summed
+        questions: List[Tuple[str, float]] = []
+        for index in np.lexsort((candidates, -np.round(gains, 12))):
+            if len(questions) >= limit or gains[index] <= 1e-9:
+                break
+            term = self.terms[candidates[index]]
+            if not any(term in symptom for symptom in reported):
+                questions.append((term, float(gains[index])))
+        return questions
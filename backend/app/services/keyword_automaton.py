@@ -0,0 +1,69 @@
+"""
+Multi-pattern keyword matching (Aho-Corasick) for the analysis services
+"""
+
+from collections import deque
+from typing import Dict, FrozenSet, Hashable, Iterable, List, Set, Tuple
+
+
+class KeywordAutomaton:
+    """Aho-Corasick automaton that finds every keyword occurring in a text in one pass.
+
+    Each keyword is registered together with a payload; ``find`` returns the set of
+    payloads whose keyword occurs as a substring of the text, which is exactly the
+    ``keyword in text`` test the analyzers used to run once per keyword.
+    """
+
+    def __init__(self, keywords: Iterable[Tuple[str, Hashable]]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[FrozenSet[Hashable]] = []
+        pending_output: List[Set[Hashable]] = [set()]
+
+        # Build the keyword trie
+        for keyword, payload in keywords:
+            if not keyword:
+                continue
+            state = 0
+            for char in keyword:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    pending_output.append(set())
+                state = next_state
+            pending_output[state].add(payload)
+
+        # Breadth-first pass to wire failure links and merge suffix outputs
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                pending_output[next_state] |= pending_output[self._fail[next_state]]
+
+        self._output = [frozenset(payloads) for payloads in pending_output]
+
+    def find(self, text: str) -> Set[Hashable]:
+        """Return the payloads of all keywords occurring in ``text``"""
+        goto, fail, output = self._goto, self._fail, self._output
+        matches: Set[Hashable] = set()
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                matches |= output[state]
+        return matches
+
+    @property
+    def state_count(self) -> int:
+        """Number of trie states in the compiled automaton"""
+        return len(self._goto)
@@ -0,0 +1,231 @@
+"""
+Versioned on-disk medical knowledge base artifacts
+
+Layout of ``settings.KNOWLEDGE_BASE_DIR``::
+
+    CURRENT                   name of the active version
+    <version>/manifest.json   version, format and SHA-256 of the data file
+    <version>/knowledge_base.json
+
+``knowledge_base.json`` holds the sections in ``REQUIRED_SECTIONS`` plus an
+optional ``demographic_priors`` section (see ``demographic_priors``), an
+optional ``symptom_aliases`` section (see ``symptom_normalizer``) and an
+optional ``condition_likelihoods`` section (see ``condition_inference``).
+
+New versions are published into a fresh directory and activated by atomically
+replacing ``CURRENT``; running workers pick the change up without a restart.
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Dict, Optional
+
+from ..core.config import settings
+
+logger = logging.getLogger(__name__)
+
+ARTIFACT_FORMAT = 1
+CURRENT_FILE = "CURRENT"
+MANIFEST_FILE = "manifest.json"
+DATA_FILE = "knowledge_base.json"
+# Version names double as directory names under the knowledge base root
+VERSION_PATTERN = re.compile(r"^[A-Za-z0-9._-]+$")
+REQUIRED_SECTIONS = (
+    "medical_knowledge_base",
+    "symptom_patterns",
+    "emergency_keywords",
+    "icd_codes",
+    "symptom_synonyms"
+)
+
+class KnowledgeBaseError(Exception):
+    """Raised when a knowledge base artifact is missing or corrupt"""
+
+def _freeze(value: Any) -> Any:
+    """Recursively convert dicts and lists into read-only mappings and tuples"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+class KnowledgeBase:
+    """Immutable snapshot of one knowledge base version"""
+
+    def __init__(
+        self,
+        version: str,
+        checksum: str,
+        data: Dict[str, Any],
+        source_dir: Optional[str] = None,
+        artifact_name: Optional[str] = None
+    ):
+        missing = [section for section in REQUIRED_SECTIONS if section not in data]
+        if missing:
+            raise KnowledgeBaseError(f"Knowledge base {version} is missing sections: {', '.join(missing)}")
+
+        self.version = version
+        self.checksum = checksum
+        self.source_dir = source_dir  # None for in-memory knowledge bases
+        # Directory name the artifact was loaded from, as written in CURRENT
+        self.artifact_name = artifact_name or version
+        self.medical_knowledge_base = _freeze(data["medical_knowledge_base"])
+        self.symptom_patterns = _freeze(data["symptom_patterns"])
+        self.emergency_keywords = _freeze(data["emergency_keywords"])
+        self.icd_codes = _freeze(data["icd_codes"])
+        self.symptom_synonyms = _freeze(data["symptom_synonyms"])
+        # Optional; the analyzer falls back to its built-in age/gender priors
+        self.demographic_priors = _freeze(data.get("demographic_priors"))
+        # Optional; the analyzer falls back to its built-in transliterations
+        self.symptom_aliases = _freeze(data.get("symptom_aliases"))
+        # Optional; links without an entry use the default sensitivity
+        self.condition_likelihoods = _freeze(data.get("condition_likelihoods"))
+
+    @property
+    def version_id(self) -> str:
+        """Version plus content digest, so edited-but-unbumped artifacts still differ"""
+        return f"{self.version}+{self.checksum[:12]}"
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], version: str = "inline") -> "KnowledgeBase":
+        """Build a knowledge base from in-memory data (tests, benchmarks, tooling)"""
+        checksum = hashlib.sha256(_serialize(data)).hexdigest()
+        return cls(version, checksum, data)
+
+def _serialize(data: Dict[str, Any]) -> bytes:
+    """On-disk encoding of the knowledge base data (key order is significant)"""
+    return json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+
+def _version_dir(base_dir: Path, version: str) -> Path:
+    """Directory of a version, rejecting names that could escape the knowledge base root"""
+    if not VERSION_PATTERN.match(version) or ".." in version:
+        raise KnowledgeBaseError(f"Invalid knowledge base version name: {version!r}")
+    root = base_dir.resolve()
+    version_dir = (root / version).resolve()
+    if version_dir.parent != root:
+        raise KnowledgeBaseError(f"Invalid knowledge base version name: {version!r}")
+    return version_dir
+
+def current_version(kb_dir: Optional[str] = None) -> str:
+    """Name of the active knowledge base version"""
+    path = Path(kb_dir or settings.KNOWLEDGE_BASE_DIR) / CURRENT_FILE
+    try:
+        return path.read_text(encoding="utf-8").strip()
+    except OSError as e:
+        raise KnowledgeBaseError(f"Cannot read active knowledge base version from {path}: {e}")
+
+def load_knowledge_base(kb_dir: Optional[str] = None, version: Optional[str] = None) -> KnowledgeBase:
+    """Load and verify a knowledge base version (the active one by default).
+
+    The data file is read, checksummed and parsed into per-process
+    structures; nothing is shared between processes, so every pool worker
+    holds its own copy. Pre-forking servers should load before forking (e.g.
+    gunicorn --preload) to share the parent's copy copy-on-write.
+    """
+    base_dir = Path(kb_dir or settings.KNOWLEDGE_BASE_DIR)
+    version = version or current_version(str(base_dir))
+    version_dir = _version_dir(base_dir, version)
+
+    try:
+        manifest = json.loads((version_dir / MANIFEST_FILE).read_text(encoding="utf-8"))
+    except (OSError, ValueError) as e:
+        raise KnowledgeBaseError(f"Invalid manifest for knowledge base {version}: {e}")
+
+    if manifest.get("format") != ARTIFACT_FORMAT:
+        raise KnowledgeBaseError(f"Unsupported knowledge base format: {manifest.get('format')}")
+
+    try:
+        payload = (version_dir / DATA_FILE).read_bytes()
+        checksum = hashlib.sha256(payload).hexdigest()
+        if checksum != manifest.get("sha256"):
+            raise KnowledgeBaseError(f"Checksum mismatch for knowledge base {version}")
+        data = json.loads(payload)
+    except (OSError, ValueError) as e:
+        raise KnowledgeBaseError(f"Cannot load knowledge base {version}: {e}")
+
+    logger.info(f"Loaded medical knowledge base {version} ({checksum[:12]})")
+    return KnowledgeBase(manifest.get("version", version), checksum, data, str(base_dir), version)
+
+def publish_knowledge_base(
+    data: Dict[str, Any],
+    version: str,
+    kb_dir: Optional[str] = None,
+    activate: bool = True
+) -> Path:
+    """Write a new knowledge base version and optionally make it the active one"""
+    KnowledgeBase.from_dict(data, version)  # validate before touching disk
+    base_dir = Path(kb_dir or settings.KNOWLEDGE_BASE_DIR)
+    base_dir.mkdir(parents=True, exist_ok=True)
+    version_dir = _version_dir(base_dir, version)
+    if version_dir.exists():
+        raise KnowledgeBaseError(f"Knowledge base version {version} already exists")
+
+    payload = _serialize(data)
+    manifest = {
+        "version": version,
+        "format": ARTIFACT_FORMAT,
+        "sha256": hashlib.sha256(payload).hexdigest(),
+        "created_at": datetime.utcnow().isoformat(),
+        "condition_count": len(data["medical_knowledge_base"].get("common_conditions", {}))
+    }
+
+    # Stage in a sibling directory and rename, so readers never see a partial version
+    staging_dir = Path(tempfile.mkdtemp(prefix=f".{version}-", dir=base_dir))
+    (staging_dir / DATA_FILE).write_bytes(payload)
+    (staging_dir / MANIFEST_FILE).write_text(json.dumps(manifest, indent=2) + "\n", encoding="utf-8")
+    os.chmod(staging_dir, 0o755)
+    os.rename(staging_dir, version_dir)
+
+    if activate:
+        activate_version(version, str(base_dir))
+    return version_dir
+
+def activate_version(version: str, kb_dir: Optional[str] = None):
+    """Atomically point CURRENT at an existing version"""
+    base_dir = Path(kb_dir or settings.KNOWLEDGE_BASE_DIR)
+    if not (_version_dir(base_dir, version) / MANIFEST_FILE).exists():
+        raise KnowledgeBaseError(f"Knowledge base version {version} does not exist")
+
+    fd, temp_path = tempfile.mkstemp(prefix=".CURRENT-", dir=base_dir)
+    with os.fdopen(fd, "w", encoding="utf-8") as current_file:
+        current_file.write(version + "\n")
+    os.chmod(temp_path, 0o644)
+    os.replace(temp_path, base_dir / CURRENT_FILE)
+    logger.info(f"Activated medical knowledge base {version}")
+
+def main():
+    """Command line entry point for publishing and activating versions"""
+    parser = argparse.ArgumentParser(description="Manage medical knowledge base artifacts")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    publish_parser = subparsers.add_parser("publish", help="Publish a knowledge base JSON file as a new version")
+    publish_parser.add_argument("source", help="JSON file with the knowledge base sections")
+    publish_parser.add_argument("--version", required=True)
+    publish_parser.add_argument("--no-activate", action="store_true")
+
+    activate_parser = subparsers.add_parser("activate", help="Make an existing version active")
+    activate_parser.add_argument("version")
+
+    subparsers.add_parser("verify", help="Load and verify the active version")
+
+    args = parser.parse_args()
+    if args.command == "publish":
+        with open(args.source, encoding="utf-8") as source:
+            data = json.load(source)
+        print(publish_knowledge_base(data, args.version, activate=not args.no_activate))
+    elif args.command == "activate":
+        activate_version(args.version)
+    else:
+        knowledge_base = load_knowledge_base()
+        print(f"{knowledge_base.version_id}: OK")
+
+if __name__ == "__main__":
+    main()
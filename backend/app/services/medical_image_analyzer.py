@@ -6,9 +6,14 @@ import logging
 from typing import List
 from datetime import datetime
 from ..models.ai_models import MedicalImageAnalysisResponse, MedicalImageFinding, SeverityLevel
+from .analysis_executor import IMAGE_LANE, analysis_executor
 
 logger = logging.getLogger(__name__)
 
+def _analyze_in_worker(image_data: bytes, image_type: str, filename: str) -> MedicalImageAnalysisResponse:
+    """Process-pool entry point for medical image analysis"""
+    return MedicalImageAnalyzer()._analyze_medical_image(image_data, image_type, filename)
+
 class MedicalImageAnalyzer:
     """Medical image analyzer using AI"""
     
@@ -19,6 +24,15 @@ class MedicalImageAnalyzer:
         filename: str
     ) -> MedicalImageAnalysisResponse:
         """Analyze medical image using AI"""
+        return await analysis_executor.run(IMAGE_LANE, _analyze_in_worker, image_data, image_type, filename)
+    
+    def _analyze_medical_image(
+        self,
+        image_data: bytes,
+        image_type: str,
+        filename: str
+    ) -> MedicalImageAnalysisResponse:
+        """CPU-bound image inference (runs in the analysis process pool)"""
         
         # Mock implementation - in production, this would use medical imaging AI
         findings = [
@@ -6,9 +6,14 @@ import logging
 from typing import List
 from datetime import datetime
 from ..models.ai_models import PrescriptionAnalysisResponse, Medication
+from .analysis_executor import PRESCRIPTION_LANE, analysis_executor
 
 logger = logging.getLogger(__name__)
 
+def _analyze_in_worker(image_data: bytes, filename: str) -> PrescriptionAnalysisResponse:
+    """Process-pool entry point for prescription analysis"""
+    return PrescriptionAnalyzer()._analyze_prescription_image(image_data, filename)
+
 class PrescriptionAnalyzer:
     """Prescription analyzer using OCR and medical knowledge"""
     
@@ -18,6 +23,14 @@ class PrescriptionAnalyzer:
         filename: str
     ) -> PrescriptionAnalysisResponse:
         """Analyze prescription image using OCR"""
+        return await analysis_executor.run(PRESCRIPTION_LANE, _analyze_in_worker, image_data, filename)
+    
+    def _analyze_prescription_image(
+        self,
+        image_data: bytes,
+        filename: str
+    ) -> PrescriptionAnalysisResponse:
+        """CPU-bound OCR and parsing (runs in the analysis process pool)"""
         
         # Mock implementation - in production, this would use OCR and medical NLP
         medications = [
@@ -5,112 +5,117 @@ Advanced AI-powered symptom analysis service
 import asyncio
 import json
 import logging
-from typing import List, Dict, Optional, Tuple
+import os
+from typing import List, Dict, Optional, Sequence, Set, Tuple
 from datetime import datetime
-import re
 
-from ..models.ai_models import SymptomAnalysisResponse, MedicalCondition, RecommendedAction
+import numpy as np
+
+from ..models.ai_models import (
+    SymptomAnalysisRequest,
+    SymptomAnalysisResponse,
+    MedicalCondition,
+    RecommendedAction
+)
 from ..core.config import settings
+from .analysis_executor import SYMPTOM_LANE, analysis_executor
+from .condition_inference import NaiveBayesInference
+from .demographic_priors import DemographicPriors, age_bucket
+from .follow_up_questions import FollowUpQuestionSelector
+from .keyword_automaton import KeywordAutomaton
+from .knowledge_base import KnowledgeBase, current_version, load_knowledge_base
+from .symptom_matrix import SymptomIncidenceMatrix
+from .symptom_normalizer import DEFAULT_SYMPTOM_ALIASES, SymptomNormalizer
 
 logger = logging.getLogger(__name__)
 
+# Payload tags used in the compiled keyword automaton
+CONDITION_MATCH = "condition"
+EMERGENCY_KEYWORD_MATCH = "emergency_keyword"
+EMERGENCY_PATTERN_MATCH = "emergency_pattern"
+
 class SymptomAnalyzer:
-    """Advanced symptom analyzer using medical knowledge base and AI"""
-    
-    def __init__(self):
-        self.medical_knowledge_base = self._load_medical_knowledge_base()
-        self.symptom_patterns = self._load_symptom_patterns()
-        self.emergency_keywords = self._load_emergency_keywords()
-        
-    def _load_medical_knowledge_base(self) -> Dict:
-        """Load medical knowledge base for Bangladesh healthcare context"""
-        return {
-            "common_conditions": {
-                "fever": {
-                    "related_symptoms": ["headache", "body_ache", "chills", "fatigue"],
-                    "possible_conditions": [
-                        {"name": "Viral Fever", "probability": 0.6, "severity": "mild"},
-                        {"name": "Dengue Fever", "probability": 0.3, "severity": "moderate"},
-                        {"name": "Typhoid", "probability": 0.1, "severity": "severe"}
-                    ],
-                    "recommended_specialties": ["General Medicine", "Internal Medicine"]
-                },
-                "cough": {
-                    "related_symptoms": ["sore_throat", "runny_nose", "chest_pain", "shortness_of_breath"],
-                    "possible_conditions": [
-                        {"name": "Common Cold", "probability": 0.5, "severity": "mild"},
-                        {"name": "Bronchitis", "probability": 0.3, "severity": "moderate"},
-                        {"name": "Pneumonia", "probability": 0.2, "severity": "severe"}
-                    ],
-                    "recommended_specialties": ["General Medicine", "Pulmonology"]
-                },
-                "stomach_pain": {
-                    "related_symptoms": ["nausea", "vomiting", "diarrhea", "loss_of_appetite"],
-                    "possible_conditions": [
-                        {"name": "Gastritis", "probability": 0.4, "severity": "mild"},
-                        {"name": "Food Poisoning", "probability": 0.3, "severity": "moderate"},
-                        {"name": "Appendicitis", "probability": 0.1, "severity": "severe"}
-                    ],
-                    "recommended_specialties": ["Gastroenterology", "General Medicine"]
-                },
-                "headache": {
-                    "related_symptoms": ["nausea", "sensitivity_to_light", "neck_stiffness", "fever"],
-                    "possible_conditions": [
-                        {"name": "Tension Headache", "probability": 0.6, "severity": "mild"},
-                        {"name": "Migraine", "probability": 0.3, "severity": "moderate"},
-                        {"name": "Meningitis", "probability": 0.05, "severity": "severe"}
-                    ],
-                    "recommended_specialties": ["Neurology", "General Medicine"]
-                },
-                "chest_pain": {
-                    "related_symptoms": ["shortness_of_breath", "sweating", "nausea", "dizziness"],
-                    "possible_conditions": [
-                        {"name": "Muscle Strain", "probability": 0.4, "severity": "mild"},
-                        {"name": "Acid Reflux", "probability": 0.3, "severity": "mild"},
-                        {"name": "Heart Attack", "probability": 0.1, "severity": "severe"}
-                    ],
-                    "recommended_specialties": ["Cardiology", "Emergency Medicine"]
-                }
-            },
-            "age_specific_conditions": {
-                "pediatric": ["viral_infections", "ear_infections", "asthma"],
-                "adult": ["hypertension", "diabetes", "heart_disease"],
-                "elderly": ["arthritis", "osteoporosis", "dementia"]
-            },
-            "gender_specific_conditions": {
-                "female": ["menstrual_disorders", "pregnancy_complications", "breast_conditions"],
-                "male": ["prostate_issues", "erectile_dysfunction"]
-            }
-        }
+    """Advanced symptom analyzer using medical knowledge base and AI
+
+    The knowledge base is an immutable, versioned artifact (see
+    ``knowledge_base``) compiled into a single keyword automaton, so one
+    instance is safe to share across requests (see ``get_symptom_analyzer``).
+    """
     
-    def _load_symptom_patterns(self) -> Dict:
-        """Load symptom pattern recognition rules"""
-        return {
-            "severity_indicators": {
-                "mild": ["slight", "minor", "occasional", "mild"],
-                "moderate": ["persistent", "frequent", "noticeable", "moderate"],
-                "severe": ["severe", "intense", "unbearable", "extreme", "sharp"]
-            },
-            "duration_patterns": {
-                "acute": ["sudden", "immediate", "rapid", "quick"],
-                "chronic": ["ongoing", "persistent", "long-term", "continuous"]
-            },
-            "emergency_patterns": {
-                "cardiac": ["chest pain", "shortness of breath", "sweating", "nausea"],
-                "neurological": ["severe headache", "confusion", "seizure", "paralysis"],
-                "respiratory": ["difficulty breathing", "wheezing", "blue lips"],
-                "gastrointestinal": ["severe abdominal pain", "blood in vomit", "black stool"]
-            }
-        }
+    def __init__(self, knowledge_base: Optional[KnowledgeBase] = None):
+        self.knowledge_base = knowledge_base or load_knowledge_base()
+        self.knowledge_base_version = self.knowledge_base.version_id
+        self.medical_knowledge_base = self.knowledge_base.medical_knowledge_base
+        self.symptom_patterns = self.knowledge_base.symptom_patterns
+        self.emergency_keywords = self.knowledge_base.emergency_keywords
+        
+        self._keyword_automaton = self._compile_keyword_automaton()
+        self._incidence_matrix = SymptomIncidenceMatrix(
+            self.medical_knowledge_base["common_conditions"],
+            self.emergency_keywords,
+            self.symptom_patterns["emergency_patterns"],
+            CONDITION_MATCH,
+            EMERGENCY_KEYWORD_MATCH,
+            EMERGENCY_PATTERN_MATCH
+        )
+        self._demographic_priors = DemographicPriors(
+            self._incidence_matrix.entry_names,
+            self._incidence_matrix.entry_probability,
+            self.knowledge_base.demographic_priors
+        )
+        self._inference = NaiveBayesInference(
+            self._incidence_matrix, self._demographic_priors, self.knowledge_base.condition_likelihoods
+        )
+        self._question_selector = FollowUpQuestionSelector(
+            self._incidence_matrix,
+            self._inference,
+            (
+                (term, condition_key)
+                for condition_key, condition_data in self.medical_knowledge_base["common_conditions"].items()
+                for term in (condition_key, *condition_data["related_symptoms"])
+            )
+        )
+        self._normalizer = self._build_normalizer()
+        
+    def _compile_keyword_automaton(self) -> KeywordAutomaton:
+        """Compile condition, related-symptom and emergency keywords into one automaton"""
+        keywords = []
+        for condition_key, condition_data in self.medical_knowledge_base["common_conditions"].items():
+            keywords.append((condition_key, (CONDITION_MATCH, condition_key)))
+            for related_symptom in condition_data["related_symptoms"]:
+                keywords.append((related_symptom, (CONDITION_MATCH, condition_key)))
+        
+        for emergency_keyword in self.emergency_keywords:
+            keywords.append((emergency_keyword.lower(), (EMERGENCY_KEYWORD_MATCH, emergency_keyword)))
+        
+        for pattern_type, pattern_symptoms in self.symptom_patterns["emergency_patterns"].items():
+            for pattern_symptom in pattern_symptoms:
+                keywords.append((pattern_symptom, (EMERGENCY_PATTERN_MATCH, pattern_type, pattern_symptom)))
+        
+        return KeywordAutomaton(keywords)
     
-    def _load_emergency_keywords(self) -> List[str]:
-        """Load emergency keywords that require immediate attention"""
-        return [
-            "chest pain", "difficulty breathing", "severe headache", "unconscious",
-            "seizure", "severe bleeding", "poisoning", "severe burns", "paralysis",
-            "severe abdominal pain", "high fever", "confusion", "severe allergic reaction"
-        ]
+    def _build_normalizer(self) -> SymptomNormalizer:
+        """Index every term the keyword automaton matches for typo-tolerant lookup"""
+        vocabulary_terms = []
+        for condition_key, condition_data in self.medical_knowledge_base["common_conditions"].items():
+            vocabulary_terms.append(condition_key)
+            vocabulary_terms.extend(condition_data["related_symptoms"])
+        vocabulary_terms.extend(keyword.lower() for keyword in self.emergency_keywords)
+        for pattern_symptoms in self.symptom_patterns["emergency_patterns"].values():
+            vocabulary_terms.extend(pattern_symptoms)
+
+        aliases = self.knowledge_base.symptom_aliases
+        return SymptomNormalizer(
+            vocabulary_terms,
+            self.knowledge_base.symptom_synonyms,
+            DEFAULT_SYMPTOM_ALIASES if aliases is None else aliases,
+            matchable_terms=self._keyword_automaton
+        )
     
+    def _scan_symptoms(self, symptoms: List[str]) -> List[Set[Tuple]]:
+        """Scan each symptom once and return the knowledge-base entries it mentions"""
+        return [self._keyword_automaton.find(symptom.lower()) for symptom in symptoms]
+        
     async def analyze_symptoms(
         self,
         symptoms: List[str],
@@ -122,90 +127,202 @@ class SymptomAnalyzer:
         """
         Perform comprehensive symptom analysis
         """
+        return await self._offload(
+            "_analyze_symptoms", symptoms, patient_age, patient_gender, medical_history, severity_level
+        )
+    
+    def _analyze_symptoms(
+        self,
+        symptoms: List[str],
+        patient_age: Optional[int],
+        patient_gender: Optional[str],
+        medical_history: Optional[List[str]],
+        severity_level: Optional[str]
+    ) -> SymptomAnalysisResponse:
+        """CPU-bound body of analyze_symptoms (runs in the analysis process pool)"""
         try:
             # Normalize symptoms
             normalized_symptoms = self._normalize_symptoms(symptoms)
             
+            # Scan every symptom against the knowledge base in a single pass
+            keyword_matches = self._scan_symptoms(normalized_symptoms)
+            
             # Check for emergency conditions
-            emergency_level = self._assess_emergency_level(normalized_symptoms)
+            emergency_level = self._assess_emergency_level(normalized_symptoms, keyword_matches)
             
             # Analyze symptom patterns
             primary_conditions = self._analyze_symptom_patterns(
-                normalized_symptoms, patient_age, patient_gender
-            )
-            
-            # Calculate confidence score
-            confidence = self._calculate_confidence(
-                normalized_symptoms, primary_conditions, medical_history
-            )
-            
-            # Generate recommendations
-            recommendations = self._generate_recommendations(
-                primary_conditions, emergency_level, patient_age
-            )
-            
-            # Get recommended specialties
-            specialties = self._get_recommended_specialties(primary_conditions)
-            
-            # Generate follow-up questions
-            follow_up_questions = self._generate_follow_up_questions(
-                normalized_symptoms, primary_conditions
+                normalized_symptoms, patient_age, patient_gender, keyword_matches
             )
             
-            return SymptomAnalysisResponse(
-                analysis_id=f"analysis_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}",
-                symptoms=symptoms,
-                primary_conditions=primary_conditions,
-                confidence=confidence,
-                emergency_level=emergency_level,
-                recommended_actions=recommendations,
-                recommended_specialties=specialties,
-                follow_up_questions=follow_up_questions,
-                analysis_timestamp=datetime.utcnow(),
-                disclaimer="This analysis is for informational purposes only and should not replace professional medical advice."
+            return self._build_response(
+                symptoms, normalized_symptoms, primary_conditions,
+                emergency_level, patient_age, medical_history
             )
             
         except Exception as e:
             logger.error(f"Error in symptom analysis: {str(e)}")
             raise
     
-    def _normalize_symptoms(self, symptoms: List[str]) -> List[str]:
-        """Normalize symptom descriptions"""
-        normalized = []
-        for symptom in symptoms:
-            # Convert to lowercase and remove extra spaces
-            normalized_symptom = re.sub(r'\s+', ' ', symptom.lower().strip())
-            
-            # Map common variations to standard terms
-            symptom_mapping = {
-                "tummy ache": "stomach pain",
-                "belly pain": "stomach pain",
-                "runny nose": "nasal congestion",
-                "stuffy nose": "nasal congestion",
-                "sore throat": "throat pain",
-                "shortness of breath": "difficulty breathing"
-            }
+    async def analyze_symptoms_batch(
+        self,
+        requests: List[SymptomAnalysisRequest],
+        chunk_size: int = 256
+    ) -> List[SymptomAnalysisResponse]:
+        """
+        Analyze many patients at once, one process-pool call per chunk.
+        
+        Produces the same responses as calling ``analyze_symptoms`` per request.
+        """
+        try:
+            chunk_results = await asyncio.gather(*[
+                self._offload("_analyze_chunk", requests[chunk_start:chunk_start + chunk_size])
+                for chunk_start in range(0, len(requests), chunk_size)
+            ])
+            return [response for chunk in chunk_results for response in chunk]
             
-            normalized_symptom = symptom_mapping.get(normalized_symptom, normalized_symptom)
-            normalized.append(normalized_symptom)
+        except Exception as e:
+            logger.error(f"Error in batch symptom analysis: {str(e)}")
+            raise
+    
+    async def _offload(self, method: str, *args):
+        """Run a CPU-bound analyzer method in the process pool, or inline without one"""
+        if self.knowledge_base.source_dir is None or not analysis_executor.running:
+            return getattr(self, method)(*args)
+        return await analysis_executor.run(
+            SYMPTOM_LANE,
+            _run_in_worker,
+            self.knowledge_base.source_dir,
+            self.knowledge_base.artifact_name,
+            self.knowledge_base_version,
+            method,
+            *args
+        )
+    
+    def _analyze_chunk(self, requests: List[SymptomAnalysisRequest]) -> List[SymptomAnalysisResponse]:
+        """Analyze one chunk of requests; the symptoms of the whole chunk are
+        scanned at once, then each request is scored exactly as
+        ``_analyze_symptoms`` scores it"""
+        normalized_batch = [self._normalize_symptoms(request.symptoms) for request in requests]
+        keyword_matches = self._scan_symptoms(
+            [symptom for normalized in normalized_batch for symptom in normalized]
+        )
+        
+        responses = []
+        start = 0
+        for request, normalized_symptoms in zip(requests, normalized_batch):
+            matches = keyword_matches[start:start + len(normalized_symptoms)]
+            start += len(normalized_symptoms)
+            responses.append(self._build_response(
+                request.symptoms,
+                normalized_symptoms,
+                self._analyze_symptom_patterns(
+                    normalized_symptoms, request.patient_age, request.patient_gender, matches
+                ),
+                self._assess_emergency_level(normalized_symptoms, matches),
+                request.patient_age,
+                request.medical_history
+            ))
         
-        return normalized
+        return responses
+    
+    def _ranked_keys(
+        self,
+        keys: Sequence[int],
+        key_offsets: Sequence[int],
+        demographics: Tuple[int, int],
+        limit: int = 5
+    ) -> List[Tuple[int, float, int]]:
+        """(winning entry, posterior, symptom offset) of the top conditions given
+        the matched condition-key columns, the first symptom mentioning each and
+        the patient's ``DemographicPriors.index`` row"""
+        return self._inference.rank(keys, key_offsets, demographics, limit)
     
-    def _assess_emergency_level(self, symptoms: List[str]) -> str:
+    def _condition_from_entry(self, entry: int, probability: float, symptom: str) -> MedicalCondition:
+        """Build the MedicalCondition for a knowledge base entry matched by ``symptom``"""
+        matrix = self._incidence_matrix
+        name = matrix.entry_names[entry]
+        return MedicalCondition(
+            name=name,
+            probability=probability,
+            severity=matrix.entry_severities[entry],
+            description=f"Condition matching symptoms: {symptom}",
+            icd_code=self._get_icd_code(name)
+        )
+    
+    def _build_response(
+        self,
+        symptoms: List[str],
+        normalized_symptoms: List[str],
+        primary_conditions: List[MedicalCondition],
+        emergency_level: str,
+        patient_age: Optional[int],
+        medical_history: Optional[List[str]]
+    ) -> SymptomAnalysisResponse:
+        """Assemble the analysis response from scored conditions"""
+        # Calculate confidence score
+        confidence = self._calculate_confidence(
+            normalized_symptoms, primary_conditions, medical_history
+        )
+        
+        # Generate recommendations
+        recommendations = self._generate_recommendations(
+            primary_conditions, emergency_level, patient_age
+        )
+        
+        # Get recommended specialties
+        specialties = self._get_recommended_specialties(primary_conditions)
+        
+        # Generate follow-up questions
+        follow_up_questions = self._generate_follow_up_questions(
+            normalized_symptoms, primary_conditions
+        )
+        
+        return SymptomAnalysisResponse(
+            analysis_id=f"analysis_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}",
+            symptoms=symptoms,
+            primary_conditions=primary_conditions,
+            confidence=confidence,
+            emergency_level=emergency_level,
+            recommended_actions=recommendations,
+            recommended_specialties=specialties,
+            follow_up_questions=follow_up_questions,
+            analysis_timestamp=datetime.utcnow(),
+            disclaimer="This analysis is for informational purposes only and should not replace professional medical advice."
+        )
+    
+    def _normalize_symptoms(self, symptoms: List[str]) -> List[str]:
+        """Normalize symptom descriptions, correcting typos and transliterations"""
+        return [self._normalizer.normalize(symptom) for symptom in symptoms]
+    
+    def _assess_emergency_level(
+        self,
+        symptoms: List[str],
+        keyword_matches: Optional[List[Set[Tuple]]] = None
+    ) -> str:
         """Assess if symptoms indicate emergency condition"""
+        if keyword_matches is None:
+            keyword_matches = self._scan_symptoms(symptoms)
+        
         emergency_score = 0
+        pattern_hits: Dict[str, Set[str]] = {}
         
-        for symptom in symptoms:
-            for emergency_keyword in self.emergency_keywords:
-                if emergency_keyword.lower() in symptom.lower():
+        for matches in keyword_matches:
+            for match in matches:
+                if match[0] == EMERGENCY_KEYWORD_MATCH:
                     emergency_score += 1
+                elif match[0] == EMERGENCY_PATTERN_MATCH:
+                    pattern_hits.setdefault(match[1], set()).add(match[2])
         
         # Check for emergency patterns
-        for pattern_type, pattern_symptoms in self.symptom_patterns["emergency_patterns"].items():
-            matching_symptoms = sum(1 for ps in pattern_symptoms if any(ps in s for s in symptoms))
-            if matching_symptoms >= 2:
+        for matching_symptoms in pattern_hits.values():
+            if len(matching_symptoms) >= 2:
                 emergency_score += 2
         
+        return self._emergency_level_from_score(emergency_score)
+    
+    def _emergency_level_from_score(self, emergency_score: int) -> str:
+        """Map an emergency score to an emergency level"""
         if emergency_score >= 3:
             return "high"
         elif emergency_score >= 1:
@@ -217,66 +334,33 @@ class SymptomAnalyzer:
         self, 
         symptoms: List[str], 
         age: Optional[int], 
-        gender: Optional[str]
+        gender: Optional[str],
+        keyword_matches: Optional[List[Set[Tuple]]] = None
     ) -> List[MedicalCondition]:
-        """Analyze symptoms against medical knowledge base"""
-        conditions = []
-        
-        # Find matching conditions from knowledge base
-        for symptom in symptoms:
-            for condition_key, condition_data in self.medical_knowledge_base["common_conditions"].items():
-                if condition_key in symptom or any(rs in symptom for rs in condition_data["related_symptoms"]):
-                    for possible_condition in condition_data["possible_conditions"]:
-                        # Adjust probability based on age and gender
-                        adjusted_probability = self._adjust_probability_for_demographics(
-                            possible_condition["probability"], age, gender, possible_condition["name"]
-                        )
-                        
-                        conditions.append(MedicalCondition(
-                            name=possible_condition["name"],
-                            probability=adjusted_probability,
-                            severity=possible_condition["severity"],
-                            description=f"Condition matching symptoms: {symptom}",
-                            icd_code=self._get_icd_code(possible_condition["name"])
-                        ))
-        
-        # Remove duplicates and sort by probability
-        unique_conditions = {}
-        for condition in conditions:
-            if condition.name in unique_conditions:
-                # Take the higher probability
-                if condition.probability > unique_conditions[condition.name].probability:
-                    unique_conditions[condition.name] = condition
-            else:
-                unique_conditions[condition.name] = condition
+        """Rank knowledge base conditions by posterior probability given the symptoms"""
+        if keyword_matches is None:
+            keyword_matches = self._scan_symptoms(symptoms)
         
-        # Sort by probability and return top 5
-        sorted_conditions = sorted(unique_conditions.values(), key=lambda x: x.probability, reverse=True)
-        return sorted_conditions[:5]
+        # Offset of the first symptom mentioning each matched condition key
+        key_offsets: Dict[int, int] = {}
+        for offset, matches in enumerate(keyword_matches):
+            for key in self._incidence_matrix.condition_columns(matches):
+                key_offsets.setdefault(key, offset)
+        
+        ranked = self._ranked_keys(
+            list(key_offsets.keys()),
+            list(key_offsets.values()),
+            self._demographic_priors.index(age, gender)
+        )
+        return [
+            self._condition_from_entry(entry, probability, symptoms[symptom_offset])
+            for entry, probability, symptom_offset in ranked
+        ]
     
-    def _adjust_probability_for_demographics(
-        self, base_probability: float, age: Optional[int], gender: Optional[str], condition_name: str
-    ) -> float:
-        """Adjust condition probability based on patient demographics"""
-        adjusted_prob = base_probability
-        
-        # Age-based adjustments
-        if age:
-            if age < 18:  # Pediatric
-                if condition_name in ["Viral Fever", "Common Cold"]:
-                    adjusted_prob *= 1.2
-            elif age > 65:  # Elderly
-                if condition_name in ["Pneumonia", "Heart Attack"]:
-                    adjusted_prob *= 1.3
-        
-        # Gender-based adjustments
-        if gender:
-            if gender.lower() == "female" and condition_name == "Migraine":
-                adjusted_prob *= 1.4
-            elif gender.lower() == "male" and condition_name == "Heart Attack":
-                adjusted_prob *= 1.2
-        
-        return min(adjusted_prob, 1.0)  # Cap at 1.0
+    @staticmethod
+    def age_bucket(age: Optional[int]) -> str:
+        """Age group used by demographic adjustments (ages within a bucket score alike)"""
+        return age_bucket(age)
     
     def _calculate_confidence(
         self, 
@@ -379,7 +463,13 @@ class SymptomAnalyzer:
         conditions: List[MedicalCondition]
     ) -> List[str]:
         """Generate follow-up questions for better diagnosis"""
-        questions = []
+        # Most discriminating symptoms first, then questions about reported ones
+        name_index = self._incidence_matrix.name_index
+        questions = self._discriminating_questions(
+            np.array([name_index[condition.name] for condition in conditions], dtype=np.intp),
+            np.array([condition.probability for condition in conditions], dtype=np.float64),
+            symptoms
+        )
         
         if any("pain" in s for s in symptoms):
             questions.append("On a scale of 1-10, how would you rate your pain level?")
@@ -403,15 +493,98 @@ class SymptomAnalyzer:
         
         return questions[:5]  # Limit to 5 questions
     
+    def _discriminating_questions(
+        self,
+        names: np.ndarray,
+        probabilities: np.ndarray,
+        symptoms: List[str],
+        limit: int = 3
+    ) -> List[str]:
+        """Ask about the unreported symptoms with the highest expected information gain"""
+        return [
+            f"Are you also experiencing {term}?"
+            for term, _ in self._question_selector.gains(names, probabilities, symptoms, limit)
+        ]
+    
     def _get_icd_code(self, condition_name: str) -> Optional[str]:
         """Get ICD-10 code for condition (simplified mapping)"""
-        icd_mapping = {
-            "Viral Fever": "R50.9",
-            "Dengue Fever": "A90",
-            "Common Cold": "J00",
-            "Pneumonia": "J18.9",
-            "Gastritis": "K29.7",
-            "Migraine": "G43.9",
-            "Heart Attack": "I21.9"
-        }
-        return icd_mapping.get(condition_name)
+        return self.knowledge_base.icd_codes.get(condition_name)
+
+# Process-wide analyzer; the knowledge base is compiled once per worker and
+# replaced wholesale (never mutated) when a new version is activated. Pool
+# workers keep the analyzer they replaced, for requests still in flight
+# against the previous version while a reload is warming them
+_shared_analyzer: Optional[SymptomAnalyzer] = None
+_previous_analyzer: Optional[SymptomAnalyzer] = None
+_reload_lock = asyncio.Lock()
+
+def get_symptom_analyzer() -> SymptomAnalyzer:
+    """Get the shared, immutable SymptomAnalyzer instance"""
+    global _shared_analyzer
+    if _shared_analyzer is None:
+        _shared_analyzer = SymptomAnalyzer()
+    return _shared_analyzer
+
+def _worker_analyzer(kb_dir: str, version: str, version_id: str) -> SymptomAnalyzer:
+    """The pool worker's analyzer for a KB version, loading it if needed"""
+    global _shared_analyzer, _previous_analyzer
+    if _shared_analyzer is None or _shared_analyzer.knowledge_base_version != version_id:
+        if _previous_analyzer is not None and _previous_analyzer.knowledge_base_version == version_id:
+            _shared_analyzer, _previous_analyzer = _previous_analyzer, _shared_analyzer
+        else:
+            _previous_analyzer = _shared_analyzer
+            _shared_analyzer = SymptomAnalyzer(load_knowledge_base(kb_dir, version))
+    return _shared_analyzer
+
+def _run_in_worker(kb_dir: str, version: str, version_id: str, method: str, *args):
+    """Process-pool entry point: run an analyzer method against the caller's KB version"""
+    return getattr(_worker_analyzer(kb_dir, version, version_id), method)(*args)
+
+def _warm_worker(kb_dir: str, version: str, version_id: str) -> int:
+    """Process-pool warm-up task: load a KB version ahead of its first request"""
+    _worker_analyzer(kb_dir, version, version_id)
+    return os.getpid()
+
+async def reload_symptom_analyzer(version: Optional[str] = None) -> SymptomAnalyzer:
+    """Load a knowledge base version and atomically swap in a new analyzer.
+    
+    Loading and compiling run in a worker thread so the event loop keeps
+    serving requests with the previous analyzer until the swap. The process
+    pool's workers load the new version before the swap too, so the first
+    requests against it don't pay for compiling it.
+    """
+    global _shared_analyzer
+    async with _reload_lock:
+        knowledge_base = await asyncio.to_thread(load_knowledge_base, None, version)
+        analyzer = await asyncio.to_thread(SymptomAnalyzer, knowledge_base)
+        if knowledge_base.source_dir is not None:
+            try:
+                await analysis_executor.warm_up(
+                    _warm_worker,
+                    knowledge_base.source_dir,
+                    knowledge_base.artifact_name,
+                    analyzer.knowledge_base_version
+                )
+            except Exception as e:
+                # Workers still load the version on their first request
+                logger.error(f"Error warming analysis workers: {str(e)}")
+        previous = _shared_analyzer
+        _shared_analyzer = analyzer
+    
+    logger.info(
+        f"Symptom analyzer switched to knowledge base {analyzer.knowledge_base_version}"
+        + (f" (was {previous.knowledge_base_version})" if previous else "")
+    )
+    return analyzer
+
+async def watch_knowledge_base(interval: int = settings.KNOWLEDGE_BASE_POLL_SECONDS):
+    """Background task: reload the analyzer whenever the active KB version changes"""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            version = await asyncio.to_thread(current_version)
+            # CURRENT names a directory; the manifest's version field may differ
+            if _shared_analyzer is None or version != _shared_analyzer.knowledge_base.artifact_name:
+                await reload_symptom_analyzer(version)
+        except Exception as e:
+            logger.error(f"Error reloading medical knowledge base: {str(e)}")
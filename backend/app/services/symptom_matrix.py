@@ -0,0 +1,120 @@
+"""
+Knowledge base laid out as symptom x condition incidence columns
+"""
+
+from typing import Dict, Hashable, List, Mapping, Sequence, Set, Tuple
+
+import numpy as np
+
+# Sentinel for "no match" in integer min-reductions
+NO_MATCH = np.iinfo(np.int64).max
+
+class SymptomIncidenceMatrix:
+    """Knowledge base laid out as arrays and column indexes for condition scoring.
+
+    Columns are indexed three ways: condition keys (what a symptom mentions),
+    condition entries (one per ``possible_conditions`` item, in knowledge-base
+    order) and condition names (entries grouped by name). Emergency keywords
+    and emergency patterns get their own column spaces.
+    """
+
+    def __init__(
+        self,
+        common_conditions: Mapping[str, Mapping],
+        emergency_keywords: Sequence[str],
+        emergency_patterns: Mapping[str, Sequence[str]],
+        condition_tag: str,
+        emergency_keyword_tag: str,
+        emergency_pattern_tag: str
+    ):
+        self.condition_keys = list(common_conditions)
+        condition_index = {key: index for index, key in enumerate(self.condition_keys)}
+
+        entry_condition = []
+        entry_probability = []
+        self.entry_names: List[str] = []
+        self.entry_severities: List[str] = []
+        self.condition_names: List[str] = []
+        self.name_index: Dict[str, int] = {}
+        entry_name = []
+        for condition_key, condition_data in common_conditions.items():
+            for possible_condition in condition_data["possible_conditions"]:
+                name = possible_condition["name"]
+                entry_condition.append(condition_index[condition_key])
+                entry_probability.append(possible_condition["probability"])
+                self.entry_names.append(name)
+                self.entry_severities.append(possible_condition["severity"])
+                if name not in self.name_index:
+                    self.name_index[name] = len(self.condition_names)
+                    self.condition_names.append(name)
+                entry_name.append(self.name_index[name])
+
+        self.entry_condition = np.asarray(entry_condition, dtype=np.intp)
+        self.entry_probability = np.asarray(entry_probability, dtype=np.float64)
+        self.entry_name = np.asarray(entry_name, dtype=np.intp)
+        self.entry_count = len(entry_condition)
+        # Entries are laid out key by key, so each key owns one contiguous range
+        key_lengths = np.bincount(self.entry_condition, minlength=len(self.condition_keys))
+        self.key_entry_starts = np.r_[0, np.cumsum(key_lengths)].astype(np.intp)
+
+        # Entries sorted by name, with segment starts for per-name reductions
+        self._name_order = np.argsort(self.entry_name, kind="stable")
+        self._name_starts = np.flatnonzero(
+            np.r_[True, np.diff(self.entry_name[self._name_order]) != 0]
+        )
+
+        # Emergency columns; patterns are grouped by pattern type
+        self._column_of: Dict[Hashable, Tuple[str, int]] = {}
+        for condition_key, index in condition_index.items():
+            self._column_of[(condition_tag, condition_key)] = ("condition", index)
+        for index, keyword in enumerate(emergency_keywords):
+            self._column_of[(emergency_keyword_tag, keyword)] = ("keyword", index)
+        pattern_type_of_column = []
+        pattern_count = 0
+        for type_index, (pattern_type, pattern_symptoms) in enumerate(emergency_patterns.items()):
+            for pattern_symptom in dict.fromkeys(pattern_symptoms):
+                self._column_of[(emergency_pattern_tag, pattern_type, pattern_symptom)] = (
+                    "pattern", pattern_count
+                )
+                pattern_type_of_column.append(type_index)
+                pattern_count += 1
+        self.pattern_count = pattern_count
+        self._pattern_type_starts = np.flatnonzero(
+            np.r_[True, np.diff(np.asarray(pattern_type_of_column, dtype=np.intp)) != 0]
+        ) if pattern_count else np.zeros(0, dtype=np.intp)
+
+    def columns(self, matches: Set[Hashable]) -> Tuple[np.ndarray, int, np.ndarray]:
+        """Columns one symptom's automaton matches touch.
+
+        Returns the condition-key columns, the emergency keyword hit count and
+        the emergency-pattern columns; used to apply single-symptom deltas.
+        """
+        condition_columns, pattern_columns = [], []
+        keyword_hits = 0
+        for match in matches:
+            kind, column = self._column_of[match]
+            if kind == "condition":
+                condition_columns.append(column)
+            elif kind == "keyword":
+                keyword_hits += 1
+            else:
+                pattern_columns.append(column)
+        return (
+            np.asarray(condition_columns, dtype=np.intp),
+            keyword_hits,
+            np.asarray(pattern_columns, dtype=np.intp)
+        )
+
+    def condition_columns(self, matches: Set[Hashable]) -> List[int]:
+        """Condition-key columns one symptom's automaton matches touch"""
+        column_of = self._column_of
+        return [column for kind, column in map(column_of.__getitem__, matches) if kind == "condition"]
+
+    def emergency_score(self, keyword_hits: int, pattern_present: np.ndarray) -> int:
+        """Emergency score from a keyword hit total and the matched pattern columns:
+        one per keyword hit, two per matched pattern type"""
+        score = keyword_hits
+        if self.pattern_count:
+            per_type = np.add.reduceat(pattern_present.astype(np.int64), self._pattern_type_starts)
+            score += 2 * int((per_type >= 2).sum())
+        return score
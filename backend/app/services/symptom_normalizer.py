@@ -0,0 +1,283 @@
+"""
+Typo-tolerant symptom normalization index
+"""
+
+from collections import defaultdict
+from functools import lru_cache
+from typing import Dict, Iterable, List, Mapping, Optional, Set, Tuple
+import re
+
+from .keyword_automaton import KeywordAutomaton
+
+# Filler words that are never treated as misspelled symptom terms
+STOPWORDS = frozenset({
+    "have", "having", "has", "had", "with", "since", "from", "very", "really", "some", "been",
+    "feel", "feels", "feeling", "after", "before", "when", "than", "then", "that", "this",
+    "there", "they", "them", "your", "mine", "also", "much", "more", "most", "days", "weeks",
+    "week", "month", "months", "hours", "today", "yesterday", "night", "morning", "evening",
+    "little", "about", "again", "still", "while", "during", "both", "sometimes", "always"
+})
+
+# Everyday English words patients use around symptoms. They are spelled
+# correctly, so they are never "corrected" to a nearby vocabulary word
+# (back -> black, hips -> lips, swelling -> sweating, bloody -> blood).
+COMMON_WORDS = frozenset({
+    # Body parts
+    "abdomen", "ankle", "ankles", "arm", "arms", "armpit", "back", "belly", "bladder", "bone",
+    "bones", "bowel", "bowels", "brain", "breast", "breasts", "calf", "cheek", "cheeks", "chin",
+    "ear", "ears", "elbow", "elbows", "eye", "eyes", "eyelid", "face", "finger", "fingers",
+    "foot", "feet", "forehead", "groin", "gums", "hand", "hands", "head", "heart", "heel",
+    "hip", "hips", "jaw", "joint", "joints", "kidney", "kidneys", "knee", "knees", "leg",
+    "legs", "limb", "limbs", "liver", "lung", "lungs", "mouth", "muscle", "muscles", "nail",
+    "nails", "navel", "nerve", "nerves", "palm", "palms", "pelvis", "rib", "ribs", "shin",
+    "shoulder", "shoulders", "side", "sides", "skin", "skull", "spine", "teeth", "thigh",
+    "thighs", "thumb", "toe", "toes", "tongue", "tooth", "waist", "wrist", "wrists",
+    # Symptom descriptions
+    "aching", "bleed", "bleeds", "blister", "blisters", "blood", "bloody", "blurred", "blurry",
+    "bruise", "bruises", "bruising", "bump", "bumps", "burning", "burn", "choking", "cold",
+    "constant", "cramp", "cramps", "cramping", "dark", "discharge", "dull", "faint", "fainted",
+    "fainting", "fall", "fell", "heavy", "hurt", "hurts", "hurting", "injury", "itch", "itching",
+    "itchy", "left", "loose", "lose", "losing", "lost", "loud", "lump", "lumps", "mild",
+    "noise", "numb", "numbness", "pale", "pains", "painful", "pounding", "pressure", "pulse",
+    "racing", "rash", "rashes", "redness", "right", "sharp", "shaking", "sick", "sleep",
+    "sleepy", "smell", "sneezing", "sore", "spasm", "spasms", "stabbing", "stiff", "swelling",
+    "swell", "swollen", "taste", "tender", "thick", "thin", "throbbing", "tight", "tightness",
+    "tingling", "tired", "upper", "lower", "urine", "vision", "weak", "weakness", "wheeze",
+    "white", "worse", "worst", "wound", "yellow",
+    # Other common words
+    "able", "along", "around", "awake", "because", "better", "body", "could", "does", "done",
+    "down", "even", "every", "fast", "food", "good", "hard", "hear", "hearing", "help", "hold",
+    "home", "just", "keep", "kind", "know", "last", "less", "like", "long", "lots", "make",
+    "many", "mostly", "need", "nothing", "often", "only", "over", "pill", "pills", "rest",
+    "same", "seem", "seems", "slow", "soft", "something", "start", "started", "stop", "sudden",
+    "suddenly", "take", "taking", "time", "times", "tried", "under", "walk", "walking", "water",
+    "well", "what", "where", "which", "whole", "will", "without", "work", "worried", "would"
+})
+
+# Transliterated and Bengali-script phrases for knowledge base symptoms. A
+# knowledge base may ship its own ``symptom_aliases`` section in this shape.
+DEFAULT_SYMPTOM_ALIASES: Dict[str, str] = {
+    "jor": "fever",
+    "jwor": "fever",
+    "জ্বর": "fever",
+    "matha betha": "headache",
+    "matha byatha": "headache",
+    "মাথা ব্যথা": "headache",
+    "মাথাব্যথা": "headache",
+    "kashi": "cough",
+    "kasi": "cough",
+    "কাশি": "cough",
+    "pet betha": "stomach pain",
+    "pet byatha": "stomach pain",
+    "পেট ব্যথা": "stomach pain",
+    "পেটব্যথা": "stomach pain",
+    "buke betha": "chest pain",
+    "buk betha": "chest pain",
+    "বুকে ব্যথা": "chest pain",
+    "বুক ব্যথা": "chest pain",
+    "shash koshto": "difficulty breathing",
+    "শ্বাসকষ্ট": "difficulty breathing",
+    "bomi": "vomiting",
+    "বমি": "vomiting",
+    "patla paikhana": "diarrhea",
+    "ডায়রিয়া": "diarrhea",
+    "matha ghora": "dizziness",
+    "মাথা ঘোরা": "dizziness",
+    "durbolota": "fatigue",
+    "দুর্বলতা": "fatigue",
+    "khichuni": "seizure",
+    "খিঁচুনি": "seizure"
+}
+
+def _edit_distance(source: str, target: str, max_distance: int) -> int:
+    """Optimal string alignment distance, or ``max_distance + 1`` once it is exceeded"""
+    if abs(len(source) - len(target)) > max_distance:
+        return max_distance + 1
+
+    previous_previous: List[int] = []
+    previous = list(range(len(target) + 1))
+    for i, source_char in enumerate(source, 1):
+        current = [i] + [0] * len(target)
+        for j, target_char in enumerate(target, 1):
+            cost = 0 if source_char == target_char else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if (i > 1 and j > 1 and source_char == target[j - 2]
+                    and source[i - 2] == target_char):
+                current[j] = min(current[j], previous_previous[j - 2] + 1)
+        if min(current) > max_distance:
+            return max_distance + 1
+        previous_previous, previous = previous, current
+    return previous[-1]
+
+def _deletes(word: str, max_distance: int) -> Set[str]:
+    """Every string obtained by deleting up to ``max_distance`` characters"""
+    results = {word}
+    frontier = {word}
+    for _ in range(max_distance):
+        frontier = {
+            candidate[:index] + candidate[index + 1:]
+            for candidate in frontier
+            for index in range(len(candidate))
+        }
+        results |= frontier
+    return results
+
+class SymptomNormalizer:
+    """Maps noisy patient input onto the knowledge base's symptom vocabulary.
+
+    Normalization lowercases and collapses whitespace, then:
+
+    * returns the synonym for exact whole-phrase synonyms (unchanged behavior);
+    * replaces unknown words with the closest vocabulary word using a
+      SymSpell-style deletion index (edit distance 1 for words of 4-7
+      characters, 2 for longer ones), so "hedache" becomes "headache";
+    * replaces alias phrases (transliterated or Bengali-script terms, e.g.
+      "matha betha") with their English term via a token trie, longest match
+      first, then re-checks the synonym table.
+
+    Words that are short, stopwords, common English words, already in the
+    vocabulary or already containing a term the analyzer matches are left
+    alone, so input that matched before still matches the same terms. Alias
+    replacements are written the way the vocabulary spells them ("stomach
+    pain" becomes "stomach_pain" when only the underscore key exists). Lookups cost a bounded number
+    of hash probes per word and both words and whole symptoms are LRU-cached.
+    """
+
+    def __init__(
+        self,
+        vocabulary_terms: Iterable[str],  # terms the analyzer matches
+        synonyms: Mapping[str, str],
+        aliases: Optional[Mapping[str, str]] = None,
+        max_distance: int = 2,
+        prefix_length: int = 7,
+        cache_size: int = 8192,
+        matchable_terms: Optional[KeywordAutomaton] = None  # the analyzer's automaton, if built
+    ):
+        self.synonyms = synonyms
+        self.max_distance = max_distance
+        self.prefix_length = prefix_length
+        vocabulary_terms = list(vocabulary_terms)
+        known_terms = {term.lower() for term in vocabulary_terms}
+
+        # Alias phrases as a token trie; None marks the end of a phrase
+        self._alias_trie: Dict = {}
+        for alias, replacement in (aliases or {}).items():
+            node = self._alias_trie
+            for token in alias.lower().split():
+                node = node.setdefault(token, {})
+            node[None] = self._vocabulary_form(replacement, known_terms)
+
+        # Vocabulary words with their frequency, used to break ties
+        self._words: Dict[str, int] = {}
+        terms = vocabulary_terms + list(synonyms) + list(synonyms.values()) + list(aliases or {})
+        for term in terms:
+            for word in self._split_words(term.lower()):
+                self._words[word] = self._words.get(word, 0) + 1
+
+        # Words sharing a prefix share its deletes, so each prefix is expanded once
+        prefixes: Dict[Tuple[str, int], List[str]] = defaultdict(list)
+        for word in self._words:
+            if len(word) >= 4:
+                prefixes[word[:prefix_length], self._max_distance_for(word)].append(word)
+        self._deletion_index: Dict[str, List[str]] = defaultdict(list)
+        for (prefix, distance), words in prefixes.items():
+            for deleted in _deletes(prefix, distance):
+                self._deletion_index[deleted].extend(words)
+
+        # Words already containing a term the analyzer matches are left as is;
+        # a single word can only contain terms without spaces, so the analyzer's
+        # own automaton answers that without compiling a second one
+        self._matchable_terms = matchable_terms or KeywordAutomaton(
+            (term.lower(), term) for term in vocabulary_terms if " " not in term
+        )
+        self.correct_word = lru_cache(maxsize=cache_size)(self._correct_word)
+        self.normalize = lru_cache(maxsize=cache_size)(self._normalize)
+
+    @staticmethod
+    def _split_words(term: str) -> Set[str]:
+        """Words of a term, also split at underscores ("body_ache" -> body, ache)"""
+        words = set(term.split())
+        for word in list(words):
+            if "_" in word:
+                words.update(part for part in word.split("_") if part)
+        return words
+
+    @staticmethod
+    def _vocabulary_form(term: str, known_terms: Set[str]) -> str:
+        """A term as the vocabulary spells it, trying the underscore form of phrases"""
+        term = term.lower()
+        if term not in known_terms and term.replace(" ", "_") in known_terms:
+            return term.replace(" ", "_")
+        return term
+
+    def _max_distance_for(self, word: str) -> int:
+        if len(word) < 4:
+            return 0
+        return min(1 if len(word) < 8 else 2, self.max_distance)
+
+    def _correct_word(self, word: str) -> Optional[str]:
+        """Closest vocabulary word to an unknown word, or None"""
+        max_distance = self._max_distance_for(word)
+        if (not max_distance or len(word) > 32 or word in self._words or word in STOPWORDS
+                or word in COMMON_WORDS or not any(char.isalpha() for char in word)
+                or self._matchable_terms.find(word)):
+            return None
+
+        best: Optional[Tuple[int, int, str]] = None
+        seen: Set[str] = set()
+        for deleted in _deletes(word[:self.prefix_length], max_distance):
+            for candidate in self._deletion_index.get(deleted, ()):
+                if candidate in seen:
+                    continue
+                seen.add(candidate)
+                distance = _edit_distance(word, candidate, max_distance)
+                if distance <= max_distance:
+                    rank = (distance, -self._words[candidate], candidate)
+                    if best is None or rank < best:
+                        best = rank
+        return best[2] if best else None
+
+    def _replace_aliases(self, tokens: List[str]) -> List[str]:
+        """Replace alias phrases in a token list, longest match first"""
+        if not self._alias_trie:
+            return tokens
+        result: List[str] = []
+        position = 0
+        while position < len(tokens):
+            node = self._alias_trie
+            match: Optional[Tuple[int, str]] = None
+            for end in range(position, len(tokens)):
+                node = node.get(tokens[end])
+                if node is None:
+                    break
+                if None in node:
+                    match = (end + 1, node[None])
+            if match:
+                result.append(match[1])
+                position = match[0]
+            else:
+                result.append(tokens[position])
+                position += 1
+        return result
+
+    def _normalize(self, symptom: str) -> str:
+        normalized = re.sub(r'\s+', ' ', symptom.lower().strip())
+        if normalized in self.synonyms:
+            return self.synonyms[normalized]
+
+        tokens = [self.correct_word(token) or token for token in normalized.split(" ")]
+        tokens = self._replace_aliases(tokens)
+        corrected = " ".join(tokens)
+        return self.synonyms.get(corrected, corrected)
+
+    def cache_info(self) -> Dict[str, int]:
+        """Hit/miss counters of the word and symptom caches"""
+        words, symptoms = self.correct_word.cache_info(), self.normalize.cache_info()
+        return {
+            "word_hits": words.hits,
+            "word_misses": words.misses,
+            "symptom_hits": symptoms.hits,
+            "symptom_misses": symptoms.misses,
+            "vocabulary_size": len(self._words),
+            "deletion_index_size": len(self._deletion_index)
+        }
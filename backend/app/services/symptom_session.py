@@ -0,0 +1,163 @@
+"""
+Incremental symptom analysis for interactive (per-keystroke) sessions
+"""
+
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ..models.ai_models import MedicalCondition
+from .symptom_analyzer import SymptomAnalyzer
+from .symptom_matrix import NO_MATCH
+
+logger = logging.getLogger(__name__)
+
+class SymptomSession:
+    """Keeps a patient's partially scored condition state between edits.
+
+    Adding or removing a symptom scans only that symptom and applies it as a
+    delta: the offset of the first symptom mentioning each condition key, the
+    emergency keyword hit total and per-pattern-symptom counts. Ranking the
+    top conditions from that state reproduces ``analyze_symptoms`` exactly,
+    without re-normalizing or re-scanning the rest of the list.
+    """
+
+    def __init__(
+        self,
+        analyzer: SymptomAnalyzer,
+        patient_age: Optional[int] = None,
+        patient_gender: Optional[str] = None,
+        max_symptoms: int = 50
+    ):
+        self.patient_age = patient_age
+        self.patient_gender = patient_gender
+        self.max_symptoms = max_symptoms
+        self.symptoms: List[str] = []
+        self.normalized_symptoms: List[str] = []
+        self._reset(analyzer)
+
+    def _reset(self, analyzer: SymptomAnalyzer):
+        """Bind to an analyzer (knowledge base version) and rebuild the state"""
+        self.analyzer = analyzer
+        matrix = analyzer._incidence_matrix
+        self._demographics = analyzer._demographic_priors.index(self.patient_age, self.patient_gender)
+        self._symptom_columns: List[Tuple[np.ndarray, int, np.ndarray]] = []
+        self._first_offset = np.full(len(matrix.condition_keys), NO_MATCH, dtype=np.int64)
+        self._keyword_hits = 0
+        self._pattern_counts = np.zeros(matrix.pattern_count, dtype=np.int64)
+        self._rendered: Dict[Tuple, Dict[str, Any]] = {}
+
+        symptoms = self.symptoms
+        self.symptoms, self.normalized_symptoms = [], []
+        for symptom in symptoms:
+            self.add(symptom)
+
+    def refresh(self, analyzer: SymptomAnalyzer):
+        """Rebuild against a new analyzer after a knowledge base hot swap"""
+        if analyzer.knowledge_base_version != self.analyzer.knowledge_base_version:
+            logger.info(
+                f"Symptom session moving to knowledge base {analyzer.knowledge_base_version}"
+            )
+            self._reset(analyzer)
+
+    def add(self, symptom: str):
+        """Append one symptom and apply its delta"""
+        if len(self.symptoms) >= self.max_symptoms:
+            raise ValueError(f"A session can hold at most {self.max_symptoms} symptoms")
+
+        normalized_symptom = self.analyzer._normalize_symptoms([symptom])[0]
+        matches = self.analyzer._scan_symptoms([normalized_symptom])[0]
+        condition_columns, keyword_hits, pattern_columns = self.analyzer._incidence_matrix.columns(matches)
+
+        offset = len(self.symptoms)
+        self.symptoms.append(symptom)
+        self.normalized_symptoms.append(normalized_symptom)
+        self._symptom_columns.append((condition_columns, keyword_hits, pattern_columns))
+
+        self._first_offset[condition_columns] = np.minimum(self._first_offset[condition_columns], offset)
+        self._keyword_hits += keyword_hits
+        self._pattern_counts[pattern_columns] += 1
+
+    def remove(self, symptom: str):
+        """Remove the first occurrence of a symptom and retract its delta"""
+        try:
+            offset = self.symptoms.index(symptom)
+        except ValueError:
+            raise ValueError(f"Symptom not in session: {symptom}")
+
+        condition_columns, keyword_hits, pattern_columns = self._symptom_columns.pop(offset)
+        del self.symptoms[offset]
+        del self.normalized_symptoms[offset]
+        self._keyword_hits -= keyword_hits
+        self._pattern_counts[pattern_columns] -= 1
+
+        # Later symptoms shift down one place; keys first seen in the removed
+        # symptom move to their next mention, if any
+        orphaned = condition_columns[self._first_offset[condition_columns] == offset]
+        self._first_offset[(self._first_offset > offset) & (self._first_offset != NO_MATCH)] -= 1
+        self._first_offset[orphaned] = NO_MATCH
+        for later_offset in range(offset, len(self._symptom_columns)):
+            if not orphaned.size:
+                break
+            later_columns = self._symptom_columns[later_offset][0]
+            found = np.isin(orphaned, later_columns)
+            self._first_offset[orphaned[found]] = later_offset
+            orphaned = orphaned[~found]
+
+    def clear(self):
+        """Drop every symptom"""
+        self.symptoms, self.normalized_symptoms = [], []
+        self._reset(self.analyzer)
+
+    @property
+    def emergency_level(self) -> str:
+        """Emergency level of the current symptom list"""
+        matrix = self.analyzer._incidence_matrix
+        score = matrix.emergency_score(self._keyword_hits, self._pattern_counts > 0)
+        return self.analyzer._emergency_level_from_score(score)
+
+    def _ranked_entries(self, limit: int) -> List[Tuple[int, float, int]]:
+        """Score the current state: (entry, probability, symptom offset) per top condition"""
+        keys = np.flatnonzero(self._first_offset != NO_MATCH)
+        return self.analyzer._ranked_keys(
+            keys.tolist(), self._first_offset[keys].tolist(), self._demographics, limit
+        )
+
+    def top_conditions(self, limit: int = 5) -> List[MedicalCondition]:
+        """Top conditions for the current symptom list"""
+        return [
+            self.analyzer._condition_from_entry(entry, probability, self.normalized_symptoms[symptom_offset])
+            for entry, probability, symptom_offset in self._ranked_entries(limit)
+        ]
+
+    def snapshot(self, limit: int = 5) -> Dict[str, Any]:
+        """Current symptoms, emergency level, serialized top conditions and the
+        most discriminating symptoms to ask about next"""
+        # Consecutive edits mostly reshuffle the same few conditions, so keep
+        # their serialized form instead of rebuilding models on every push
+        primary_conditions = []
+        ranked = self._ranked_entries(limit)
+        for entry, probability, symptom_offset in ranked:
+            key = (entry, probability, self.normalized_symptoms[symptom_offset])
+            rendered = self._rendered.get(key)
+            if rendered is None:
+                if len(self._rendered) >= 256:
+                    self._rendered.clear()
+                rendered = self._rendered[key] = self.analyzer._condition_from_entry(*key).model_dump(mode="json")
+            primary_conditions.append(rendered)
+
+        matrix = self.analyzer._incidence_matrix
+        follow_up_questions = self.analyzer._discriminating_questions(
+            matrix.entry_name[[entry for entry, _, _ in ranked]],
+            np.array([probability for _, probability, _ in ranked], dtype=np.float64),
+            self.normalized_symptoms
+        )
+
+        return {
+            "symptoms": list(self.symptoms),
+            "emergency_level": self.emergency_level,
+            "primary_conditions": primary_conditions,
+            "follow_up_questions": follow_up_questions,
+            "knowledge_base_version": self.analyzer.knowledge_base_version
+        }
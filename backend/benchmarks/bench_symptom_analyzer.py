@@ -0,0 +1,390 @@
+#!/usr/bin/env python3
+"""
+Symptom analysis benchmark at knowledge base scale
+
+Generates synthetic knowledge bases (100, 1k and 10k conditions by default)
+and synthetic symptom corpora mixing English and Bengali input, then measures
+throughput, p50/p99 latency and peak memory for ``analyze_symptoms``,
+``_analyze_symptom_patterns`` and ``_assess_emergency_level``. Each target is
+timed over the corpus several times and the median of the runs is reported.
+
+Results are compared against ``baselines/symptom_analyzer.json``. A p50,
+throughput, build time or peak memory worse than the baseline by more than
+the tolerance fails the run (exit code 1); p99 is reported but not gated,
+and latency deltas under ``--min-delta-ms`` are ignored as timer noise.
+Before timing, each corpus is also checked for responses that differ between
+single, batch and cached analysis, which fails the run too.
+
+    python benchmarks/bench_symptom_analyzer.py
+    python benchmarks/bench_symptom_analyzer.py --sizes 100 1000 --requests 500 --runs 5
+    python benchmarks/bench_symptom_analyzer.py --update-baseline
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import platform
+import random
+import re
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+# Add the backend directory to Python path
+backend_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(backend_dir))
+
+import numpy as np
+
+from app.models.ai_models import SymptomAnalysisRequest
+from app.services.analysis_cache import SymptomAnalysisCache
+from app.services.knowledge_base import KnowledgeBase
+from app.services.symptom_analyzer import SymptomAnalyzer
+
+BASELINE_FILE = Path(__file__).resolve().parent / "baselines" / "symptom_analyzer.json"
+DEFAULT_SIZES = [100, 1000, 10000]
+TARGETS = ["analyze_symptoms", "_analyze_symptom_patterns", "_assess_emergency_level"]
+CONSISTENCY_REQUESTS = 300
+# Response fields that differ between any two calls
+PER_CALL_FIELDS = {"analysis_id", "analysis_timestamp"}
+# Gated time metrics, in milliseconds per unit, for the --min-delta-ms floor
+TIME_METRICS_MS = {"p50_ms": 1.0, "seconds": 1000.0}
+
+ENGLISH_SYLLABLES = ["ka", "ri", "mo", "ten", "sul", "ba", "dro", "pel", "vin", "ast", "or", "ne", "lu", "ga", "shi"]
+BENGALI_SYLLABLES = ["কা", "রি", "মো", "তে", "সু", "বা", "দ্রো", "পে", "ভি", "অ", "নে", "লু", "গা", "শি", "ধু"]
+ENGLISH_FILLER = ["i have", "mild", "since yesterday", "on and off", "really bad", "at night", "for two days"]
+BENGALI_FILLER = ["আমার", "হালকা", "গতকাল থেকে", "মাঝে মাঝে", "খুব বেশি", "রাতে", "দুই দিন ধরে"]
+BENGALI_SCRIPT = re.compile(r"[\u0980-\u09FF]")
+SEVERITIES = ["mild", "moderate", "severe"]
+# Names the analyzer adjusts for demographics, so those branches are exercised too
+ADJUSTED_NAMES = ["Viral Fever", "Common Cold", "Pneumonia", "Heart Attack", "Migraine"]
+
+def _term(rng: random.Random, syllables: List[str], used: set) -> str:
+    """A fresh pseudo-word of 2-4 syllables"""
+    while True:
+        term = "".join(rng.choice(syllables) for _ in range(rng.randint(2, 4)))
+        if term not in used:
+            used.add(term)
+            return term
+
+def _phrase(rng: random.Random, bengali_ratio: float, used: set) -> str:
+    """A fresh one- or two-word symptom term, Bengali with probability ``bengali_ratio``"""
+    syllables = BENGALI_SYLLABLES if rng.random() < bengali_ratio else ENGLISH_SYLLABLES
+    words = [_term(rng, syllables, used) for _ in range(rng.randint(1, 2))]
+    return " ".join(words)
+
+def generate_knowledge_base(condition_count: int, seed: int = 0, bengali_ratio: float = 0.3) -> Dict[str, Any]:
+    """Synthetic knowledge base with ``condition_count`` condition keys"""
+    rng = random.Random(seed)
+    used: set = set()
+    names = ADJUSTED_NAMES + [f"Condition {index}" for index in range(max(condition_count // 2, 1))]
+
+    common_conditions = {}
+    for _ in range(condition_count):
+        key = _phrase(rng, bengali_ratio, used)
+        common_conditions[key] = {
+            "related_symptoms": [_phrase(rng, bengali_ratio, used) for _ in range(rng.randint(2, 5))],
+            "possible_conditions": [
+                {
+                    "name": rng.choice(names),
+                    "probability": round(rng.uniform(0.05, 0.7), 2),
+                    "severity": rng.choice(SEVERITIES)
+                }
+                for _ in range(rng.randint(1, 3))
+            ],
+            "recommended_specialties": ["General Medicine"]
+        }
+
+    emergency_keywords = [_phrase(rng, bengali_ratio, used) for _ in range(max(condition_count // 20, 5))]
+    keys = list(common_conditions)
+    emergency_patterns = {
+        f"pattern_{index}": rng.sample(keys, min(4, len(keys)))
+        for index in range(max(condition_count // 50, 2))
+    }
+
+    return {
+        "medical_knowledge_base": {"common_conditions": common_conditions},
+        "symptom_patterns": {
+            "severity_indicators": {},
+            "duration_patterns": {},
+            "emergency_patterns": emergency_patterns
+        },
+        "emergency_keywords": emergency_keywords,
+        "icd_codes": {name: f"R{index:02d}.{index % 10}" for index, name in enumerate(names[:200])},
+        "symptom_synonyms": {f"syn {key}": key for key in rng.sample(keys, min(50, len(keys)))}
+    }
+
+def generate_corpus(
+    data: Dict[str, Any], request_count: int, seed: int = 1, bengali_ratio: float = 0.3, hit_ratio: float = 0.7
+) -> List[Dict[str, Any]]:
+    """Synthetic requests; symptoms embed knowledge base terms in filler text"""
+    rng = random.Random(seed)
+    conditions = data["medical_knowledge_base"]["common_conditions"]
+    bengali_terms, english_terms = [], []
+    for key, condition in conditions.items():
+        for term in [key, *condition["related_symptoms"]]:
+            (bengali_terms if BENGALI_SCRIPT.search(term) else english_terms).append(term)
+    for term in data["emergency_keywords"]:
+        (bengali_terms if BENGALI_SCRIPT.search(term) else english_terms).append(term)
+
+    corpus = []
+    for _ in range(request_count):
+        symptoms = []
+        for _ in range(rng.randint(1, 6)):
+            bengali = rng.random() < bengali_ratio and bengali_terms
+            terms, filler = (bengali_terms, BENGALI_FILLER) if bengali else (english_terms, ENGLISH_FILLER)
+            words = [rng.choice(filler)]
+            if rng.random() < hit_ratio:
+                words.append(rng.choice(terms))
+            words.append(rng.choice(filler))
+            symptoms.append(" ".join(words))
+        corpus.append({
+            "symptoms": symptoms,
+            "patient_age": rng.choice([None, 8, 34, 71]),
+            "patient_gender": rng.choice([None, "male", "female"])
+        })
+    return corpus
+
+def _summarize(latencies: List[float], elapsed: float) -> Dict[str, float]:
+    latencies_ms = np.asarray(latencies) * 1000
+    return {
+        "calls": len(latencies),
+        "throughput_per_sec": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(float(np.percentile(latencies_ms, 50)), 4),
+        "p99_ms": round(float(np.percentile(latencies_ms, 99)), 4),
+        "mean_ms": round(statistics.fmean(latencies_ms), 4)
+    }
+
+def _targets(
+    analyzer: SymptomAnalyzer, loop: asyncio.AbstractEventLoop
+) -> Dict[str, Callable[[Dict[str, Any]], Any]]:
+    """One callable per benchmarked method, each taking a corpus request"""
+    def analyze(request):
+        return loop.run_until_complete(analyzer.analyze_symptoms(
+            request["symptoms"], request["patient_age"], request["patient_gender"]
+        ))
+
+    def patterns(request):
+        return analyzer._analyze_symptom_patterns(
+            analyzer._normalize_symptoms(request["symptoms"]), request["patient_age"], request["patient_gender"]
+        )
+
+    def emergency(request):
+        return analyzer._assess_emergency_level(analyzer._normalize_symptoms(request["symptoms"]))
+
+    return {
+        "analyze_symptoms": analyze,
+        "_analyze_symptom_patterns": patterns,
+        "_assess_emergency_level": emergency
+    }
+
+def check_consistency(
+    analyzer: SymptomAnalyzer, corpus: List[Dict[str, Any]], loop: asyncio.AbstractEventLoop
+) -> List[str]:
+    """Requests whose batch or cached analysis differs from ``analyze_symptoms``.
+
+    Each cache is primed with the corpus' symptoms in reverse order, so the
+    lookups that follow are hits computed for another symptom order.
+    """
+    requests = [SymptomAnalysisRequest(patient_id="benchmark", **request) for request in corpus]
+    reversed_requests = [request.model_copy(update={"symptoms": request.symptoms[::-1]}) for request in requests]
+
+    async def analyze_all() -> Dict[str, List[Any]]:
+        cache = SymptomAnalysisCache(capacity=len(requests) + 1, enabled=True)
+        for request in reversed_requests:
+            await cache.analyze(analyzer, request.symptoms, request.patient_age, request.patient_gender)
+        batch_cache = SymptomAnalysisCache(capacity=len(requests) + 1, enabled=True)
+        await batch_cache.analyze_batch(analyzer, reversed_requests)
+        return {
+            "analyze_symptoms": [
+                await analyzer.analyze_symptoms(request.symptoms, request.patient_age, request.patient_gender)
+                for request in requests
+            ],
+            "batch": await analyzer.analyze_symptoms_batch(requests),
+            "cached": [
+                await cache.analyze(analyzer, request.symptoms, request.patient_age, request.patient_gender)
+                for request in requests
+            ],
+            "cached batch": await batch_cache.analyze_batch(analyzer, requests)
+        }
+
+    responses = {
+        name: [response.model_dump(mode="json", exclude=PER_CALL_FIELDS) for response in results]
+        for name, results in loop.run_until_complete(analyze_all()).items()
+    }
+    expected = responses.pop("analyze_symptoms")
+    mismatches = []
+    for name, results in responses.items():
+        differing = [index for index, (result, reference) in enumerate(zip(results, expected)) if result != reference]
+        if differing:
+            mismatches.append(
+                f"{name} differs from analyze_symptoms on {len(differing)} of {len(expected)} requests "
+                f"(first: {corpus[differing[0]]['symptoms']})"
+            )
+    return mismatches
+
+def _peak_memory(func: Callable[[], Any]) -> Tuple[Any, int]:
+    """Run ``func`` under tracemalloc; returns its result and peak traced bytes"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = func()
+        return result, tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def benchmark_size(
+    condition_count: int, request_count: int, bengali_ratio: float, run_count: int = 3
+) -> Tuple[Dict[str, Any], List[str]]:
+    """Benchmark every target against one synthetic knowledge base size;
+    also returns the ``check_consistency`` mismatches"""
+    data = generate_knowledge_base(condition_count, bengali_ratio=bengali_ratio)
+    corpus = generate_corpus(data, request_count, bengali_ratio=bengali_ratio)
+
+    build_started = time.perf_counter()
+    analyzer, build_peak = _peak_memory(
+        lambda: SymptomAnalyzer(KnowledgeBase.from_dict(data, f"synthetic-{condition_count}"))
+    )
+    results: Dict[str, Any] = {
+        "build": {
+            "seconds": round(time.perf_counter() - build_started, 4),
+            "peak_memory_bytes": build_peak
+        }
+    }
+
+    loop = asyncio.new_event_loop()
+    mismatches = check_consistency(analyzer, corpus[:CONSISTENCY_REQUESTS], loop)
+    for name, target in _targets(analyzer, loop).items():
+        for request in corpus[:min(50, len(corpus))]:  # warm-up
+            target(request)
+
+        runs = []
+        for _ in range(run_count):
+            latencies = []
+            started = time.perf_counter()
+            for request in corpus:
+                call_started = time.perf_counter()
+                target(request)
+                latencies.append(time.perf_counter() - call_started)
+            runs.append(_summarize(latencies, time.perf_counter() - started))
+        summary = {metric: statistics.median(run[metric] for run in runs) for metric in runs[0]}
+
+        # Memory is traced in a separate pass so tracing does not skew latency
+        _, summary["peak_memory_bytes"] = _peak_memory(
+            lambda: [target(request) for request in corpus[:min(200, len(corpus))]]
+        )
+        results[name] = summary
+
+    loop.close()
+    return results, mismatches
+
+def compare(
+    results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float, min_delta_ms: float = 0.1
+) -> List[str]:
+    """Regressions of ``results`` against ``baseline`` beyond ``tolerance`` (a fraction).
+
+    A time (p50, build time, time per call from throughput) only regresses if
+    it also grew by more than ``min_delta_ms``.
+    """
+    regressions = []
+    for size, targets in results.items():
+        for name, metrics in targets.items():
+            reference = baseline.get(size, {}).get(name)
+            if not reference:
+                continue
+            for metric in ("p50_ms", "seconds", "peak_memory_bytes"):
+                if metric in metrics and metric in reference and reference[metric] > 0:
+                    growth = metrics[metric] - reference[metric]
+                    if metric in TIME_METRICS_MS and growth * TIME_METRICS_MS[metric] <= min_delta_ms:
+                        continue
+                    if metrics[metric] > reference[metric] * (1 + tolerance):
+                        regressions.append(
+                            f"{size} conditions / {name}: {metric} {metrics[metric]} > baseline {reference[metric]}"
+                        )
+            if reference.get("throughput_per_sec", 0) > 0:
+                growth_ms = 1000 / metrics["throughput_per_sec"] - 1000 / reference["throughput_per_sec"]
+                if (
+                    growth_ms > min_delta_ms
+                    and metrics["throughput_per_sec"] < reference["throughput_per_sec"] / (1 + tolerance)
+                ):
+                    regressions.append(
+                        f"{size} conditions / {name}: throughput_per_sec {metrics['throughput_per_sec']} "
+                        f"< baseline {reference['throughput_per_sec']}"
+                    )
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark SymptomAnalyzer on synthetic knowledge bases")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Condition counts")
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per corpus")
+    parser.add_argument("--runs", type=int, default=3, help="Timed passes over each corpus; metrics are their median")
+    parser.add_argument("--bengali-ratio", type=float, default=0.3, help="Share of Bengali terms and input")
+    parser.add_argument("--tolerance", type=float, default=0.5,
+                        help="Allowed slowdown/growth over the baseline before failing (0.5 = 50%%)")
+    parser.add_argument("--min-delta-ms", type=float, default=0.1,
+                        help="Ignore latency and build time growth smaller than this, in milliseconds")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_FILE)
+    parser.add_argument("--update-baseline", action="store_true", help="Store these results as the baseline")
+    parser.add_argument("--output", type=Path, help="Also write results as JSON to this file")
+    args = parser.parse_args()
+
+    results = {}
+    inconsistencies = []
+    for size in args.sizes:
+        print(f"Benchmarking {size} conditions ({args.requests} requests x {args.runs} runs)...")
+        results[str(size)], mismatches = benchmark_size(size, args.requests, args.bengali_ratio, args.runs)
+        inconsistencies.extend(f"{size} conditions / {mismatch}" for mismatch in mismatches)
+        for name in TARGETS:
+            metrics = results[str(size)][name]
+            print(
+                f"  {name:28s} {metrics['throughput_per_sec']:>10.1f}/s  "
+                f"p50 {metrics['p50_ms']:.3f}ms  p99 {metrics['p99_ms']:.3f}ms  "
+                f"peak {metrics['peak_memory_bytes'] / 1024:.0f} KiB"
+            )
+
+    report = {
+        "created_at": datetime.utcnow().isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "requests": args.requests,
+        "runs": args.runs,
+        "bengali_ratio": args.bengali_ratio,
+        "results": results
+    }
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+
+    if inconsistencies:
+        print("\nINCONSISTENT RESULTS:")
+        for inconsistency in inconsistencies:
+            print(f"  - {inconsistency}")
+        sys.exit(1)
+
+    if args.update_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+        print(f"Baseline written to {args.baseline}")
+        return
+
+    if not args.baseline.exists():
+        print(f"No baseline at {args.baseline}; run with --update-baseline to create one")
+        return
+
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    if baseline.get("requests") != args.requests:
+        print(f"Warning: baseline was recorded with {baseline.get('requests')} requests per corpus")
+    regressions = compare(results, baseline["results"], args.tolerance, args.min_delta_ms)
+    if regressions:
+        print("\nPERFORMANCE REGRESSION against baseline:")
+        for regression in regressions:
+            print(f"  - {regression}")
+        sys.exit(1)
+    print("\nNo regressions against baseline")
+
+if __name__ == "__main__":
+    main()
@@ -6,7 +6,9 @@ FastAPI-based backend for advanced healthcare features
 from fastapi import FastAPI, HTTPException, Depends, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
+import asyncio
 import uvicorn
 import logging
 from datetime import datetime
@@ -18,6 +20,8 @@ from app.core.config import settings
 from app.core.database import init_db, close_db
 from app.api.v1.api import api_router
 from app.core.logging_config import setup_logging
+from app.services.symptom_analyzer import reload_symptom_analyzer, watch_knowledge_base
+from app.services.analysis_executor import AnalysisOverloadedError, analysis_executor
 
 # Setup logging
 setup_logging()
@@ -31,10 +35,25 @@ async def lifespan(app: FastAPI):
     await init_db()
     logger.info("✅ Database initialized")
     
+    # Compile the medical knowledge base before taking traffic
+    try:
+        analyzer = await reload_symptom_analyzer()
+        logger.info(f"✅ Medical knowledge base {analyzer.knowledge_base_version} loaded")
+    except Exception as e:
+        logger.error(f"❌ Failed to load medical knowledge base: {e}")
+    knowledge_base_watcher = asyncio.create_task(watch_knowledge_base())
+    
+    # Warm process pool for CPU-bound analysis
+    if settings.ANALYSIS_EXECUTOR_ENABLED:
+        await analysis_executor.start()
+        logger.info("✅ Analysis executor started")
+    
     yield
     
     # Shutdown
     logger.info("🔄 Shutting down HealthConnect Python Backend...")
+    knowledge_base_watcher.cancel()
+    await analysis_executor.shutdown()
     await close_db()
     logger.info("✅ Database connections closed")
 
@@ -55,6 +74,8 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Pagination cursor of the conversation list; browsers hide other response headers from scripts
+    expose_headers=["X-Next-Cursor"],
 )
 
 # Security
@@ -111,6 +132,20 @@ async def http_exception_handler(request, exc):
         "timestamp": datetime.utcnow().isoformat()
     }
 
+@app.exception_handler(AnalysisOverloadedError)
+async def analysis_overloaded_handler(request, exc):
+    logger.warning(f"Analysis backpressure: {exc}")
+    return JSONResponse(
+        status_code=429,
+        headers={"Retry-After": str(exc.retry_after)},
+        content={
+            "error": True,
+            "message": str(exc),
+            "status_code": 429,
+            "timestamp": datetime.utcnow().isoformat()
+        }
+    )
+
 @app.exception_handler(Exception)
 async def general_exception_handler(request, exc):
     logger.error(f"Unexpected error: {str(exc)}")
@@ -6,11 +6,8 @@ import numpy as np
 from datetime import datetime
 import logging
 
-# Import ML modules
-from models.symptom_analyzer import SymptomAnalyzer
-from models.doctor_recommender import DoctorRecommender
-from utils.text_processor import TextProcessor
-from utils.translator import Translator
+# Shared model registry (same instances as the app package's blueprints)
+from app.registry import registry
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -20,10 +17,11 @@ app = Flask(__name__)
 CORS(app)  # Enable CORS for all routes
 
 # Initialize ML models
-symptom_analyzer = SymptomAnalyzer()
-doctor_recommender = DoctorRecommender()
-text_processor = TextProcessor()
-translator = Translator()
+registry.warm_up()
+symptom_analyzer = registry.get('symptom_analyzer')
+doctor_recommender = registry.get('doctor_recommender')
+text_processor = registry.get('text_processor')
+translator = registry.get('translator')
 
 @app.route('/health', methods=['GET'])
 def health_check():
@@ -54,8 +52,8 @@ def analyze_symptoms():
         # Process text
         processed_text = text_processor.preprocess(symptoms)
         
-        # Extract features
-        features = text_processor.extract_features(processed_text)
+        # Extract features from the text as written, so punctuation still ends negation scope
+        features = text_processor.extract_features(symptoms)
         
         # Add duration and severity as features
         duration_mapping = {'today': 0, 'days': 1, 'weeks': 2, 'months': 3}
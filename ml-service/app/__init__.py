@@ -1,8 +1,10 @@
-from flask import Flask
+from flask import Flask, g, request
 from flask_cors import CORS
 import os
+from . import metrics
 from .routes import api_bp
 from .config import Config
+from .registry import registry
 
 def create_app(config_class=Config):
     """Create and configure the Flask application"""
@@ -15,6 +17,29 @@ def create_app(config_class=Config):
     # Register blueprints
     app.register_blueprint(api_bp, url_prefix='/api')
     
+    # Request counters, in-flight gauges and latencies for /metrics
+    @app.before_request
+    def start_request_metrics():
+        g.metrics_endpoint = request.url_rule.rule if request.url_rule else 'unmatched'
+        g.metrics_started = metrics.start_request(g.metrics_endpoint)
+    
+    @app.after_request
+    def record_response_status(response):
+        g.metrics_status = response.status_code
+        return response
+    
+    @app.teardown_request
+    def finish_request_metrics(exception=None):
+        # Runs after streamed responses finish, and after unhandled errors
+        if 'metrics_endpoint' in g:
+            metrics.finish_request(g.metrics_endpoint, g.get('metrics_status', 500), g.metrics_started)
+    
+    # Load models before serving (gunicorn --preload shares them across workers)
+    if config_class.WARM_UP_MODELS:
+        registry.warm_up()
+    else:
+        registry.mark_ready()
+    
     # Simple root route
     @app.route('/')
     def index():
@@ -24,4 +49,10 @@ def create_app(config_class=Config):
             'status': 'running'
         }
     
+    @app.route('/metrics')
+    def prometheus_metrics():
+        """Prometheus metrics: requests, in-flight, per-stage latencies, batch sizes"""
+        body, content_type = metrics.render()
+        return body, 200, {'Content-Type': content_type}
+    
     return app
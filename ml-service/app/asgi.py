@@ -0,0 +1,221 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response, StreamingResponse
+from starlette.routing import Route
+
+from . import metrics
+from .batching import MicroBatcher
+from .config import Config
+from .pipelines import analyze_batch, payload_error, recommend_batch
+from .registry import registry
+from .streaming import NDJSON_MIMETYPE, aparse_lines, aread_lines, process_chunk
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+async def _no_disconnect_messages():
+    await asyncio.Event().wait()
+
+class NDJSONStreamEndpoint:
+    def __init__(self, name, process_batch, config_class):
+        """
+        Raw ASGI endpoint streaming NDJSON results for an NDJSON body.
+
+        Lines are read as they arrive, grouped into STREAM_CHUNK_SIZE
+        batches and run through ``process_batch`` in a worker thread; each
+        batch's output is sent before the next one is read, so memory stays
+        constant. It is a raw ASGI app rather than a request handler because
+        StreamingResponse listens for disconnects on ``receive``, which would
+        swallow the body messages the reader is waiting for; disconnects
+        surface through the body reader instead.
+
+        Args:
+            name (str): Endpoint name, for logging
+            process_batch (callable): Payload list -> result list
+            config_class: Configuration with the STREAM_* settings
+        """
+        self.name = name
+        self.process_batch = process_batch
+        self.chunk_size = config_class.STREAM_CHUNK_SIZE
+        self.max_line_bytes = config_class.STREAM_MAX_LINE_BYTES
+
+    async def __call__(self, scope, receive, send):
+        request = Request(scope, receive)
+        response = StreamingResponse(self._results(request), media_type=NDJSON_MIMETYPE)
+        await response(scope, _no_disconnect_messages, send)
+
+    async def _results(self, request):
+        chunk = []
+        async for entry in aparse_lines(aread_lines(request.stream(), self.max_line_bytes)):
+            chunk.append(entry)
+            if len(chunk) >= self.chunk_size:
+                yield await asyncio.to_thread(process_chunk, chunk, self.process_batch, self.name)
+                chunk = []
+        if chunk:
+            yield await asyncio.to_thread(process_chunk, chunk, self.process_batch, self.name)
+
+class MetricsMiddleware:
+    def __init__(self, app, paths):
+        """
+        Pure ASGI middleware counting requests, in-flight requests and latency
+        per route for /metrics. It only watches ``send`` for the status, so
+        streamed bodies pass through untouched and are timed to their end.
+
+        Args:
+            app: Wrapped ASGI app
+            paths (iterable): Route paths used as labels; anything else is 'unmatched'
+        """
+        self.app = app
+        self.paths = frozenset(paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        endpoint = scope['path'] if scope['path'] in self.paths else 'unmatched'
+        started = metrics.start_request(endpoint)
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message['type'] == 'http.response.start':
+                status = message['status']
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            metrics.finish_request(endpoint, status, started)
+
+def create_asgi_app(config_class=Config):
+    """
+    Create the ASGI application.
+
+    Serves the same ``/api/analyze`` and ``/api/recommend-doctors`` endpoints
+    as the Flask app, but concurrent requests are collected into micro-batches
+    (up to ``BATCH_MAX_SIZE`` requests or ``BATCH_MAX_WAIT_MS`` of waiting) and
+    scored together by the models' batch methods. Models come from the shared
+    registry and are warmed up in the background at startup; ``/api/ready``
+    answers 503 until that finishes.
+    """
+    batchers = {
+        'analyze': MicroBatcher(
+            analyze_batch, config_class.BATCH_MAX_SIZE, config_class.BATCH_MAX_WAIT_MS, name='analyze'
+        ),
+        'recommend-doctors': MicroBatcher(
+            recommend_batch, config_class.BATCH_MAX_SIZE, config_class.BATCH_MAX_WAIT_MS, name='recommend-doctors'
+        )
+    }
+
+    def batched_endpoint(name):
+        batcher = batchers[name]
+
+        async def endpoint(request):
+            try:
+                data = await request.json()
+            except ValueError:
+                data = None
+
+            error = payload_error(data)
+            if error:
+                return JSONResponse({'error': error}, status_code=400)
+
+            try:
+                return JSONResponse(await batcher.submit(data))
+            except Exception as e:
+                logger.error(f"Error in {name}: {str(e)}")
+                return JSONResponse({'error': 'Internal server error'}, status_code=500)
+
+        return endpoint
+
+    async def recommend_doctors_batch(request):
+        """Recommend doctors for a client-side batch; already a batch, so it skips the batcher"""
+        try:
+            data = await request.json()
+        except ValueError:
+            data = None
+
+        items = data.get('requests') if isinstance(data, dict) else None
+        if not isinstance(items, list):
+            return JSONResponse({'error': 'Missing symptoms data'}, status_code=400)
+        error = next(filter(None, map(payload_error, items)), None)
+        if error:
+            return JSONResponse({'error': error}, status_code=400)
+        if len(items) > config_class.RECOMMEND_BATCH_MAX_REQUESTS:
+            return JSONResponse(
+                {'error': f'At most {config_class.RECOMMEND_BATCH_MAX_REQUESTS} requests per batch'}, status_code=400
+            )
+
+        try:
+            return JSONResponse(await asyncio.to_thread(recommend_batch, items))
+        except Exception as e:
+            logger.error(f"Error in recommend-doctors-batch: {str(e)}")
+            return JSONResponse({'error': 'Internal server error'}, status_code=500)
+
+    async def health_check(request):
+        """Health check endpoint"""
+        return JSONResponse({'status': 'healthy'})
+
+    async def readiness_check(request):
+        """Readiness endpoint: 503 until the models are warmed up"""
+        status = registry.status()
+        return JSONResponse(status, status_code=200 if status['ready'] else 503)
+
+    async def batch_stats(request):
+        """Batches dispatched, items served and largest batch per endpoint"""
+        return JSONResponse({name: batcher.stats for name, batcher in batchers.items()})
+
+    async def prometheus_metrics(request):
+        """Prometheus metrics: requests, in-flight, per-stage latencies, batch sizes"""
+        body, content_type = metrics.render()
+        return Response(body, headers={'Content-Type': content_type})
+
+    async def index(request):
+        return JSONResponse({
+            'name': config_class.API_TITLE,
+            'version': config_class.API_VERSION,
+            'status': 'running'
+        })
+
+    @asynccontextmanager
+    async def lifespan(app):
+        for batcher in batchers.values():
+            batcher.start()
+        if config_class.WARM_UP_MODELS:
+            warm_up = asyncio.get_running_loop().create_task(asyncio.to_thread(registry.warm_up))
+        else:
+            registry.mark_ready()
+        yield
+        if config_class.WARM_UP_MODELS and not warm_up.done():
+            await warm_up
+        for batcher in batchers.values():
+            await batcher.stop()
+
+    routes = [
+        Route('/', index),
+        Route('/api/health', health_check),
+        Route('/api/ready', readiness_check),
+        Route('/api/batch-stats', batch_stats),
+        Route('/metrics', prometheus_metrics),
+        Route('/api/analyze', batched_endpoint('analyze'), methods=['POST']),
+        Route('/api/recommend-doctors', batched_endpoint('recommend-doctors'), methods=['POST']),
+        Route('/api/recommend-doctors-batch', recommend_doctors_batch, methods=['POST']),
+        Route('/api/analyze/stream', NDJSONStreamEndpoint('analyze', analyze_batch, config_class), methods=['POST']),
+        Route(
+            '/api/recommend-doctors/stream',
+            NDJSONStreamEndpoint('recommend-doctors', recommend_batch, config_class),
+            methods=['POST']
+        )
+    ]
+    return Starlette(
+        debug=config_class.DEBUG,
+        routes=routes,
+        middleware=[Middleware(MetricsMiddleware, paths=[route.path for route in routes])],
+        lifespan=lifespan
+    )
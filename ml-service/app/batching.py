@@ -0,0 +1,127 @@
+import asyncio
+import logging
+import time
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class MicroBatcher:
+    def __init__(self, handler, max_batch_size=32, max_wait_ms=5.0, name='batch'):
+        """
+        Collect concurrent requests into micro-batches.
+
+        A batch is dispatched as soon as it holds ``max_batch_size`` items or
+        ``max_wait_ms`` after its first item arrived, whichever comes first.
+        The wait only applies while requests are coming in concurrently (the
+        previous batch held more than one item); a lone request with nothing
+        queued behind it is dispatched at once. Batches run one at a time in
+        a worker thread, so the event loop keeps accepting requests (and
+        filling the next batch) meanwhile. If the handler fails on a batch,
+        its items are retried one by one so only the failing ones error.
+
+        Args:
+            handler (callable): Takes a list of items, returns a list of results
+                in the same order
+            max_batch_size (int): Maximum items per batch
+            max_wait_ms (float): Maximum time the first item waits for company
+            name (str): Name used in logs and stats
+        """
+        self.handler = handler
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.name = name
+        self._queue = None
+        self._worker = None
+        self._concurrent = False
+        self.stats = {'batches': 0, 'items': 0, 'max_batch_size': 0, 'retried_batches': 0}
+
+    def start(self):
+        """Start the dispatch loop on the running event loop"""
+        if self._worker is None:
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        """Stop the dispatch loop; queued items fail with CancelledError"""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+            while not self._queue.empty():
+                _, future = self._queue.get_nowait()
+                if not future.done():
+                    future.cancel()
+
+    async def submit(self, item):
+        """
+        Queue one item and wait for its result.
+
+        Args:
+            item: A single request payload for the handler
+
+        Returns:
+            The handler's result for this item
+        """
+        self.start()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((item, future))
+        return await future
+
+    async def _collect(self):
+        """Wait for a first item, then gather more until the batch is full or the wait expires"""
+        batch = [await self._queue.get()]
+        # A single client would pay the whole wait on every call for company that never comes
+        deadline = time.monotonic() + (self.max_wait if self._concurrent else 0.0)
+        while len(batch) < self.max_batch_size:
+            # Take everything already queued without yielding to the timer
+            while len(batch) < self.max_batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            remaining = deadline - time.monotonic()
+            if len(batch) >= self.max_batch_size or remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        self._concurrent = len(batch) > 1
+        return batch
+
+    def _handle_each(self, items):
+        """Run items through the handler one at a time; (result, exception) per item"""
+        outcomes = []
+        for item in items:
+            try:
+                outcomes.append((self.handler([item])[0], None))
+            except Exception as e:
+                outcomes.append((None, e))
+        return outcomes
+
+    async def _run(self):
+        while True:
+            batch = await self._collect()
+            items = [item for item, _ in batch]
+            try:
+                outcomes = [(result, None) for result in await asyncio.to_thread(self.handler, items)]
+            except Exception as e:
+                logger.error(f"Error in {self.name} batch of {len(items)}: {str(e)}")
+                if len(items) == 1:
+                    outcomes = [(None, e)]
+                else:
+                    # Retry alone so one bad request doesn't fail the others
+                    self.stats['retried_batches'] += 1
+                    outcomes = await asyncio.to_thread(self._handle_each, items)
+
+            self.stats['batches'] += 1
+            self.stats['items'] += len(items)
+            self.stats['max_batch_size'] = max(self.stats['max_batch_size'], len(items))
+            for (_, future), (result, error) in zip(batch, outcomes):
+                if future.done():
+                    continue
+                if error is None:
+                    future.set_result(result)
+                else:
+                    future.set_exception(error)
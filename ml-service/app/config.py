@@ -14,8 +14,26 @@ class Config:
     API_TITLE = 'HealthConnect Bangladesh ML API'
     API_VERSION = '1.0.0'
     
-    # Model paths
-    MODEL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'models', 'trained')
+    # Model paths: trained artifacts live in MODEL_DIR/<model name>/ (see models/artifacts.py)
+    MODEL_DIR = os.environ.get('MODEL_DIR') or os.path.join(os.path.dirname(os.path.abspath(__file__)), 'models', 'trained')
+    # Check artifact checksums at load (the registry passes it to the models)
+    VERIFY_MODEL_CHECKSUMS = (os.environ.get('VERIFY_MODEL_CHECKSUMS') or 'true').lower() != 'false'
+    
+    # Model loading: warm up every model before reporting ready, or load on first use
+    WARM_UP_MODELS = (os.environ.get('WARM_UP_MODELS') or 'true').lower() != 'false'
+    # Cold start budget (import + warm-up) checked by scripts/cold_start.py
+    COLD_START_BUDGET_SECONDS = float(os.environ.get('COLD_START_BUDGET_SECONDS') or 10)
+    
+    # Micro-batching (ASGI serving mode)
+    BATCH_MAX_SIZE = int(os.environ.get('BATCH_MAX_SIZE') or 32)
+    BATCH_MAX_WAIT_MS = float(os.environ.get('BATCH_MAX_WAIT_MS') or 5)
+    
+    # NDJSON streaming endpoints: requests per batch and longest accepted line
+    STREAM_CHUNK_SIZE = int(os.environ.get('STREAM_CHUNK_SIZE') or 64)
+    STREAM_MAX_LINE_BYTES = int(os.environ.get('STREAM_MAX_LINE_BYTES') or 65536)
+    
+    # Largest request list accepted by /api/recommend-doctors-batch
+    RECOMMEND_BATCH_MAX_REQUESTS = int(os.environ.get('RECOMMEND_BATCH_MAX_REQUESTS') or 1000)
     
     # Logging
     LOG_LEVEL = os.environ.get('LOG_LEVEL') or 'INFO'
@@ -29,6 +47,7 @@ class TestingConfig(Config):
     """Testing configuration"""
     TESTING = True
     DEBUG = True
+    WARM_UP_MODELS = False
 
 class ProductionConfig(Config):
     """Production configuration"""
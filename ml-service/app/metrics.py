@@ -0,0 +1,150 @@
+import contextvars
+import logging
+import os
+import random
+import time
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest, multiprocess
+)
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Fraction of requests (or batches) whose latencies are recorded. Counters and
+# in-flight gauges are always exact; only histogram observations are sampled.
+SAMPLE_RATE = float(os.environ.get('METRICS_SAMPLE_RATE') or 1.0)
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024)
+
+REQUESTS = Counter('ml_requests_total', 'Requests served', ['endpoint', 'status'])
+IN_FLIGHT = Gauge('ml_requests_in_flight', 'Requests being served', ['endpoint'], multiprocess_mode='livesum')
+REQUEST_SECONDS = Histogram(
+    'ml_request_duration_seconds', 'Request latency', ['endpoint'], buckets=LATENCY_BUCKETS
+)
+STAGE_SECONDS = Histogram(
+    'ml_stage_duration_seconds', 'Time per pipeline stage (per request, or per batch on batched paths)',
+    ['stage'], buckets=LATENCY_BUCKETS
+)
+BATCH_SIZE = Histogram('ml_batch_size', 'Requests per model batch', ['endpoint'], buckets=BATCH_SIZE_BUCKETS)
+
+_sampled = contextvars.ContextVar('metrics_sampled', default=True)
+_children = {}  # (metric, labels) -> labelled child; labels() is the costly part of an update
+
+def _child(metric, *labels):
+    child = _children.get((metric, labels))
+    if child is None:
+        child = _children[(metric, labels)] = metric.labels(*labels)
+    return child
+
+def sample():
+    """
+    Decide whether the current request or batch records latencies.
+
+    Called once per unit of work; the decision holds for the rest of the
+    current context (the request's thread, or the batch being processed).
+
+    Returns:
+        bool: True if latencies are recorded
+    """
+    sampled = SAMPLE_RATE >= 1.0 or random.random() < SAMPLE_RATE
+    _sampled.set(sampled)
+    return sampled
+
+class _StageTimer:
+    __slots__ = ('histogram', 'start')
+
+    def __init__(self, histogram):
+        self.histogram = histogram
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc_info):
+        self.histogram.observe(time.perf_counter() - self.start)
+
+class _NotSampled:
+    __slots__ = ()
+
+    def __enter__(self):
+        pass
+
+    def __exit__(self, *exc_info):
+        pass
+
+_NOT_SAMPLED = _NotSampled()
+
+def stage(name):
+    """
+    Time a pipeline stage (translate, preprocess, extract_features, analyze,
+    recommend): ``with metrics.stage('preprocess'): ...``.
+
+    A plain class rather than ``contextlib.contextmanager``, which costs a
+    few microseconds per use on its own.
+
+    Args:
+        name (str): Stage name
+
+    Returns:
+        Context manager recording the stage's duration if sampled
+    """
+    if not _sampled.get():
+        return _NOT_SAMPLED
+    return _StageTimer(_child(STAGE_SECONDS, name))
+
+def observe_batch(endpoint, size):
+    """
+    Record the size of a batch handed to a model.
+
+    Args:
+        endpoint (str): Endpoint name
+        size (int): Requests in the batch
+    """
+    _child(BATCH_SIZE, endpoint).observe(size)
+
+def start_request(endpoint):
+    """
+    Mark a request as started.
+
+    Args:
+        endpoint (str): Endpoint name
+
+    Returns:
+        float: Start time to pass to ``finish_request``, or None if not sampled
+    """
+    _child(IN_FLIGHT, endpoint).inc()
+    return time.perf_counter() if sample() else None
+
+def finish_request(endpoint, status, started):
+    """
+    Mark a request as finished.
+
+    Args:
+        endpoint (str): Endpoint name
+        status (int): HTTP status code
+        started (float): Value returned by ``start_request``
+    """
+    _child(IN_FLIGHT, endpoint).dec()
+    _child(REQUESTS, endpoint, str(status)).inc()
+    if started is not None:
+        _child(REQUEST_SECONDS, endpoint).observe(time.perf_counter() - started)
+
+def render():
+    """
+    Current metrics in the Prometheus text format.
+
+    With PROMETHEUS_MULTIPROC_DIR set (gunicorn with several workers), every
+    worker writes its values to files there and this aggregates all of
+    them, so a scrape sees the whole server rather than whichever worker
+    answered.
+
+    Returns:
+        tuple: (body bytes, content type)
+    """
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
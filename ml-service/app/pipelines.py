@@ -0,0 +1,93 @@
+import logging
+from models.doctor_index import parse_location
+from . import metrics
+from .registry import registry
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DURATION_MAPPING = {'today': 0, 'days': 1, 'weeks': 2, 'months': 3}
+SEVERITY_MAPPING = {'mild': 0, 'moderate': 1, 'severe': 2}
+# Optional request fields the pipelines expect as strings
+STRING_FIELDS = ('language', 'duration', 'severity')
+
+def payload_error(data):
+    """
+    Check one request body before it joins a batch, so a malformed request
+    is rejected on its own instead of failing the batch it lands in.
+
+    Args:
+        data: Decoded request body
+
+    Returns:
+        str: Error message, or None if the payload is valid
+    """
+    if not isinstance(data, dict) or not isinstance(data.get('symptoms'), str):
+        return 'Missing symptoms data'
+    for field in STRING_FIELDS:
+        if data.get(field) is not None and not isinstance(data[field], str):
+            return f'Invalid {field}'
+    return None
+
+def analyze_batch(payloads):
+    """
+    Translate, preprocess and extract features per request, then analyze the batch.
+
+    Args:
+        payloads (list): ``/analyze`` request bodies
+
+    Returns:
+        list: One analysis result per payload
+    """
+    metrics.sample()
+    metrics.observe_batch('analyze', len(payloads))
+    translator = registry.get('translator')
+    text_processor = registry.get('text_processor')
+    symptoms = [data['symptoms'] for data in payloads]
+
+    # Translate non-English requests, one translator batch per language
+    by_language = {}
+    for index, data in enumerate(payloads):
+        language = data.get('language', 'en')
+        if language != 'en':
+            by_language.setdefault(language, []).append(index)
+    for language, indices in by_language.items():
+        with metrics.stage('translate'):
+            translated = translator.translate_batch([symptoms[index] for index in indices], source=language, target='en')
+        for index, text in zip(indices, translated):
+            symptoms[index] = text
+
+    with metrics.stage('preprocess'):
+        texts = [text_processor.preprocess(text) for text in symptoms]
+
+    # Features come from the text as written, so punctuation still ends negation scope
+    with metrics.stage('extract_features'):
+        features_list = text_processor.extract_features_batch(symptoms)
+    for data, features in zip(payloads, features_list):
+        # Add duration and severity as features
+        features['duration'] = DURATION_MAPPING.get(data.get('duration', 'days'), 1)
+        features['severity'] = SEVERITY_MAPPING.get(data.get('severity', 'moderate'), 1)
+
+    with metrics.stage('analyze'):
+        return registry.get('symptom_analyzer').analyze_batch(texts, features_list)
+
+def recommend_batch(payloads):
+    """
+    Preprocess each request, then recommend doctors for the batch.
+
+    Args:
+        payloads (list): ``/recommend-doctors`` request bodies
+
+    Returns:
+        list: One recommendation list per payload
+    """
+    metrics.sample()
+    metrics.observe_batch('recommend-doctors', len(payloads))
+    text_processor = registry.get('text_processor')
+    with metrics.stage('preprocess'):
+        texts = [text_processor.preprocess(data['symptoms']) for data in payloads]
+    user_ids = [data.get('userId') for data in payloads]
+    locations = [parse_location(data.get('location')) for data in payloads]
+    with metrics.stage('recommend'):
+        return registry.get('doctor_recommender').recommend_batch(texts, user_ids, limit=5, locations=locations)
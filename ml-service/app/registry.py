@@ -0,0 +1,119 @@
+import logging
+import os
+import threading
+import time
+
+from .config import Config
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def _model_path(name):
+    """Artifact directory of a trained model under MODEL_DIR, or None if there is none"""
+    from models.artifacts import has_artifact
+    path = os.path.join(Config.MODEL_DIR, name)
+    return path if has_artifact(path) else None
+
+def _keyword_matcher():
+    from utils.keyword_matcher import KeywordMatcher
+    return KeywordMatcher()
+
+def _symptom_analyzer():
+    from models.symptom_analyzer import SymptomAnalyzer
+    return SymptomAnalyzer(
+        model_path=_model_path('symptom_analyzer'), keyword_matcher=registry.get('keyword_matcher'),
+        verify_checksums=Config.VERIFY_MODEL_CHECKSUMS
+    )
+
+def _doctor_recommender():
+    from models.doctor_recommender import DoctorRecommender
+    return DoctorRecommender(
+        model_path=_model_path('doctor_recommender'), keyword_matcher=registry.get('keyword_matcher'),
+        verify_checksums=Config.VERIFY_MODEL_CHECKSUMS
+    )
+
+def _text_processor():
+    from utils.text_processor import TextProcessor
+    return TextProcessor()
+
+def _translator():
+    from utils.translator import Translator
+    return Translator()
+
+class ModelRegistry:
+    def __init__(self, factories):
+        """
+        Process-wide registry of ML models.
+
+        Each model is built once, on first use or during ``warm_up``, and
+        shared by every entry point (``app.py``, the Flask blueprints and the
+        ASGI app). Model modules are only imported by their factories, so
+        importing the web app stays cheap.
+
+        Args:
+            factories (dict): Model name -> zero-argument callable building it
+        """
+        self._factories = dict(factories)
+        self._models = {}
+        self._lock = threading.RLock()  # factories may get() the models they depend on
+        self._ready = False
+        self.load_seconds = {}
+        self.warm_up_seconds = None
+
+    def get(self, name):
+        """
+        Get a model, building it on first use.
+
+        Args:
+            name (str): Registered model name
+
+        Returns:
+            The shared model instance
+        """
+        model = self._models.get(name)
+        if model is not None:
+            return model
+
+        with self._lock:
+            if name not in self._models:
+                start = time.perf_counter()
+                self._models[name] = self._factories[name]()
+                self.load_seconds[name] = round(time.perf_counter() - start, 4)
+                logger.info(f"Loaded {name} in {self.load_seconds[name]:.3f}s")
+            return self._models[name]
+
+    def warm_up(self):
+        """Build every registered model; the registry reports ready afterwards"""
+        start = time.perf_counter()
+        for name in self._factories:
+            self.get(name)
+        self.warm_up_seconds = round(time.perf_counter() - start, 4)
+        self._ready = True
+        logger.info(f"Model warm-up finished in {self.warm_up_seconds:.3f}s")
+
+    def mark_ready(self):
+        """Report ready without warm-up; models then load on first use"""
+        self._ready = True
+
+    @property
+    def ready(self):
+        """Whether warm-up has completed"""
+        return self._ready
+
+    def status(self):
+        """Readiness plus per-model load timings"""
+        return {
+            'ready': self._ready,
+            'models': {name: name in self._models for name in self._factories},
+            'load_seconds': dict(self.load_seconds),
+            'warm_up_seconds': self.warm_up_seconds
+        }
+
+registry = ModelRegistry({
+    'keyword_matcher': _keyword_matcher,
+    'symptom_analyzer': _symptom_analyzer,
+    'doctor_recommender': _doctor_recommender,
+    'text_processor': _text_processor,
+    'translator': _translator
+})
@@ -1,6 +1,7 @@
 from flask import Blueprint
 from .analyze import analyze_bp
 from .recommend import recommend_bp
+from ..registry import registry
 
 # Create a main blueprint to combine all routes
 api_bp = Blueprint('api', __name__)
@@ -14,3 +15,9 @@ api_bp.register_blueprint(recommend_bp)
 def health_check():
     """Health check endpoint"""
     return {'status': 'healthy'}
+
+@api_bp.route('/ready', methods=['GET'])
+def readiness_check():
+    """Readiness endpoint: 503 until the models are warmed up"""
+    status = registry.status()
+    return status, 200 if status['ready'] else 503
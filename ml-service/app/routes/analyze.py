@@ -1,8 +1,9 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, current_app, request, jsonify, stream_with_context
 import logging
-from ..models.symptom_analyzer import SymptomAnalyzer
-from ..utils.text_processor import TextProcessor
-from ..utils.translator import Translator
+from .. import metrics
+from ..pipelines import analyze_batch
+from ..registry import registry
+from ..streaming import NDJSON_MIMETYPE, stream_results
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -11,11 +12,6 @@ logger = logging.getLogger(__name__)
 # Initialize blueprint
 analyze_bp = Blueprint('analyze', __name__)
 
-# Initialize models
-symptom_analyzer = SymptomAnalyzer()
-text_processor = TextProcessor()
-translator = Translator()
-
 @analyze_bp.route('/analyze', methods=['POST'])
 def analyze_symptoms():
     """Analyze symptoms and return urgency assessment"""
@@ -25,6 +21,10 @@ def analyze_symptoms():
         if not data or 'symptoms' not in data:
             return jsonify({'error': 'Missing symptoms data'}), 400
         
+        symptom_analyzer = registry.get('symptom_analyzer')
+        text_processor = registry.get('text_processor')
+        translator = registry.get('translator')
+        
         symptoms = data['symptoms']
         duration = data.get('duration', 'days')
         severity = data.get('severity', 'moderate')
@@ -32,13 +32,16 @@ def analyze_symptoms():
         
         # Translate if not in English
         if language != 'en':
-            symptoms = translator.translate(symptoms, source=language, target='en')
+            with metrics.stage('translate'):
+                symptoms = translator.translate(symptoms, source=language, target='en')
         
         # Process text
-        processed_text = text_processor.preprocess(symptoms)
+        with metrics.stage('preprocess'):
+            processed_text = text_processor.preprocess(symptoms)
         
-        # Extract features
-        features = text_processor.extract_features(processed_text)
+        # Extract features from the text as written, so punctuation still ends negation scope
+        with metrics.stage('extract_features'):
+            features = text_processor.extract_features(symptoms)
         
         # Add duration and severity as features
         duration_mapping = {'today': 0, 'days': 1, 'weeks': 2, 'months': 3}
@@ -48,13 +51,39 @@ def analyze_symptoms():
         features['severity'] = severity_mapping.get(severity, 1)
         
         # Analyze symptoms
-        analysis_result = symptom_analyzer.analyze(
-            symptoms=processed_text,
-            features=features
-        )
+        with metrics.stage('analyze'):
+            analysis_result = symptom_analyzer.analyze(
+                symptoms=processed_text,
+                features=features
+            )
         
         return jsonify(analysis_result)
     
     except Exception as e:
         logger.error(f"Error analyzing symptoms: {str(e)}")
         return jsonify({'error': 'Internal server error'}), 500
+
+@analyze_bp.route('/analyze/stream', methods=['POST'])
+def analyze_symptoms_stream():
+    """
+    Analyze a stream of symptom requests.
+    
+    The body is newline-delimited JSON, one ``/analyze`` request per line.
+    Lines are processed in batches of STREAM_CHUNK_SIZE and each batch's
+    results are streamed back as NDJSON while the rest of the body is still
+    being read, so memory stays constant whatever the input size. Every
+    output line has the input ``line`` number, the request's ``id`` if it
+    had one, and ``result`` or ``error``.
+    
+    Clients must read the response while still sending: one that uploads
+    the whole body before reading stalls once the socket buffers fill.
+    Long streams outlive gunicorn's default sync-worker timeout; run them
+    with a larger ``--timeout`` or against the ASGI app.
+    """
+    config = current_app.config
+    return Response(
+        stream_with_context(stream_results(
+            request.stream, analyze_batch, config['STREAM_CHUNK_SIZE'], config['STREAM_MAX_LINE_BYTES'], 'analyze'
+        )),
+        mimetype=NDJSON_MIMETYPE
+    )
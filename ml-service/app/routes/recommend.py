@@ -1,7 +1,10 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, current_app, request, jsonify, stream_with_context
 import logging
-from ..models.doctor_recommender import DoctorRecommender
-from ..utils.text_processor import TextProcessor
+from models.doctor_index import parse_location
+from .. import metrics
+from ..pipelines import recommend_batch
+from ..registry import registry
+from ..streaming import NDJSON_MIMETYPE, stream_results
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -10,10 +13,6 @@ logger = logging.getLogger(__name__)
 # Initialize blueprint
 recommend_bp = Blueprint('recommend', __name__)
 
-# Initialize models
-doctor_recommender = DoctorRecommender()
-text_processor = TextProcessor()
-
 @recommend_bp.route('/recommend-doctors', methods=['POST'])
 def recommend_doctors():
     """Recommend doctors based on symptoms"""
@@ -23,21 +22,96 @@ def recommend_doctors():
         if not data or 'symptoms' not in data:
             return jsonify({'error': 'Missing symptoms data'}), 400
         
+        doctor_recommender = registry.get('doctor_recommender')
+        text_processor = registry.get('text_processor')
+        
         symptoms = data['symptoms']
         user_id = data.get('userId')
+        location = parse_location(data.get('location'))
         
         # Process text
-        processed_text = text_processor.preprocess(symptoms)
+        with metrics.stage('preprocess'):
+            processed_text = text_processor.preprocess(symptoms)
         
         # Get recommendations
-        recommendations = doctor_recommender.recommend(
-            symptoms=processed_text,
-            user_id=user_id,
-            limit=5
-        )
+        with metrics.stage('recommend'):
+            recommendations = doctor_recommender.recommend(
+                symptoms=processed_text,
+                user_id=user_id,
+                limit=5,
+                location=location
+            )
         
         return jsonify(recommendations)
     
     except Exception as e:
         logger.error(f"Error recommending doctors: {str(e)}")
         return jsonify({'error': 'Internal server error'}), 500
+
+@recommend_bp.route('/recommend-doctors-batch', methods=['POST'])
+def recommend_doctors_batch():
+    """
+    Recommend doctors for many symptom texts at once.
+    
+    Expects ``{"requests": [{"symptoms", "userId", "location"}, ...]}`` and
+    answers with one recommendation list per request, in order. All texts
+    are scored with a single sparse matrix product.
+    """
+    try:
+        data = request.json
+        items = data.get('requests') if isinstance(data, dict) else None
+        
+        if not isinstance(items, list) or not all(isinstance(item, dict) and 'symptoms' in item for item in items):
+            return jsonify({'error': 'Missing symptoms data'}), 400
+        
+        max_requests = current_app.config['RECOMMEND_BATCH_MAX_REQUESTS']
+        if len(items) > max_requests:
+            return jsonify({'error': f'At most {max_requests} requests per batch'}), 400
+        
+        doctor_recommender = registry.get('doctor_recommender')
+        text_processor = registry.get('text_processor')
+        
+        # Process text
+        with metrics.stage('preprocess'):
+            processed_texts = [text_processor.preprocess(item['symptoms']) for item in items]
+        
+        # Get recommendations
+        metrics.observe_batch('recommend-doctors-batch', len(items))
+        with metrics.stage('recommend'):
+            recommendations = doctor_recommender.recommend_batch(
+                processed_texts,
+                user_ids=[item.get('userId') for item in items],
+                limit=5,
+                locations=[parse_location(item.get('location')) for item in items]
+            )
+        
+        return jsonify(recommendations)
+    
+    except Exception as e:
+        logger.error(f"Error recommending doctors: {str(e)}")
+        return jsonify({'error': 'Internal server error'}), 500
+
+@recommend_bp.route('/recommend-doctors/stream', methods=['POST'])
+def recommend_doctors_stream():
+    """
+    Recommend doctors for a stream of symptom requests.
+    
+    The body is newline-delimited JSON, one ``/recommend-doctors`` request per line.
+    Lines are processed in batches of STREAM_CHUNK_SIZE and each batch's
+    results are streamed back as NDJSON while the rest of the body is still
+    being read, so memory stays constant whatever the input size. Every
+    output line has the input ``line`` number, the request's ``id`` if it
+    had one, and ``result`` or ``error``.
+    
+    Clients must read the response while still sending: one that uploads
+    the whole body before reading stalls once the socket buffers fill.
+    Long streams outlive gunicorn's default sync-worker timeout; run them
+    with a larger ``--timeout`` or against the ASGI app.
+    """
+    config = current_app.config
+    return Response(
+        stream_with_context(stream_results(
+            request.stream, recommend_batch, config['STREAM_CHUNK_SIZE'], config['STREAM_MAX_LINE_BYTES'], 'recommend-doctors'
+        )),
+        mimetype=NDJSON_MIMETYPE
+    )
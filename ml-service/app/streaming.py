@@ -0,0 +1,192 @@
+import json
+import logging
+from .pipelines import payload_error
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+NDJSON_MIMETYPE = 'application/x-ndjson'
+
+def read_lines(stream, max_line_bytes):
+    """
+    Lines of a blocking byte stream, read one at a time.
+
+    Args:
+        stream: File-like object with ``readline(size)``
+        max_line_bytes (int): Longest accepted line
+
+    Yields:
+        bytes: Each line, or None for a line over ``max_line_bytes`` (its
+        bytes are skipped without being buffered)
+    """
+    while True:
+        line = stream.readline(max_line_bytes + 1)
+        if not line:
+            return
+        if len(line) > max_line_bytes and not line.endswith(b'\n'):
+            while line and not line.endswith(b'\n'):
+                line = stream.readline(max_line_bytes + 1)
+            yield None
+            continue
+        yield line
+
+async def aread_lines(chunks, max_line_bytes):
+    """
+    Lines of an async stream of byte chunks (e.g. Starlette's ``request.stream()``).
+
+    Args:
+        chunks: Async iterator of bytes
+        max_line_bytes (int): Longest accepted line
+
+    Yields:
+        bytes: Each line, or None for a line over ``max_line_bytes``
+    """
+    buffer = b''
+    oversized = False
+    async for chunk in chunks:
+        buffer += chunk
+        start = 0
+        while True:
+            end = buffer.find(b'\n', start)
+            if end < 0:
+                break
+            line, start = buffer[start:end + 1], end + 1
+            if oversized or len(line) > max_line_bytes + 1:
+                yield None
+            else:
+                yield line
+            oversized = False
+        buffer = buffer[start:]
+        if len(buffer) > max_line_bytes:
+            # Drop the partial line instead of buffering it
+            buffer = b''
+            oversized = True
+    if oversized:
+        yield None
+    elif buffer:
+        yield buffer
+
+def parse_lines(lines):
+    """
+    Decode NDJSON request lines, skipping blank ones.
+
+    Args:
+        lines (iterable): Lines from ``read_lines``
+
+    Yields:
+        tuple: (line number, payload dict or None, error message or None)
+    """
+    for number, line in enumerate(lines, 1):
+        yield from _parse_line(number, line)
+
+async def aparse_lines(lines):
+    """Async version of ``parse_lines``, for lines from ``aread_lines``"""
+    number = 0
+    async for line in lines:
+        number += 1
+        for entry in _parse_line(number, line):
+            yield entry
+
+def _parse_line(number, line):
+    if line is None:
+        yield number, None, 'Line too long'
+        return
+    if not line.strip():
+        return
+    try:
+        data = json.loads(line)
+    except ValueError:
+        yield number, None, 'Invalid JSON'
+        return
+    error = payload_error(data)
+    if error:
+        yield number, (data if isinstance(data, dict) else None), error
+        return
+    yield number, data, None
+
+def chunks_of(entries, size):
+    """
+    Group parsed lines into chunks of at most ``size`` entries.
+
+    Args:
+        entries (iterable): Entries from ``parse_lines``
+        size (int): Chunk size
+
+    Yields:
+        list: Entries
+    """
+    chunk = []
+    for entry in entries:
+        chunk.append(entry)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def process_chunk(chunk, process_batch, name):
+    """
+    Run one chunk through a batch pipeline and encode the output lines.
+
+    Each output line carries the input line number and the ``id`` field if
+    the request had one, plus either ``result`` or ``error``, in input
+    order. If the batch fails, its requests are retried one at a time so
+    only the ones that fail on their own report an error.
+
+    Args:
+        chunk (list): Entries from ``parse_lines``
+        process_batch (callable): Payload list -> result list
+        name (str): Endpoint name, for logging
+
+    Returns:
+        bytes: NDJSON output for the chunk
+    """
+    payloads = [data for _, data, error in chunk if error is None]
+    try:
+        outcomes = [(result, None) for result in (process_batch(payloads) if payloads else [])]
+    except Exception as e:
+        logger.error(f"Error in {name} stream, retrying the chunk line by line: {str(e)}")
+        outcomes = [_process_one(payload, process_batch, name) for payload in payloads]
+    outcomes = iter(outcomes)
+
+    lines = []
+    for number, data, error in chunk:
+        output = {'line': number}
+        if data is not None and 'id' in data:
+            output['id'] = data['id']
+        if error is None:
+            result, error = next(outcomes)
+        if error is None:
+            output['result'] = result
+        else:
+            output['error'] = error
+        lines.append(json.dumps(output, ensure_ascii=False))
+    return ('\n'.join(lines) + '\n').encode('utf-8')
+
+def _process_one(payload, process_batch, name):
+    try:
+        return process_batch([payload])[0], None
+    except Exception as e:
+        logger.error(f"Error in {name} stream: {str(e)}")
+        return None, 'Internal server error'
+
+def stream_results(stream, process_batch, chunk_size, max_line_bytes, name):
+    """
+    NDJSON in, NDJSON out, one chunk at a time.
+
+    Only one chunk of requests and results is held at any moment, so memory
+    stays flat however long the input is.
+
+    Args:
+        stream: Request body with ``readline(size)``
+        process_batch (callable): Payload list -> result list
+        chunk_size (int): Requests per batch
+        max_line_bytes (int): Longest accepted line
+        name (str): Endpoint name, for logging
+
+    Yields:
+        bytes: NDJSON output, one chunk at a time
+    """
+    for chunk in chunks_of(parse_lines(read_lines(stream, max_line_bytes)), chunk_size):
+        yield process_chunk(chunk, process_batch, name)
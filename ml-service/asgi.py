@@ -0,0 +1,11 @@
+import os
+import uvicorn
+from app.asgi import create_asgi_app
+from app.config import get_config
+
+# Create the ASGI application (micro-batched serving mode)
+app = create_asgi_app(get_config())
+
+if __name__ == '__main__':
+    port = int(os.environ.get('PORT', 5000))
+    uvicorn.run(app, host='0.0.0.0', port=port)
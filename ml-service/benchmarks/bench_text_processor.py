@@ -0,0 +1,172 @@
+"""
+Text processing benchmark: compiled tokenizer vs the NLTK path
+
+Times ``preprocess``, ``tokenize`` and ``extract_features`` per call on a
+synthetic corpus of English, Bengali and mixed symptom descriptions, against
+the previous implementation (per-call punctuation regex, NLTK
+``word_tokenize``, NLTK stopwords and one substring scan per duration and
+severity indicator). Token output of both paths is
+compared on every input; any mismatch fails the run (exit code 1).
+
+NLTK's ``word_tokenize`` needs the punkt model; without it the benchmark
+falls back to the Treebank word tokenizer ``word_tokenize`` runs after
+sentence splitting, which is its dominant cost.
+
+Usage:
+    python benchmarks/bench_text_processor.py [--inputs 2000] [--repeat 5]
+"""
+import argparse
+import os
+import random
+import re
+import statistics
+import string
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.text_processor import TextProcessor
+
+ENGLISH = [
+    "I have had a high fever and headache since yesterday",
+    "Severe chest pain, shortness of breath!",
+    "mild cough & sore throat for 2 weeks...",
+    "I don't feel well; it's been a few days of nausea",
+    "Intense abdominal pain (lower right side) since this morning",
+    "“Sharp” back pain, can't sleep at night",
+    "I cannot sleep, gonna see a doctor... gotta rest, wanna lie down",
+    "Lemme know if it's serious, 'tis getting worse and I can't eat"
+]
+BENGALI = [
+    "আমার জ্বর এবং মাথাব্যথা গতকাল থেকে",
+    "বুকে ব্যথা, শ্বাসকষ্ট।",
+    "হালকা কাশি ও গলা ব্যথা দুই সপ্তাহ ধরে",
+    "পেটে ব্যথা এবং বমি বমি ভাব"
+]
+
+def build_corpus(count, seed=7):
+    """Random English, Bengali and mixed inputs"""
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(count):
+        kind = rng.random()
+        if kind < 0.5:
+            corpus.append(rng.choice(ENGLISH))
+        elif kind < 0.8:
+            corpus.append(rng.choice(BENGALI))
+        else:
+            corpus.append(f"{rng.choice(ENGLISH)} {rng.choice(BENGALI)}")
+    return corpus
+
+def nltk_path():
+    """The previous preprocess/tokenize/stopword implementation, built on NLTK"""
+    from nltk.corpus import stopwords
+    from nltk.tokenize import NLTKWordTokenizer, word_tokenize
+
+    try:
+        word_tokenize("probe")
+        tokenize, label = word_tokenize, 'word_tokenize'
+    except LookupError:
+        tokenize, label = NLTKWordTokenizer().tokenize, 'Treebank tokenizer (punkt not installed)'
+
+    try:
+        stop_words = set(stopwords.words('english'))
+    except LookupError:
+        stop_words = None
+
+    def preprocess(text):
+        text = text.lower()
+        text = re.sub(f'[{string.punctuation}]', ' ', text)
+        return re.sub(r'\s+', ' ', text).strip()
+
+    return preprocess, tokenize, stop_words, label
+
+def legacy_extract_features(text, tokenize, stop_words):
+    """The previous extract_features: separate passes and one substring scan per indicator"""
+    tokens = [token for token in tokenize(text) if token not in stop_words]
+    duration_indicators = {
+        'today': ['today', 'just', 'now', 'recent', 'hour', 'morning'],
+        'days': ['day', 'days', 'yesterday', 'few days', 'since monday'],
+        'weeks': ['week', 'weeks', 'fortnight', 'several days'],
+        'months': ['month', 'months', 'long time', 'chronic', 'years', 'year']
+    }
+    duration = 'unknown'
+    for dur, indicators in duration_indicators.items():
+        if any(ind in text for ind in indicators):
+            duration = dur
+            break
+    severity_indicators = {
+        'mild': ['mild', 'slight', 'little', 'minor', 'barely', 'somewhat'],
+        'moderate': ['moderate', 'medium', 'average', 'noticeable'],
+        'severe': ['severe', 'intense', 'extreme', 'worst', 'unbearable', 'terrible', 'very bad']
+    }
+    severity = 'unknown'
+    for sev, indicators in severity_indicators.items():
+        if any(ind in text for ind in indicators):
+            severity = sev
+            break
+    return {'token_count': len(tokens), 'duration': duration, 'severity': severity, 'tokens': tokens}
+
+def per_call_us(function, inputs, repeat):
+    """Best-of-``repeat`` mean microseconds per call"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for text in inputs:
+            function(text)
+        timings.append((time.perf_counter() - start) / len(inputs) * 1e6)
+    return min(timings), statistics.median(timings)
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark TextProcessor against the NLTK path')
+    parser.add_argument('--inputs', type=int, default=2000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    corpus = build_corpus(args.inputs)
+    processor = TextProcessor()
+    old_preprocess, old_tokenize, old_stop_words, label = nltk_path()
+    processed = [processor.preprocess(text) for text in corpus]
+
+    # Same output on every input
+    mismatches = sum(
+        processor.preprocess(text) != old_preprocess(text)
+        or processor.tokenize(text) != old_tokenize(text)
+        for text in corpus + processed
+    )
+    if old_stop_words is not None and old_stop_words - processor.medical_terms != processor.stop_words:
+        mismatches += 1
+
+    print(f"Inputs: {len(corpus)}  NLTK path: {label}")
+    print(f"{'stage':<20}{'nltk us/call':>14}{'fast us/call':>14}{'speedup':>10}")
+    stages = [
+        ('preprocess', old_preprocess, processor.preprocess, corpus),
+        ('tokenize', old_tokenize, processor.tokenize, processed),
+        ('preprocess+tokenize',
+         lambda text: old_tokenize(old_preprocess(text)),
+         lambda text: processor.tokenize(processor.preprocess(text)),
+         corpus)
+    ]
+    for name, old, new, inputs in stages:
+        old_us, _ = per_call_us(old, inputs, args.repeat)
+        new_us, _ = per_call_us(new, inputs, args.repeat)
+        print(f"{name:<20}{old_us:>14.2f}{new_us:>14.2f}{old_us / new_us:>9.1f}x")
+
+    stop_words = old_stop_words - processor.medical_terms if old_stop_words is not None else processor.stop_words
+    # The old path extracted features from preprocessed text, the new one from the text as written
+    old_us, _ = per_call_us(lambda text: legacy_extract_features(text, old_tokenize, stop_words), processed, args.repeat)
+    new_us, _ = per_call_us(processor.extract_features, corpus, args.repeat)
+    print(f"{'extract_features':<20}{old_us:>14.2f}{new_us:>14.2f}{old_us / new_us:>9.1f}x")
+    mismatches += sum(
+        processor.extract_features(text)['tokens'] != legacy_extract_features(clean, old_tokenize, stop_words)['tokens']
+        for text, clean in zip(corpus, processed)
+    )
+
+    if mismatches:
+        print(f"Token mismatches: {mismatches}")
+        sys.exit(1)
+    print("Token output identical")
+
+if __name__ == '__main__':
+    main()
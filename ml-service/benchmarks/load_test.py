@@ -0,0 +1,397 @@
+"""
+Load test for ml-service: throughput and latency percentiles per serving mode
+
+Drives a mix of ``/api/analyze`` and ``/api/recommend-doctors`` requests
+with English and Bengali symptom payloads, for every combination of server
+worker count and client thread count, in these serving modes:
+
+    inprocess      Flask test client in this process (no sockets); one
+                   "worker", client threads share the app
+    gunicorn       wsgi:app under gunicorn sync workers, over a local socket
+    gunicorn-asgi  asgi:app (micro-batched) under gunicorn with uvicorn workers
+
+Each cell runs a warm-up, then ``--duration`` seconds of closed-loop load
+(every client thread sends its next request as soon as the previous one
+answers). Results go to stdout (or ``--output``) as JSON: one entry per
+mode x workers x threads x endpoint with request and error counts,
+throughput and p50/p95/p99/mean/max latency. With ``--baseline`` the run is
+compared to an earlier result file and exits 1 if any matching entry lost
+more than ``--max-regression`` of its throughput or gained as much p99.
+
+Client threads run in this Python process, so at high thread counts the
+load generator itself can become the bottleneck; compare runs made on the
+same machine with the same settings.
+
+Usage:
+    python benchmarks/load_test.py [--modes inprocess,gunicorn] [--workers 1,2,4]
+        [--threads 1,4,16] [--duration 10] [--warmup 2] [--bengali-ratio 0.3]
+        [--mix analyze=0.5,recommend-doctors=0.5] [--output results.json]
+        [--baseline previous.json] [--max-regression 0.15]
+"""
+import argparse
+import http.client
+import json
+import math
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime
+
+SERVICE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SERVICE_DIR)
+
+ENGLISH = [
+    "I have had a high fever and headache since yesterday",
+    "Severe chest pain spreading to my left arm, shortness of breath",
+    "mild cough and sore throat for 2 weeks",
+    "I don't feel well, nausea and vomiting for a few days",
+    "Intense abdominal pain on the lower right side since this morning",
+    "Sharp back pain, can't sleep at night",
+    "itchy red rash on both arms after using a new soap",
+    "my child has ear pain and a runny nose",
+    "dizziness and blurred vision when I stand up",
+    "joint pain and swelling in my knees for months",
+    "diarrhea and stomach cramps since last night",
+    "no fever but a persistent dry cough for a week"
+]
+BENGALI = [
+    "আমার জ্বর এবং মাথাব্যথা গতকাল থেকে",
+    "বুকে ব্যথা, শ্বাসকষ্ট।",
+    "হালকা কাশি ও গলা ব্যথা দুই সপ্তাহ ধরে",
+    "পেটে ব্যথা এবং বমি বমি ভাব",
+    "তীব্র মাথা ঘোরা আর দুর্বলতা আজ থেকে",
+    "শরীরে চুলকানি ও ফুসকুড়ি কয়েক দিন ধরে",
+    "কোমরে ব্যথা, রাতে ঘুমাতে পারছি না",
+    "আমার বাচ্চার কানে ব্যথা আর জ্বর"
+]
+DURATIONS = ['today', 'days', 'weeks', 'months']
+SEVERITIES = ['mild', 'moderate', 'severe']
+# Around Dhaka, for recommendations with a location
+LOCATION_BOX = ((23.70, 23.90), (90.35, 90.45))
+
+def build_requests(count, mix, bengali_ratio, seed=11):
+    """
+    Pre-generate a reproducible request sequence.
+
+    Args:
+        count (int): Number of requests
+        mix (dict): Endpoint name -> weight
+        bengali_ratio (float): Fraction of Bengali payloads
+        seed (int): Random seed
+
+    Returns:
+        list: (endpoint, JSON body bytes) pairs
+    """
+    rng = random.Random(seed)
+    endpoints, weights = zip(*mix.items())
+    requests = []
+    for _ in range(count):
+        endpoint = rng.choices(endpoints, weights)[0]
+        bengali = rng.random() < bengali_ratio
+        symptoms = rng.choice(BENGALI if bengali else ENGLISH)
+        if endpoint == 'analyze':
+            payload = {
+                'symptoms': symptoms,
+                'duration': rng.choice(DURATIONS),
+                'severity': rng.choice(SEVERITIES),
+                'language': 'bn' if bengali else 'en'
+            }
+        else:
+            payload = {'symptoms': symptoms, 'userId': f'user-{rng.randrange(10000)}'}
+            if rng.random() < 0.5:
+                payload['location'] = {
+                    'latitude': rng.uniform(*LOCATION_BOX[0]),
+                    'longitude': rng.uniform(*LOCATION_BOX[1])
+                }
+        requests.append((endpoint, json.dumps(payload, ensure_ascii=False).encode('utf-8')))
+    return requests
+
+class InProcessClient:
+    def __init__(self, app):
+        """Flask test client; one per thread"""
+        self.client = app.test_client()
+
+    def post(self, path, body):
+        return self.client.post(path, data=body, content_type='application/json').status_code
+
+    def close(self):
+        pass
+
+class HttpClient:
+    def __init__(self, port):
+        """Keep-alive HTTP client over a local socket; reconnects when the server closes"""
+        self.port = port
+        self.connection = None
+
+    def post(self, path, body):
+        if self.connection is None:
+            self.connection = http.client.HTTPConnection('127.0.0.1', self.port, timeout=30)
+        try:
+            self.connection.request('POST', path, body, {'Content-Type': 'application/json'})
+            response = self.connection.getresponse()
+            response.read()
+        except (OSError, http.client.HTTPException):
+            self.close()
+            raise
+        if response.will_close:
+            self.close()
+        return response.status
+
+    def close(self):
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an ascending list"""
+    if not sorted_values:
+        return None
+    index = max(0, math.ceil(fraction * len(sorted_values)) - 1)
+    return sorted_values[index]
+
+def summarize(latencies, errors, seconds):
+    """Request count, throughput and latency percentiles (ms) of one endpoint"""
+    latencies = sorted(latencies)
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'throughput_rps': round(len(latencies) / seconds, 1),
+        'latency_ms': {
+            'p50': _ms(percentile(latencies, 0.50)),
+            'p95': _ms(percentile(latencies, 0.95)),
+            'p99': _ms(percentile(latencies, 0.99)),
+            'mean': _ms(sum(latencies) / len(latencies) if latencies else None),
+            'max': _ms(latencies[-1] if latencies else None)
+        }
+    }
+
+def _ms(seconds):
+    return None if seconds is None else round(seconds * 1000, 3)
+
+def run_load(make_client, requests, threads, duration, warmup):
+    """
+    Closed-loop load from ``threads`` client threads.
+
+    Args:
+        make_client (callable): Builds one client per thread
+        requests (list): Request sequence from ``build_requests``
+        threads (int): Client threads
+        duration (float): Measured seconds
+        warmup (float): Unmeasured seconds before that
+
+    Returns:
+        dict: Endpoint (and 'all') -> summary
+    """
+    start = time.perf_counter()
+    measure_from = start + warmup
+    stop_at = measure_from + duration
+    samples = [dict() for _ in range(threads)]  # per thread: endpoint -> ([latency], errors)
+
+    def worker(index):
+        client = make_client()
+        own = samples[index]
+        position = index * 7919  # threads start at different points of the sequence
+        try:
+            while True:
+                endpoint, body = requests[position % len(requests)]
+                position += 1
+                sent = time.perf_counter()
+                if sent >= stop_at:
+                    break
+                try:
+                    ok = client.post(f'/api/{endpoint}', body) == 200
+                except Exception:
+                    ok = False
+                done = time.perf_counter()
+                if sent < measure_from:
+                    continue
+                latencies, errors = own.setdefault(endpoint, ([], [0]))
+                if ok:
+                    latencies.append(done - sent)
+                else:
+                    errors[0] += 1
+        finally:
+            client.close()
+
+    pool = [threading.Thread(target=worker, args=(index,), daemon=True) for index in range(threads)]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+
+    merged = {}
+    for own in samples:
+        for endpoint, (latencies, errors) in own.items():
+            for key in (endpoint, 'all'):
+                entry = merged.setdefault(key, ([], [0]))
+                entry[0].extend(latencies)
+                entry[1][0] += errors[0]
+    return {key: summarize(latencies, errors[0], duration) for key, (latencies, errors) in sorted(merged.items())}
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+def start_server(mode, workers, port, timeout=120):
+    """
+    Start gunicorn for a serving mode and wait until /api/ready answers 200.
+
+    Returns:
+        subprocess.Popen: The server process
+    """
+    command = [sys.executable, '-m', 'gunicorn', '--workers', str(workers), '--bind', f'127.0.0.1:{port}',
+               '--log-level', 'warning', '--preload']
+    if mode == 'gunicorn-asgi':
+        command += ['--worker-class', 'uvicorn.workers.UvicornWorker', 'asgi:app']
+    else:
+        command += ['wsgi:app']
+    process = subprocess.Popen(command, cwd=SERVICE_DIR, stdout=subprocess.DEVNULL)
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise SystemExit(f"{mode} server exited with code {process.returncode}")
+        try:
+            connection = http.client.HTTPConnection('127.0.0.1', port, timeout=2)
+            connection.request('GET', '/api/ready')
+            if connection.getresponse().status == 200:
+                connection.close()
+                return process
+            connection.close()
+        except (OSError, http.client.HTTPException):
+            pass
+        time.sleep(0.2)
+    stop_server(process)
+    raise SystemExit(f"{mode} server not ready after {timeout}s")
+
+def stop_server(process):
+    process.terminate()
+    try:
+        process.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+def compare(results, baseline, max_regression):
+    """
+    Entries that regressed against a baseline run.
+
+    Returns:
+        list: Human-readable regression descriptions
+    """
+    def key(entry):
+        return entry['mode'], entry['workers'], entry['threads'], entry['endpoint']
+
+    previous = {key(entry): entry for entry in baseline.get('results', [])}
+    regressions = []
+    for entry in results:
+        old = previous.get(key(entry))
+        if old is None:
+            continue
+        name = '{} workers={} threads={} {}'.format(*key(entry))
+        if entry['throughput_rps'] < old['throughput_rps'] * (1 - max_regression):
+            regressions.append(f"{name}: throughput {old['throughput_rps']} -> {entry['throughput_rps']} rps")
+        old_p99, new_p99 = old['latency_ms']['p99'], entry['latency_ms']['p99']
+        if old_p99 and new_p99 and new_p99 > old_p99 * (1 + max_regression):
+            regressions.append(f"{name}: p99 {old_p99} -> {new_p99} ms")
+    return regressions
+
+def parse_list(value):
+    return [int(item) for item in value.split(',') if item]
+
+def parse_mix(value):
+    mix = {}
+    for item in value.split(','):
+        endpoint, _, weight = item.partition('=')
+        if endpoint not in ('analyze', 'recommend-doctors'):
+            raise argparse.ArgumentTypeError(f"Unknown endpoint {endpoint!r}")
+        mix[endpoint] = float(weight or 1)
+    return mix
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--modes', default='inprocess,gunicorn',
+                        help='Comma-separated: inprocess, gunicorn, gunicorn-asgi')
+    parser.add_argument('--workers', type=parse_list, default=[1, 2, 4], help='Server worker counts')
+    parser.add_argument('--threads', type=parse_list, default=[1, 4, 16], help='Client thread counts')
+    parser.add_argument('--duration', type=float, default=10.0, help='Measured seconds per cell')
+    parser.add_argument('--warmup', type=float, default=2.0, help='Unmeasured seconds per cell')
+    parser.add_argument('--mix', type=parse_mix, default=parse_mix('analyze=0.5,recommend-doctors=0.5'))
+    parser.add_argument('--bengali-ratio', type=float, default=0.3)
+    parser.add_argument('--output', help='Write results here instead of stdout')
+    parser.add_argument('--baseline', help='Earlier results file to compare against')
+    parser.add_argument('--max-regression', type=float, default=0.15,
+                        help='Allowed relative throughput loss / p99 growth against the baseline')
+    args = parser.parse_args()
+
+    requests = build_requests(5000, args.mix, args.bengali_ratio)
+    results = []
+
+    def record(mode, workers, threads, summaries):
+        for endpoint, summary in summaries.items():
+            results.append({'mode': mode, 'workers': workers, 'threads': threads, 'endpoint': endpoint, **summary})
+            latency = summary['latency_ms']
+            sys.stderr.write(
+                f"{mode:<14} workers={workers:<3} threads={threads:<4} {endpoint:<18} "
+                f"{summary['throughput_rps']:>9.1f} rps  p50={latency['p50']}ms p95={latency['p95']}ms "
+                f"p99={latency['p99']}ms errors={summary['errors']}\n"
+            )
+
+    for mode in args.modes.split(','):
+        if mode == 'inprocess':
+            os.environ.setdefault('FLASK_ENV', 'production')
+            from app import create_app
+            from app.config import get_config
+
+            app = create_app(get_config())
+            for threads in args.threads:
+                summaries = run_load(lambda: InProcessClient(app), requests, threads, args.duration, args.warmup)
+                record(mode, 1, threads, summaries)
+        elif mode in ('gunicorn', 'gunicorn-asgi'):
+            for workers in args.workers:
+                port = free_port()
+                server = start_server(mode, workers, port)
+                try:
+                    for threads in args.threads:
+                        summaries = run_load(lambda: HttpClient(port), requests, threads, args.duration, args.warmup)
+                        record(mode, workers, threads, summaries)
+                finally:
+                    stop_server(server)
+        else:
+            parser.error(f"Unknown mode {mode!r}")
+
+    report = {
+        'meta': {
+            'timestamp': datetime.utcnow().isoformat() + 'Z',
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'duration_seconds': args.duration,
+            'warmup_seconds': args.warmup,
+            'mix': args.mix,
+            'bengali_ratio': args.bengali_ratio
+        },
+        'results': results
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            regressions = compare(results, json.load(f), args.max_regression)
+        for regression in regressions:
+            sys.stderr.write(f"REGRESSION {regression}\n")
+        if regressions:
+            sys.exit(1)
+
+if __name__ == '__main__':
+    main()
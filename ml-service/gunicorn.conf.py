@@ -0,0 +1,21 @@
+"""
+Gunicorn settings picked up automatically from the working directory.
+
+With several workers, Prometheus metrics are kept in per-worker files under
+PROMETHEUS_MULTIPROC_DIR and aggregated by /metrics (see app/metrics.py).
+The directory is emptied when the server starts, and a dead worker's live
+gauges (in-flight requests) are dropped when it exits.
+"""
+import os
+import shutil
+
+def on_starting(server):
+    directory = os.environ.get('PROMETHEUS_MULTIPROC_DIR')
+    if directory:
+        shutil.rmtree(directory, ignore_errors=True)
+        os.makedirs(directory, exist_ok=True)
+
+def child_exit(server, worker):
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
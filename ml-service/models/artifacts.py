@@ -0,0 +1,216 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from datetime import datetime
+import numpy as np
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = 'manifest.json'
+FORMAT_VERSION = 1  # bumped on incompatible manifest or file layout changes
+
+def _sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def has_artifact(directory):
+    """
+    Whether ``directory`` holds a model artifact.
+
+    Args:
+        directory (str): Artifact directory
+
+    Returns:
+        bool: True if it has a manifest
+    """
+    return os.path.isfile(os.path.join(directory, MANIFEST_NAME))
+
+class ModelArtifact:
+    def __init__(self, manifest, arrays):
+        """
+        A loaded model artifact: its manifest fields and arrays.
+
+        Arrays are read-only memory maps of the artifact files, so every
+        process that loads the same artifact shares one copy in the page
+        cache instead of holding a private one.
+
+        Args:
+            manifest (dict): Parsed manifest
+            arrays (dict): Array name -> read-only numpy memmap
+        """
+        self.name = manifest['name']
+        self.version = manifest['version']
+        self.created_at = manifest.get('created_at')
+        self.metadata = manifest.get('metadata', {})
+        self.arrays = arrays
+
+    def __getitem__(self, key):
+        return self.arrays[key]
+
+    def __contains__(self, key):
+        return key in self.arrays
+
+    @property
+    def nbytes(self):
+        return sum(array.nbytes for array in self.arrays.values())
+
+def save_artifact(directory, name, version, arrays, metadata=None):
+    """
+    Write a model artifact.
+
+    Each array is stored as a ``.npy`` file named after its content hash, and
+    the manifest listing them (with dtype, shape and SHA-256) is replaced
+    last and atomically. Files of a previous version are never rewritten, so
+    workers that still map them are unaffected; ``prune_artifact`` removes
+    them once nothing uses them.
+
+    Args:
+        directory (str): Artifact directory, e.g. ``MODEL_DIR/<model name>``
+        name (str): Model name
+        version (str): Model version
+        arrays (dict): Array name -> numpy array (numeric dtypes only)
+        metadata (dict): JSON-serializable model settings, vocabularies, etc.
+
+    Returns:
+        dict: The written manifest
+    """
+    os.makedirs(directory, exist_ok=True)
+    entries = {}
+    for key, array in arrays.items():
+        array = np.ascontiguousarray(array)
+        if array.dtype.hasobject:
+            raise ValueError(f"Array {key!r} has dtype {array.dtype}; only numeric arrays can be memory-mapped")
+
+        handle, temporary = tempfile.mkstemp(dir=directory, suffix='.npy.tmp')
+        try:
+            with os.fdopen(handle, 'wb') as f:
+                np.save(f, array, allow_pickle=False)
+            checksum = _sha256(temporary)
+            filename = f'{key}-{checksum[:16]}.npy'
+            os.replace(temporary, os.path.join(directory, filename))
+        except BaseException:
+            if os.path.exists(temporary):
+                os.remove(temporary)
+            raise
+
+        entries[key] = {
+            'file': filename,
+            'dtype': array.dtype.str,
+            'shape': list(array.shape),
+            'sha256': checksum
+        }
+
+    manifest = {
+        'format_version': FORMAT_VERSION,
+        'name': name,
+        'version': str(version),
+        'created_at': datetime.utcnow().isoformat() + 'Z',
+        'metadata': metadata or {},
+        'arrays': entries
+    }
+    handle, temporary = tempfile.mkstemp(dir=directory, suffix='.json.tmp')
+    with os.fdopen(handle, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(temporary, os.path.join(directory, MANIFEST_NAME))
+    logger.info(f"Saved model artifact {name} {version} to {directory}")
+    return manifest
+
+def read_manifest(directory):
+    """
+    Read and validate an artifact manifest.
+
+    Args:
+        directory (str): Artifact directory
+
+    Returns:
+        dict: Parsed manifest
+    """
+    with open(os.path.join(directory, MANIFEST_NAME), encoding='utf-8') as f:
+        manifest = json.load(f)
+    format_version = manifest.get('format_version')
+    if format_version != FORMAT_VERSION:
+        raise ValueError(f"Unsupported model artifact format {format_version} (expected {FORMAT_VERSION})")
+    for field in ('name', 'version', 'arrays'):
+        if field not in manifest:
+            raise ValueError(f"Model artifact manifest is missing {field!r}")
+    return manifest
+
+def verify_artifact(directory, manifest=None):
+    """
+    Check every array file against its manifest checksum.
+
+    Args:
+        directory (str): Artifact directory
+        manifest (dict): Manifest, if already read
+
+    Returns:
+        list: Names of arrays whose files are missing or don't match
+    """
+    manifest = manifest or read_manifest(directory)
+    failed = []
+    for key, entry in manifest['arrays'].items():
+        path = os.path.join(directory, entry['file'])
+        if not os.path.isfile(path) or _sha256(path) != entry['sha256']:
+            failed.append(key)
+    return failed
+
+def load_artifact(directory, verify=True):
+    """
+    Load a model artifact with its arrays memory-mapped read-only.
+
+    Args:
+        directory (str): Artifact directory
+        verify (bool): Check SHA-256 checksums first
+
+    Returns:
+        ModelArtifact: The loaded artifact
+    """
+    manifest = read_manifest(directory)
+    if verify:
+        failed = verify_artifact(directory, manifest)
+        if failed:
+            raise ValueError(f"Checksum mismatch in model artifact {directory}: {', '.join(failed)}")
+
+    arrays = {}
+    for key, entry in manifest['arrays'].items():
+        array = np.load(os.path.join(directory, entry['file']), mmap_mode='r', allow_pickle=False)
+        if array.dtype.str != entry['dtype'] or list(array.shape) != entry['shape']:
+            raise ValueError(
+                f"Array {key!r} in {directory} is {array.dtype.str} {list(array.shape)}, "
+                f"manifest says {entry['dtype']} {entry['shape']}"
+            )
+        arrays[key] = array
+
+    artifact = ModelArtifact(manifest, arrays)
+    logger.info(f"Loaded model artifact {artifact.name} {artifact.version} "
+                f"({artifact.nbytes / 1e6:.1f} MB mapped) from {directory}")
+    return artifact
+
+def prune_artifact(directory):
+    """
+    Delete array files the current manifest no longer references.
+
+    Workers still mapping an older version keep a valid mapping on POSIX;
+    the disk space is reclaimed once they unmap it (e.g. after a rolling
+    restart).
+
+    Args:
+        directory (str): Artifact directory
+
+    Returns:
+        list: Removed file names
+    """
+    referenced = {entry['file'] for entry in read_manifest(directory)['arrays'].values()}
+    removed = []
+    for filename in os.listdir(directory):
+        if filename.endswith('.npy') and filename not in referenced:
+            os.remove(os.path.join(directory, filename))
+            removed.append(filename)
+    return removed
@@ -0,0 +1,291 @@
+import heapq
+import json
+import logging
+import math
+import os
+import threading
+import time
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Fields read from the doctors collection
+DOCTOR_FIELDS = ['specialty', 'rating', 'reviewCount', 'availableSlots', 'location']
+GRID_DEGREES = 0.1  # ~11 km cells for nearby-doctor lookups
+EARTH_RADIUS_KM = 6371.0
+SERVER_SELECTION_TIMEOUT_MS = 2000  # fail fast when MongoDB is unreachable
+
+def _coordinates(location):
+    """
+    (latitude, longitude) of a doctor's location.
+
+    Accepts GeoJSON points (what the ``location.coordinates`` 2dsphere index
+    stores: ``{"type": "Point", "coordinates": [lng, lat]}``), legacy
+    ``[lng, lat]`` pairs and ``{"latitude", "longitude"}`` objects.
+    """
+    coordinates = (location or {}).get('coordinates')
+    if isinstance(coordinates, dict):
+        if 'coordinates' in coordinates:
+            coordinates = coordinates['coordinates']
+        elif 'latitude' in coordinates and 'longitude' in coordinates:
+            return float(coordinates['latitude']), float(coordinates['longitude'])
+    if isinstance(coordinates, (list, tuple)) and len(coordinates) == 2:
+        return float(coordinates[1]), float(coordinates[0])
+    return None
+
+def parse_location(value):
+    """
+    (latitude, longitude) of a request's ``location`` field.
+
+    Args:
+        value: ``{"latitude", "longitude"}``, a GeoJSON point or ``[lng, lat]``
+
+    Returns:
+        tuple: (latitude, longitude), or None if missing or malformed
+    """
+    try:
+        return _coordinates({'coordinates': value})
+    except (TypeError, ValueError):
+        return None
+
+def _distance_km(a, b):
+    """Great-circle distance between two (latitude, longitude) points"""
+    lat1, lon1, lat2, lon2 = map(math.radians, (*a, *b))
+    h = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(h)))
+
+def _cell(point):
+    return (math.floor(point[0] / GRID_DEGREES), math.floor(point[1] / GRID_DEGREES))
+
+def _cell_distance_km(point, cell):
+    """Distance from a point to the nearest point of a grid cell"""
+    nearest = (
+        min(max(point[0], cell[0] * GRID_DEGREES), (cell[0] + 1) * GRID_DEGREES),
+        min(max(point[1], cell[1] * GRID_DEGREES), (cell[1] + 1) * GRID_DEGREES)
+    )
+    return _distance_km(point, nearest)
+
+class DoctorIndex:
+    def __init__(self):
+        """
+        In-memory index of doctors for recommendations.
+
+        Each specialty keeps a postings list of doctor IDs ordered by rating
+        (best first), so the best available doctors of a specialty are the
+        first available entries of its list: top-k costs O(k) rather than a
+        scan of every doctor. Doctors with coordinates are also bucketed per
+        specialty into a coarse lat/lng grid, each cell ordered the same way,
+        for nearby searches. The index is rebuilt as a whole by ``load``;
+        there are no per-doctor updates.
+        """
+        self.doctors = {}
+        self._postings = {}  # specialty -> [(-rating, -reviewCount, doctor_id)]
+        self._cells = {}  # (specialty, cell) -> postings, same order as above
+        self._lock = threading.Lock()
+        self.max_rating = 5.0  # upper bound on ratings, for search pruning
+
+    def __len__(self):
+        return len(self.doctors)
+
+    def load(self, documents):
+        """
+        Replace the index contents. The new index is built aside and swapped
+        in, so readers never see a partially loaded index.
+
+        Args:
+            documents (iterable): Doctor documents from the ``doctors`` collection
+        """
+        doctors, postings, cells = {}, {}, {}
+        max_rating = 5.0
+        for document in documents:
+            doctor = self._doctor(document)
+            doctors[doctor['id']] = doctor
+            max_rating = max(max_rating, doctor['rating'])
+        for doctor in doctors.values():
+            posting = (-doctor['rating'], -doctor['reviewCount'], doctor['id'])
+            postings.setdefault(doctor['specialty'], []).append(posting)
+            if doctor['point'] is not None:
+                cells.setdefault((doctor['specialty'], _cell(doctor['point'])), []).append(posting)
+        for lists in (postings, cells):
+            for posting_list in lists.values():
+                posting_list.sort()
+        with self._lock:
+            self.doctors, self._postings, self._cells = doctors, postings, cells
+            self.max_rating = max_rating
+
+    def _doctor(self, document):
+        slots = document.get('availableSlots')
+        return {
+            'id': str(document.get('_id') or document.get('id')),
+            'specialty': document.get('specialty') or 'General Physician',
+            'rating': float(document.get('rating') or 0.0),
+            'reviewCount': int(document.get('reviewCount') or 0),
+            # Doctors without published slots are not filtered out
+            'available': slots is None or any(slot.get('available') for slot in slots),
+            'point': _coordinates(document.get('location'))
+        }
+
+    def top_doctors(self, specialty, limit, near=None, radius_km=25.0):
+        """
+        Best doctors of a specialty.
+
+        Args:
+            specialty (str): Specialty name
+            limit (int): Maximum number of doctors
+            near (tuple): Optional (latitude, longitude); only doctors within
+                ``radius_km`` are returned, ranked by rating minus a distance
+                penalty that reaches 5 rating points at the edge of the radius
+            radius_km (float): Search radius around ``near``
+
+        Returns:
+            list: (doctor, distance in km or None) tuples
+        """
+        if near is None:
+            found = []
+            doctors = self.doctors
+            for _, _, doctor_id in self._postings.get(specialty, ()):
+                doctor = doctors.get(doctor_id)
+                if doctor is not None and doctor['available']:
+                    found.append((doctor, None))
+                    if len(found) >= limit:
+                        break
+            return found
+
+        # Visit the grid cells covering the radius ring by ring around the
+        # query's cell, keeping the k best in a heap. A ring is only visited if
+        # its distance could still let a top-rated doctor in; within a cell
+        # doctors come best rated first, so a cell is left as soon as its
+        # distance bound rules out the rest.
+        penalty = 5.0 / radius_km
+        reach = int(math.ceil(radius_km / (111.0 * GRID_DEGREES * max(math.cos(math.radians(near[0])), 0.1))))
+        # Smallest cell side in the searched area, for ring distance bounds
+        cell_km = 111.0 * GRID_DEGREES * max(math.cos(math.radians(min(abs(near[0]) + reach * GRID_DEGREES, 89.0))), 0.01)
+        center = _cell(near)
+        heap = []  # (-key, doctor_id, doctor, distance): worst kept doctor on top
+        for ring in range(reach + 1):
+            if len(heap) >= limit and penalty * (ring - 1) * cell_km - self.max_rating >= -heap[0][0]:
+                break
+            cells = []
+            for row in range(center[0] - ring, center[0] + ring + 1):
+                step = 1 if abs(row - center[0]) == ring else 2 * ring
+                for column in range(center[1] - ring, center[1] + ring + 1, step or 1):
+                    postings = self._cells.get((specialty, (row, column)))
+                    if postings:
+                        distance = _cell_distance_km(near, (row, column))
+                        if distance <= radius_km:
+                            cells.append((distance, postings))
+            cells.sort(key=lambda cell: cell[0])
+            self._scan_cells(cells, near, radius_km, penalty, limit, heap)
+        return [(doctor, distance) for _, _, doctor, distance in sorted(heap, reverse=True)]
+
+    def _scan_cells(self, cells, near, radius_km, penalty, limit, heap):
+        """Push the doctors of the given cells that beat the heap's worst entry"""
+        for cell_distance, postings in cells:
+            for negative_rating, _, doctor_id in postings:
+                if len(heap) >= limit and penalty * cell_distance + negative_rating >= -heap[0][0]:
+                    break
+                doctor = self.doctors.get(doctor_id)
+                if doctor is None or not doctor['available']:
+                    continue
+                distance = _distance_km(near, doctor['point'])
+                if distance > radius_km:
+                    continue
+                entry = (-(penalty * distance - doctor['rating']), doctor_id, doctor, distance)
+                if len(heap) < limit:
+                    heapq.heappush(heap, entry)
+                elif entry > heap[0]:
+                    heapq.heapreplace(heap, entry)
+
+class MongoDoctorSource:
+    def __init__(self, uri, refresh_seconds=60.0):
+        """
+        ``doctors`` collection reader for keeping a DoctorIndex current.
+
+        Every refresh reloads the whole collection, in every worker process:
+        one collection scan per worker per ``refresh_seconds``. Applying only
+        the changes would need an update timestamp on the documents, which
+        the collection's writers don't keep, or a change stream, which the
+        standalone MongoDB deployment doesn't offer. Raise
+        DOCTOR_INDEX_REFRESH_SECONDS for large collections. ``DoctorIndex.load``
+        builds the new index aside, so requests keep using the current one
+        meanwhile.
+
+        Args:
+            uri (str): MongoDB connection string including the database name
+            refresh_seconds (float): Time between background refreshes
+        """
+        self.uri = uri
+        self.refresh_seconds = refresh_seconds
+        self._collection = None
+        self._client_pid = None
+        self._refresher_pid = None
+        self._starting = threading.Lock()
+
+    def _doctors(self):
+        # MongoClient isn't fork-safe: each process opens its own
+        if self._client_pid != os.getpid():
+            from pymongo import MongoClient
+
+            client = MongoClient(self.uri, serverSelectionTimeoutMS=SERVER_SELECTION_TIMEOUT_MS)
+            self._collection = client.get_default_database().doctors
+            self._client_pid = os.getpid()
+        return self._collection
+
+    def sync(self, index):
+        """
+        Reload every doctor into the index.
+
+        Args:
+            index (DoctorIndex): Index to update
+        """
+        index.load(self._doctors().find({}, {field: 1 for field in DOCTOR_FIELDS}))
+        logger.info(f"Doctor index synced: {len(index)} doctors")
+
+    def start(self, index):
+        """
+        Start the background thread that syncs every ``refresh_seconds``.
+
+        Cheap enough to call on every request: it only starts a thread the
+        first time it runs in a process, so pre-forked workers (where the
+        thread started before the fork is gone) each get their own.
+
+        Args:
+            index (DoctorIndex): Index to keep current
+        """
+        pid = os.getpid()
+        if self._refresher_pid == pid:
+            return
+        with self._starting:
+            if self._refresher_pid == pid:
+                return
+            threading.Thread(
+                target=self._refresh, args=(index,), name='doctor-index-refresh', daemon=True
+            ).start()
+            self._refresher_pid = pid
+
+    def _refresh(self, index):
+        while True:
+            time.sleep(self.refresh_seconds)
+            try:
+                self.sync(index)
+            except Exception as e:
+                logger.error(f"Error refreshing doctor index: {str(e)}")
+
+def load_doctors_file(path):
+    """
+    Read doctor documents from a JSON array (e.g. a ``mongoexport --jsonArray`` dump).
+
+    Args:
+        path (str): JSON file path
+
+    Returns:
+        list: Doctor documents
+    """
+    with open(path, encoding='utf-8') as f:
+        documents = json.load(f)
+    for document in documents:
+        # mongoexport writes ObjectIds as {"$oid": "..."}
+        if isinstance(document.get('_id'), dict):
+            document['_id'] = document['_id'].get('$oid')
+    return documents
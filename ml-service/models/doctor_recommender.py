@@ -1,22 +1,38 @@
 import numpy as np
+import heapq
 import json
+import math
 import os
 from pathlib import Path
 import logging
-import random
+from scipy import sparse
+
+from models.artifacts import load_artifact
+from models.doctor_index import DoctorIndex, MongoDoctorSource, load_doctors_file
+from utils.keyword_matcher import KeywordMatcher
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class DoctorRecommender:
-    def __init__(self, model_path=None):
+    def __init__(self, model_path=None, doctor_index=None, keyword_matcher=None, verify_checksums=True):
         """
         Initialize the doctor recommender.
         
         In a production environment, this would load a trained ML model
         for collaborative filtering or content-based recommendations.
         For this example, we'll use a rule-based approach.
+        
+        Doctors come from ``doctor_index`` if given, else from the JSON file
+        in DOCTORS_DATA_PATH, else from the ``doctors`` collection at
+        MONGODB_URI (refreshed every DOCTOR_INDEX_REFRESH_SECONDS).
+        
+        Keyword scans go through ``keyword_matcher`` (shared with the symptom
+        analyzer when built by the registry), or a private one.
+        
+        ``verify_checksums`` checks the model artifact's checksums before
+        loading it (the registry passes Config.VERIFY_MODEL_CHECKSUMS).
         """
         # Mock doctor specialties for demonstration
         self.specialties = {
@@ -32,17 +48,123 @@ class DoctorRecommender:
             'Ophthalmologist': ['eye', 'vision', 'glasses', 'cataract']
         }
         
+        # Keyword x specialty TF-IDF matrix: a text's keyword matches times
+        # this matrix are its specialty scores
+        self._specialty_names = list(self.specialties)
+        self._keywords = list(dict.fromkeys(
+            keyword for keywords in self.specialties.values() for keyword in keywords
+        ))
+        self._keyword_specialty = self._build_keyword_matrix()
+        
+        self._keyword_columns = {keyword: index for index, keyword in enumerate(self._keywords)}
+        self.keyword_matcher = keyword_matcher or KeywordMatcher()
+        self.keyword_matcher.add(self._keywords)
+        
+        # Doctor index
+        self.doctor_source = None
+        if doctor_index is None:
+            doctor_index = DoctorIndex()
+            self._load_doctors(doctor_index)
+        self.doctor_index = doctor_index
+        
         # Load ML model if available
         self.model = None
         if model_path:
             try:
-                # This would load a trained model (e.g., collaborative filtering model)
-                # self.model = load_model(model_path)
-                logger.info(f"Loaded model from {model_path}")
+                # Arrays are memory-mapped read-only, so workers share them
+                self.model = load_artifact(model_path, verify=verify_checksums)
             except Exception as e:
                 logger.error(f"Error loading model: {str(e)}")
     
-    def recommend(self, symptoms, user_id=None, limit=5):
+    def _build_keyword_matrix(self):
+        """
+        Sparse keyword x specialty matrix of IDF weights.
+        
+        Each specialty's keyword list is a document. A keyword's weight is
+        its smoothed IDF, 1 + ln(N / df), divided by the largest possible
+        IDF, so a keyword unique to one specialty weighs 1 (a match counts
+        as much as it always did) and keywords shared between specialties,
+        like 'headache', count for less.
+        
+        Returns:
+            scipy.sparse.csr_matrix: Keywords x specialties
+        """
+        row = {keyword: index for index, keyword in enumerate(self._keywords)}
+        document_frequency = np.zeros(len(self._keywords))
+        for keywords in self.specialties.values():
+            for keyword in set(keywords):
+                document_frequency[row[keyword]] += 1
+        
+        count = len(self._specialty_names)
+        idf = (1 + np.log(count / document_frequency)) / (1 + math.log(count))
+        
+        rows, columns = [], []
+        for column, keywords in enumerate(self.specialties.values()):
+            for keyword in dict.fromkeys(keywords):
+                rows.append(row[keyword])
+                columns.append(column)
+        return sparse.csr_matrix(
+            (idf[rows], (rows, columns)), shape=(len(self._keywords), count)
+        )
+    
+    def _keyword_matches(self, texts):
+        """
+        Binary texts x keywords matrix of substring matches.
+        
+        Args:
+            texts (list): Lowercased texts
+            
+        Returns:
+            scipy.sparse.csr_matrix: Texts x keywords
+        """
+        columns = self._keyword_columns
+        indptr, indices = [0], []
+        for matched in self.keyword_matcher.match_batch(texts):
+            # The shared matcher also knows other models' keywords
+            indices.extend(sorted(columns[keyword] for keyword in matched if keyword in columns))
+            indptr.append(len(indices))
+        return sparse.csr_matrix(
+            (np.ones(len(indices)), indices, indptr), shape=(len(texts), len(self._keywords))
+        )
+    
+    def score_specialties(self, symptoms_list):
+        """
+        TF-IDF specialty scores for many texts, with one sparse matrix product.
+        
+        Args:
+            symptoms_list (list): Symptom texts
+            
+        Returns:
+            numpy.ndarray: Texts x specialties scores, columns in ``specialties`` order
+        """
+        matches = self._keyword_matches([symptoms.lower() for symptoms in symptoms_list])
+        return (matches @ self._keyword_specialty).toarray()
+    
+    def _load_doctors(self, index):
+        """
+        Fill the doctor index from the configured source.
+        
+        Args:
+            index (DoctorIndex): Index to fill
+        """
+        try:
+            data_path = os.environ.get('DOCTORS_DATA_PATH')
+            mongodb_uri = os.environ.get('MONGODB_URI')
+            if data_path:
+                index.load(load_doctors_file(data_path))
+                logger.info(f"Loaded {len(index)} doctors from {data_path}")
+            elif mongodb_uri:
+                self.doctor_source = MongoDoctorSource(
+                    mongodb_uri, float(os.environ.get('DOCTOR_INDEX_REFRESH_SECONDS') or 60)
+                )
+                self.doctor_source.sync(index)
+            else:
+                logger.warning("No doctor data configured (DOCTORS_DATA_PATH or MONGODB_URI); "
+                               "recommendations will be empty")
+        except Exception as e:
+            logger.error(f"Error loading doctors: {str(e)}")
+    
+    def recommend(self, symptoms, user_id=None, limit=5, location=None):
         """
         Recommend doctors based on symptoms.
         
@@ -50,63 +172,132 @@ class DoctorRecommender:
             symptoms (str): The symptoms text
             user_id (str): User ID for personalized recommendations
             limit (int): Maximum number of recommendations to return
+            location (tuple): Optional (latitude, longitude) to prefer nearby doctors
             
         Returns:
             list: List of doctor recommendations
         """
         if self.model and user_id:
             # Use ML model for personalized recommendations
-            return self._predict_with_model(symptoms, user_id, limit)
+            return self._predict_with_model(symptoms, user_id, limit, location)
         else:
             # Use rule-based approach
-            return self._rule_based_recommendation(symptoms, limit)
+            return self._rule_based_recommendation(symptoms, limit, location)
+    
+    def recommend_batch(self, symptoms_list, user_ids=None, limit=5, locations=None):
+        """
+        Recommend doctors for many symptom texts at once.
+        
+        Args:
+            symptoms_list (list): Symptom texts
+            user_ids (list): User IDs, one per text (optional)
+            limit (int): Maximum number of recommendations per text
+            locations (list): (latitude, longitude) or None, one per text (optional)
+            
+        Returns:
+            list: One recommendation list per text, as returned by ``recommend``
+        """
+        if user_ids is None:
+            user_ids = [None] * len(symptoms_list)
+        if locations is None:
+            locations = [None] * len(symptoms_list)
+        if self.model:
+            return [
+                self.recommend(symptoms, user_id, limit, location)
+                for symptoms, user_id, location in zip(symptoms_list, user_ids, locations)
+            ]
+        return self._rule_based_batch(symptoms_list, limit, locations)
     
-    def _predict_with_model(self, symptoms, user_id, limit):
+    def _predict_with_model(self, symptoms, user_id, limit, location=None):
         """
         Use ML model to predict doctor recommendations.
         This is a placeholder for actual ML implementation.
         """
-        # In a real implementation, this would use the model to make predictions
-        pass
+        # In a real implementation, this would use the model to make predictions;
+        # until then a loaded artifact doesn't change the rule-based results
+        return self._rule_based_recommendation(symptoms, limit, location)
     
-    def _rule_based_recommendation(self, symptoms, limit):
+    def _rule_based_recommendation(self, symptoms, limit, location=None):
         """
         Use rule-based approach to recommend doctors.
         """
-        symptoms_lower = symptoms.lower()
+        return self._rule_based_batch([symptoms], limit, [location])[0]
+    
+    def _rule_based_batch(self, symptoms_list, limit, locations=None):
+        """
+        Rule-based recommendations for a batch; the texts' keyword matches
+        are scored against every specialty with one sparse matrix product.
+        """
+        specialty_scores = self.score_specialties(symptoms_list)
         
-        # Calculate specialty scores based on keyword matches
-        specialty_scores = {}
-        for specialty, keywords in self.specialties.items():
-            score = 0
-            for keyword in keywords:
-                if keyword in symptoms_lower:
-                    score += 1
-            if score > 0:
-                specialty_scores[specialty] = score
+        # Sort specialties by score; ties keep the listed order
+        rankings = np.argsort(-specialty_scores, axis=1, kind='stable')
         
-        # If no matches, default to General Physician
-        if not specialty_scores:
-            specialty_scores['General Physician'] = 1
+        if self.doctor_source is not None:
+            self.doctor_source.start(self.doctor_index)
+        if locations is None:
+            locations = [None] * len(symptoms_list)
         
-        # Sort specialties by score
-        sorted_specialties = sorted(specialty_scores.items(), key=lambda x: x[1], reverse=True)
+        results = []
+        for scores, ranking, location in zip(specialty_scores, rankings, locations):
+            sorted_specialties = [
+                (self._specialty_names[column], float(scores[column]))
+                for column in ranking[:limit]
+                if scores[column] > 0
+            ]
+            
+            # If no matches, default to General Physician
+            if not sorted_specialties:
+                sorted_specialties = [('General Physician', 1.0)]
+            
+            results.append(self._top_doctors(sorted_specialties, limit, location))
         
-        # Generate mock doctor recommendations
-        recommendations = []
-        for i, (specialty, score) in enumerate(sorted_specialties):
-            if i >= limit:
-                break
-                
-            # In a real app, you would query the database for doctors with this specialty
-            # For now, we'll generate mock data
-            doctor_id = f"doc_{i+1}"
-            match_score = min(100, 60 + score * 10 + random.randint(0, 10))
+        return results
+    
+    def _top_doctors(self, sorted_specialties, limit, location=None):
+        """
+        Best ``limit`` doctors across the matched specialties.
+        
+        Each specialty contributes at most ``limit`` candidates from the
+        index (nearby ones first when a location is given), and a heap keeps
+        the best by match score, so cost doesn't grow with the number of
+        doctors.
+        
+        Args:
+            sorted_specialties (list): (specialty, TF-IDF score) pairs
+            limit (int): Maximum number of doctors
+            location (tuple): Optional (latitude, longitude)
             
-            recommendations.append({
+        Returns:
+            list: Doctor recommendations
+        """
+        candidates = {}
+        for specialty, score in sorted_specialties:
+            found = self.doctor_index.top_doctors(specialty, limit, near=location) if location else []
+            if len(found) < limit:
+                # Not enough doctors nearby: fill with the best rated anywhere
+                seen = {doctor['id'] for doctor, _ in found}
+                found += [
+                    (doctor, None) for doctor, _ in self.doctor_index.top_doctors(specialty, limit)
+                    if doctor['id'] not in seen
+                ][:limit - len(found)]
+            for doctor, distance in found:
+                match_score = min(100, 60 + round(score * 10) + round(doctor['rating'] * 2))
+                # Doctors of unknown distance rank behind nearby ones of equal score
+                key = (match_score, doctor['rating'], -(distance if distance is not None else math.inf), doctor['id'])
+                if doctor['id'] not in candidates or key > candidates[doctor['id']][0]:
+                    candidates[doctor['id']] = (key, specialty, distance)
+        
+        recommendations = []
+        for (match_score, rating, _, doctor_id), specialty, distance in heapq.nlargest(limit, candidates.values()):
+            recommendation = {
                 'doctorId': doctor_id,
                 'matchScore': match_score,
+                'specialty': specialty,
+                'rating': rating,
                 'reason': f"Recommended based on your symptoms related to {specialty.lower()}"
-            })
-        
+            }
+            if distance is not None:
+                recommendation['distanceKm'] = round(distance, 1)
+            recommendations.append(recommendation)
         return recommendations
@@ -5,17 +5,26 @@ import os
 from pathlib import Path
 import logging
 
+from models.artifacts import load_artifact
+from utils.keyword_matcher import KeywordMatcher
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class SymptomAnalyzer:
-    def __init__(self, model_path=None):
+    def __init__(self, model_path=None, keyword_matcher=None, verify_checksums=True):
         """
         Initialize the symptom analyzer.
         
         In a production environment, this would load a trained ML model.
         For this example, we'll use a rule-based approach.
+        
+        Keyword scans go through ``keyword_matcher`` (shared with the doctor
+        recommender when built by the registry), or a private one.
+        
+        ``verify_checksums`` checks the model artifact's checksums before
+        loading it (the registry passes Config.VERIFY_MODEL_CHECKSUMS).
         """
         self.symptom_keywords = {
             'headache': {
@@ -95,13 +104,23 @@ class SymptomAnalyzer:
             }
         }
         
+        # Keyword table as arrays for vectorized batch scoring
+        self._keywords = list(self.symptom_keywords)
+        self._urgency = np.array([info['urgency'] for info in self.symptom_keywords.values()], dtype=np.float64)
+        self._specialties = list(dict.fromkeys(info['specialty'] for info in self.symptom_keywords.values()))
+        self._keyword_specialty = np.zeros((len(self._keywords), len(self._specialties)), dtype=np.int64)
+        for index, info in enumerate(self.symptom_keywords.values()):
+            self._keyword_specialty[index, self._specialties.index(info['specialty'])] = 1
+        self._keyword_columns = {keyword: index for index, keyword in enumerate(self._keywords)}
+        self.keyword_matcher = keyword_matcher or KeywordMatcher()
+        self.keyword_matcher.add(self._keywords)
+        
         # Load ML model if available
         self.model = None
         if model_path:
             try:
-                # This would load a trained model (e.g., TensorFlow, scikit-learn)
-                # self.model = load_model(model_path)
-                logger.info(f"Loaded model from {model_path}")
+                # Arrays are memory-mapped read-only, so workers share them
+                self.model = load_artifact(model_path, verify=verify_checksums)
             except Exception as e:
                 logger.error(f"Error loading model: {str(e)}")
     
@@ -123,84 +142,123 @@ class SymptomAnalyzer:
             # Use rule-based approach
             return self._rule_based_analysis(symptoms, features)
     
+    def analyze_batch(self, symptoms_list, features_list=None):
+        """
+        Analyze many symptom texts at once.
+        
+        Args:
+            symptoms_list (list): Symptom texts
+            features_list (list): Feature dicts, one per text (optional)
+            
+        Returns:
+            list: One analysis result per text, as returned by ``analyze``
+        """
+        if features_list is None:
+            features_list = [None] * len(symptoms_list)
+        if self.model:
+            return [
+                self._predict_with_model(symptoms, features)
+                for symptoms, features in zip(symptoms_list, features_list)
+            ]
+        return self._rule_based_batch(symptoms_list, features_list)
+    
     def _predict_with_model(self, symptoms, features):
         """
         Use ML model to predict urgency and conditions.
         This is a placeholder for actual ML implementation.
         """
-        # In a real implementation, this would use the model to make predictions
-        pass
+        # In a real implementation, this would use the model to make predictions;
+        # until then a loaded artifact doesn't change the rule-based results
+        return self._rule_based_analysis(symptoms, features)
     
     def _rule_based_analysis(self, symptoms, features):
         """
         Use rule-based approach to analyze symptoms.
         """
-        symptoms_lower = symptoms.lower()
-        
-        # Initialize variables
-        urgency_scores = []
-        possible_conditions = []
-        specialties = []
-        
-        # Check for keywords in symptoms
-        for keyword, info in self.symptom_keywords.items():
-            if keyword in symptoms_lower:
-                urgency_scores.append(info['urgency'])
-                possible_conditions.extend(info['conditions'])
-                specialties.append(info['specialty'])
-        
-        # If no keywords found, default values
-        if not urgency_scores:
-            urgency_scores = [5]  # Default moderate urgency
-            possible_conditions = ['General Medical Condition']
-            specialties = ['General Physician']
+        return self._rule_based_batch([symptoms], [features])[0]
+    
+    def _rule_based_batch(self, symptoms_list, features_list):
+        """
+        Rule-based analysis of a batch; keyword matches form a texts x keywords
+        matrix so urgency and specialty votes are computed for all texts at once.
+        """
+        # Check for keywords in symptoms, one scan per text
+        matches = np.zeros((len(symptoms_list), len(self._keywords)), dtype=bool)
+        columns = self._keyword_columns
+        for row, matched in enumerate(self.keyword_matcher.match_batch([symptoms.lower() for symptoms in symptoms_list])):
+            matches[row, [columns[keyword] for keyword in matched if keyword in columns]] = True
+        match_counts = matches.sum(axis=1)
         
-        # Calculate urgency score
-        base_urgency = np.mean(urgency_scores)
+        # Mean urgency of matched keywords, default moderate urgency when none match
+        base_urgency = np.where(
+            match_counts > 0,
+            (matches @ self._urgency) / np.maximum(match_counts, 1),
+            5.0
+        )
         
         # Adjust based on features if provided
-        if features:
+        for index, features in enumerate(features_list):
+            if not features:
+                continue
             # Severity increases urgency
             if 'severity' in features:
-                severity_factor = features['severity'] * 1.5
-                base_urgency += severity_factor
-            
+                base_urgency[index] += features['severity'] * 1.5
             # Duration affects urgency (recent onset may be more urgent)
             if 'duration' in features:
                 if features['duration'] == 0:  # today
-                    base_urgency += 1
+                    base_urgency[index] += 1
                 elif features['duration'] == 3:  # months
-                    base_urgency -= 1
+                    base_urgency[index] -= 1
         
         # Clamp urgency between 1-10
-        final_urgency = max(1, min(10, round(base_urgency)))
+        final_urgencies = np.clip(np.round(base_urgency), 1, 10).astype(int)
         
-        # Remove duplicates
-        possible_conditions = list(set(possible_conditions))
+        # Most common specialty; ties go to the specialty of the earliest matched
+        # keyword in the table, as Counter.most_common over the matches did
+        keyword_count = len(self._keywords)
+        specialty_votes = matches.astype(np.int64) @ self._keyword_specialty
+        first_match = np.where(
+            matches[:, :, None] & self._keyword_specialty.astype(bool)[None],
+            np.arange(keyword_count)[None, :, None],
+            keyword_count
+        ).min(axis=1)
+        top_specialties = (specialty_votes * (keyword_count + 1) - first_match).argmax(axis=1)
         
-        # Determine most common specialty
-        if specialties:
-            from collections import Counter
-            specialty_counter = Counter(specialties)
-            recommended_specialty = specialty_counter.most_common(1)[0][0]
-        else:
-            recommended_specialty = 'General Physician'
+        results = []
+        for index, final_urgency in enumerate(final_urgencies.tolist()):
+            matched = np.flatnonzero(matches[index])
+            if matched.size:
+                # Remove duplicates, keeping first mention
+                possible_conditions = list(dict.fromkeys(
+                    condition
+                    for keyword_index in matched
+                    for condition in self.symptom_keywords[self._keywords[keyword_index]]['conditions']
+                ))
+                recommended_specialty = self._specialties[top_specialties[index]]
+            else:
+                possible_conditions = ['General Medical Condition']
+                recommended_specialty = 'General Physician'
+            
+            results.append({
+                'urgencyScore': final_urgency,
+                'possibleConditions': possible_conditions[:3],  # Top 3 conditions
+                'recommendedSpecialty': recommended_specialty,
+                'recommendedTimeframe': self._timeframe(final_urgency)
+            })
         
-        # Determine recommended timeframe based on urgency
-        if final_urgency >= 9:
-            recommended_timeframe = "Immediately"
-        elif final_urgency >= 7:
-            recommended_timeframe = "Within 24 hours"
-        elif final_urgency >= 5:
-            recommended_timeframe = "Within 3 days"
-        elif final_urgency >= 3:
-            recommended_timeframe = "Within a week"
+        return results
+    
+    def _timeframe(self, urgency):
+        """
+        Determine recommended timeframe based on urgency.
+        """
+        if urgency >= 9:
+            return "Immediately"
+        elif urgency >= 7:
+            return "Within 24 hours"
+        elif urgency >= 5:
+            return "Within 3 days"
+        elif urgency >= 3:
+            return "Within a week"
         else:
-            recommended_timeframe = "At your convenience"
-        
-        return {
-            'urgencyScore': final_urgency,
-            'possibleConditions': possible_conditions[:3],  # Top 3 conditions
-            'recommendedSpecialty': recommended_specialty,
-            'recommendedTimeframe': recommended_timeframe
-        }
+            return "At your convenience"
@@ -0,0 +1,88 @@
+"""
+Check the features ``/api/analyze`` hands to the symptom analyzer.
+
+Posts sample texts through both serving entry points (the Flask app and the
+ASGI app's batched endpoint), records the features the symptom analyzer
+receives for each, and exits non-zero when a text's negated terms differ
+from the expected ones, e.g. when negation scope runs past a full stop.
+
+Usage:
+    python scripts/check_features.py
+"""
+import asyncio
+import os
+import sys
+
+SERVICE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# (request body, expected negated terms)
+CASES = [
+    ({'symptoms': 'No fever. Headache and cough'}, ['fever']),
+    ({'symptoms': 'I do not have fever, chest pain is severe'}, ['fever']),
+    ({'symptoms': 'Fever; no cough'}, ['cough']),
+    ({'symptoms': 'জ্বর নেই। মাথা ব্যথা'}, ['জ্বর'])
+]
+
+def record_features(analyzer):
+    """
+    Record the features every analysis of ``analyzer`` receives.
+
+    Returns:
+        list: Filled with one features dict per analyzed text
+    """
+    seen = []
+    rule_based_batch = analyzer._rule_based_batch
+
+    def recording(symptoms_list, features_list):
+        seen.extend(features_list)
+        return rule_based_batch(symptoms_list, features_list)
+
+    analyzer._rule_based_batch = recording
+    return seen
+
+def post_flask(bodies):
+    from app import create_app
+
+    client = create_app().test_client()
+    for body in bodies:
+        response = client.post('/api/analyze', json=body)
+        if response.status_code != 200:
+            raise SystemExit(f"Flask /api/analyze returned {response.status_code}")
+
+async def post_asgi(bodies):
+    import httpx
+    from app.asgi import create_asgi_app
+
+    app = create_asgi_app()
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url='http://test') as client:
+            for body in bodies:
+                response = await client.post('/api/analyze', json=body)
+                if response.status_code != 200:
+                    raise SystemExit(f"ASGI /api/analyze returned {response.status_code}")
+
+def main():
+    sys.path.insert(0, SERVICE_DIR)
+    os.environ.setdefault('WARM_UP_MODELS', 'false')
+    from app.registry import registry
+
+    seen = record_features(registry.get('symptom_analyzer'))
+    bodies = [body for body, _ in CASES]
+
+    failures = 0
+    for entry, post in (('flask', post_flask), ('asgi', lambda bodies: asyncio.run(post_asgi(bodies)))):
+        del seen[:]
+        post(bodies)
+        for (body, expected), features in zip(CASES, seen):
+            negated = features.get('negated_terms')
+            status = 'ok' if negated == expected else 'FAIL'
+            failures += status != 'ok'
+            print(f"{entry:<6}{status:<6}{body['symptoms']!r}: negated {negated}, expected {expected}")
+
+    if failures:
+        print(f"{failures} feature check(s) failed")
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""
+Measure ml-service cold start.
+
+Imports the serving entry point and warms up every model in a fresh
+interpreter, reports the time spent in each phase, and exits non-zero when
+the total exceeds ``COLD_START_BUDGET_SECONDS``.
+
+Usage:
+    python scripts/cold_start.py [--entry wsgi|asgi] [--budget SECONDS]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+SERVICE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runs in the child interpreter; prints one JSON line with the timings
+PROBE = '''
+import json, os, time
+os.environ['WARM_UP_MODELS'] = 'false'
+start = time.perf_counter()
+import {entry}
+imported = time.perf_counter() - start
+from app.registry import registry
+registry.warm_up()
+print(json.dumps({{
+    'import_seconds': round(imported, 4),
+    'warm_up_seconds': registry.warm_up_seconds,
+    'load_seconds': registry.load_seconds
+}}))
+'''
+
+def measure(entry):
+    """
+    Time a cold start of the given entry point in a subprocess.
+
+    Args:
+        entry (str): Entry module name ('wsgi' or 'asgi')
+
+    Returns:
+        dict: Import, warm-up and per-model load timings in seconds
+    """
+    result = subprocess.run(
+        [sys.executable, '-c', PROBE.format(entry=entry)],
+        cwd=SERVICE_DIR,
+        capture_output=True,
+        text=True
+    )
+    if result.returncode != 0:
+        sys.stderr.write(result.stderr)
+        raise SystemExit(f"Cold start of {entry} failed")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def main():
+    sys.path.insert(0, SERVICE_DIR)
+    from app.config import Config
+
+    parser = argparse.ArgumentParser(description='Measure ml-service cold start time')
+    parser.add_argument('--entry', choices=['wsgi', 'asgi'], default='wsgi')
+    parser.add_argument('--budget', type=float, default=Config.COLD_START_BUDGET_SECONDS,
+                        help='Maximum allowed import + warm-up time in seconds')
+    args = parser.parse_args()
+
+    timings = measure(args.entry)
+    total = timings['import_seconds'] + timings['warm_up_seconds']
+
+    print(f"Entry point:  {args.entry}")
+    print(f"Import:       {timings['import_seconds']:.3f}s")
+    for name, seconds in timings['load_seconds'].items():
+        print(f"  {name:<20}{seconds:.3f}s")
+    print(f"Warm-up:      {timings['warm_up_seconds']:.3f}s")
+    print(f"Total:        {total:.3f}s (budget {args.budget:g}s)")
+
+    if total > args.budget:
+        print("Cold start exceeds budget")
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
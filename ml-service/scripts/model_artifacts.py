@@ -0,0 +1,71 @@
+"""
+Inspect, verify and prune ml-service model artifacts.
+
+Artifacts live in ``MODEL_DIR/<model name>/`` (see ``models/artifacts.py``).
+``verify`` exits non-zero if a manifest is invalid or a checksum doesn't
+match, so it can gate a deploy; ``prune`` removes array files that the
+current manifests no longer reference.
+
+Usage:
+    python scripts/model_artifacts.py {inspect|verify|prune} [--model-dir DIR]
+"""
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.config import Config
+from models.artifacts import has_artifact, prune_artifact, read_manifest, verify_artifact
+
+def artifact_dirs(model_dir):
+    """
+    Artifact directories under a model directory.
+
+    Args:
+        model_dir (str): Directory holding one subdirectory per model
+
+    Returns:
+        list: Paths of the subdirectories that hold an artifact
+    """
+    if not os.path.isdir(model_dir):
+        return []
+    paths = (os.path.join(model_dir, name) for name in sorted(os.listdir(model_dir)))
+    return [path for path in paths if has_artifact(path)]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('command', choices=['inspect', 'verify', 'prune'])
+    parser.add_argument('--model-dir', default=Config.MODEL_DIR)
+    args = parser.parse_args()
+
+    ok = True
+    report = {}
+    for path in artifact_dirs(args.model_dir):
+        try:
+            manifest = read_manifest(path)
+        except (OSError, ValueError) as e:
+            report[path] = {'error': str(e)}
+            ok = False
+            continue
+
+        entry = {'name': manifest['name'], 'version': manifest['version']}
+        if args.command == 'inspect':
+            entry['created_at'] = manifest.get('created_at')
+            entry['arrays'] = {
+                key: {'dtype': array['dtype'], 'shape': array['shape']}
+                for key, array in manifest['arrays'].items()
+            }
+        elif args.command == 'verify':
+            entry['failed'] = verify_artifact(path, manifest)
+            ok = ok and not entry['failed']
+        else:
+            entry['removed'] = prune_artifact(path)
+        report[path] = entry
+
+    print(json.dumps(report, indent=2))
+    return 0 if ok else 1
+
+if __name__ == '__main__':
+    sys.exit(main())
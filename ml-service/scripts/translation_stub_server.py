@@ -0,0 +1,79 @@
+"""
+Local stand-in for the external translation service.
+
+Implements the batch protocol used by HttpTranslationBackend
+(``{"texts", "source", "target"}`` -> ``{"translations"}``) with the built-in
+dictionary, plus optional latency to mimic a remote service. Point the
+service at it with ``TRANSLATOR_API_URL=http://127.0.0.1:8900/translate``.
+
+Usage:
+    python scripts/translation_stub_server.py [--port 8900] [--latency-ms 50]
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.translator import Translator
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def make_handler(backend, latency):
+    """Request handler class answering batch translation requests"""
+    class TranslationHandler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            try:
+                length = int(self.headers.get('Content-Length') or 0)
+                data = json.loads(self.rfile.read(length))
+                texts = data['texts']
+                translations = backend.translate_batch(texts, data['source'], data['target'])
+            except (ValueError, KeyError, TypeError) as e:
+                self._respond(400, {'error': str(e)})
+                return
+
+            time.sleep(latency)
+            logger.info(f"Translated batch of {len(texts)} ({data['source']} -> {data['target']})")
+            self._respond(200, {'translations': translations})
+
+        def _respond(self, status, body):
+            payload = json.dumps(body, ensure_ascii=False).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, format, *args):
+            pass
+
+    return TranslationHandler
+
+def main():
+    parser = argparse.ArgumentParser(description='Stub batch translation server')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8900)
+    parser.add_argument('--latency-ms', type=float, default=0.0, help='Delay added to every batch')
+    args = parser.parse_args()
+
+    # Serve the built-in dictionary, never the external API this stub stands in for
+    os.environ.pop('TRANSLATOR_API_URL', None)
+    backend = Translator().backend
+
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(backend, args.latency_ms / 1000.0))
+    logger.info(f"Translation stub listening on http://{args.host}:{args.port}/translate")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == '__main__':
+    main()
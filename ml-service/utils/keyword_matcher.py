@@ -0,0 +1,109 @@
+import logging
+import os
+import re
+import threading
+from collections import OrderedDict
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class KeywordMatcher:
+    def __init__(self, keywords=(), cache_size=None):
+        """
+        Single-pass keyword matcher shared by the rule-based models.
+
+        Every registered keyword is compiled into one regex, so a text is
+        scanned once for all of them instead of once per keyword and per
+        model. A lookahead captures the longest keyword at every position,
+        overlapping matches included, and each keyword contained in a match
+        counts as matched too, which keeps plain substring semantics ('sore
+        throat' also matches 'throat').
+
+        Results are kept in a small LRU keyed by text: the frontend calls
+        /analyze and /recommend-doctors back to back with the same symptoms,
+        and the second call reuses the first one's scan.
+
+        Args:
+            keywords (iterable): Initial keywords (lowercase)
+            cache_size (int): Maximum cached texts; defaults to
+                KEYWORD_MATCH_CACHE_SIZE or 4096, 0 disables the cache
+        """
+        if cache_size is None:
+            cache_size = int(os.environ.get('KEYWORD_MATCH_CACHE_SIZE') or 4096)
+        self.cache_size = cache_size
+        self.keywords = []
+        self._compiled = None  # (pattern, keyword -> keywords it contains), swapped as one
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {'scans': 0, 'hits': 0}
+        self.add(keywords)
+
+    def add(self, keywords):
+        """
+        Register more keywords and recompile. Models call this once when
+        they are built.
+
+        Args:
+            keywords (iterable): Keywords (lowercase)
+        """
+        with self._lock:
+            known = set(self.keywords)
+            new = [keyword for keyword in dict.fromkeys(keywords) if keyword and keyword not in known]
+            if not new:
+                return
+            self.keywords.extend(new)
+            pattern = re.compile('(?=({}))'.format(
+                '|'.join(re.escape(keyword) for keyword in sorted(self.keywords, key=len, reverse=True))
+            ))
+            contained = {
+                keyword: frozenset(other for other in self.keywords if other in keyword)
+                for keyword in self.keywords
+            }
+            self._compiled = (pattern, contained)
+            self._cache.clear()
+
+    def match(self, text):
+        """
+        Keywords occurring in a text.
+
+        Args:
+            text (str): Text, lowercased by the caller
+
+        Returns:
+            frozenset: Matched keywords
+        """
+        cache = self._cache
+        if self.cache_size:
+            with self._lock:
+                matched = cache.get(text)
+                if matched is not None:
+                    cache.move_to_end(text)
+                    self.stats['hits'] += 1
+                    return matched
+
+        if self._compiled is None:
+            return frozenset()
+        pattern, contained = self._compiled
+        found = pattern.findall(text)
+        matched = frozenset().union(*(contained[keyword] for keyword in set(found))) if found else frozenset()
+
+        with self._lock:
+            self.stats['scans'] += 1
+            if self.cache_size:
+                cache[text] = matched
+                if len(cache) > self.cache_size:
+                    cache.popitem(last=False)
+        return matched
+
+    def match_batch(self, texts):
+        """
+        Keywords occurring in each of many texts.
+
+        Args:
+            texts (list): Texts, lowercased by the caller
+
+        Returns:
+            list: One frozenset of matched keywords per text
+        """
+        return [self.match(text) for text in texts]
@@ -0,0 +1,112 @@
+import re
+
+_END = ''  # key of the translation stored at the node where a phrase ends
+
+class PhraseTrie:
+    def __init__(self, phrases=None, whole_words=False):
+        """
+        Character trie for greedy longest-match phrase replacement.
+
+        Replacing phrases with one ``str.replace`` per entry costs
+        O(entries x text) and gives order-dependent results when phrases
+        overlap. Here the text is scanned once left to right; at each
+        position the longest phrase starting there is replaced and the scan
+        continues after it, so cost depends on the text length (times the
+        longest phrase at worst), not on the number of entries.
+
+        Args:
+            phrases (dict): Phrase -> replacement
+            whole_words (bool): Only match phrases that start and end at word
+                boundaries (for Latin-script input, so 'cold' doesn't match
+                inside 'scolding'). Bengali input leaves this off: suffixes
+                and compounds attach directly to words.
+        """
+        self.whole_words = whole_words
+        self._root = {}
+        self._size = 0
+        self._starts = None
+        for phrase, replacement in (phrases or {}).items():
+            self.add(phrase, replacement)
+
+    def __len__(self):
+        return self._size
+
+    def add(self, phrase, replacement):
+        """
+        Add or overwrite a phrase.
+
+        Args:
+            phrase (str): Phrase to match
+            replacement (str): Text it is replaced with
+        """
+        if not phrase:
+            return
+        self._starts = None
+        node = self._root
+        for char in phrase:
+            node = node.setdefault(char, {})
+        if _END not in node:
+            self._size += 1
+        node[_END] = replacement
+
+    def longest_match(self, text, start):
+        """
+        Longest phrase starting at ``start``.
+
+        Args:
+            text (str): Text to search
+            start (int): Position in ``text``
+
+        Returns:
+            tuple: (end position, replacement), or (start, None) if no phrase starts there
+        """
+        node = self._root
+        end, replacement = start, None
+        whole_words = self.whole_words
+        for position in range(start, len(text)):
+            node = node.get(text[position])
+            if node is None:
+                break
+            if _END in node and not (
+                whole_words and position + 1 < len(text) and text[position + 1].isalnum()
+            ):
+                end, replacement = position + 1, node[_END]
+        return end, replacement
+
+    def replace(self, text):
+        """
+        Replace every phrase in ``text``, longest match first, left to right.
+
+        Args:
+            text (str): Input text
+
+        Returns:
+            str: Text with phrases replaced
+        """
+        if self._starts is None:
+            # Jumps between characters that can begin a phrase
+            self._starts = re.compile(f"[{re.escape(''.join(self._root))}]") if self._root else None
+            if self._starts is None:
+                return text
+        search = self._starts.search
+        whole_words = self.whole_words
+        parts = []
+        copied = 0  # text[:copied] is already in parts
+        match = search(text)
+        while match is not None:
+            position = match.start()
+            if whole_words and position and text[position - 1].isalnum():
+                match = search(text, position + 1)
+                continue
+            end, replacement = self.longest_match(text, position)
+            if replacement is None:
+                match = search(text, position + 1)
+                continue
+            parts.append(text[copied:position])
+            parts.append(replacement)
+            copied = end
+            match = search(text, end)
+        if not parts:
+            return text
+        parts.append(text[copied:])
+        return ''.join(parts)
@@ -1,35 +1,107 @@
 import re
-import string
 import logging
-import nltk
-from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize
 from nltk.stem import PorterStemmer
 
+from utils.tokenizer import ENGLISH_STOPWORDS, PUNCTUATION, QUOTES, TOKEN_PATTERN, normalize, tokenize
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Indicators match at the start of a word ("hour" also matches "hours"); when
+# several categories are mentioned the first one listed wins
+DURATION_INDICATORS = {
+    'today': ['today', 'just', 'now', 'recent', 'hour', 'morning', 'আজ', 'এখন'],
+    'days': ['day', 'days', 'yesterday', 'few days', 'since monday', 'দিন', 'গতকাল'],
+    'weeks': ['week', 'weeks', 'fortnight', 'several days', 'সপ্তাহ'],
+    'months': ['month', 'months', 'long time', 'chronic', 'years', 'year', 'মাস', 'বছর']
+}
+
+SEVERITY_INDICATORS = {
+    'mild': ['mild', 'slight', 'little', 'minor', 'barely', 'somewhat', 'হালকা'],
+    'moderate': ['moderate', 'medium', 'average', 'noticeable', 'মাঝারি'],
+    'severe': ['severe', 'intense', 'extreme', 'worst', 'unbearable', 'terrible', 'very bad',
+               'তীব্র', 'প্রচণ্ড', 'খুব বেশি']
+}
+
+# Body locations match whole words, optionally pluralised or with "ache"
+# ("headache", "knees"); Bengali terms also match with case endings ("বুকে")
+BODY_LOCATIONS = {
+    'head': ['head', 'মাথা'],
+    'eye': ['eye', 'চোখ'],
+    'ear': ['ear', 'কান'],
+    'nose': ['nose', 'নাক'],
+    'throat': ['throat', 'গলা'],
+    'neck': ['neck', 'ঘাড়'],
+    'chest': ['chest', 'বুক'],
+    'heart': ['heart', 'হৃদ'],
+    'lung': ['lung', 'ফুসফুস'],
+    'abdomen': ['abdomen', 'abdominal', 'stomach', 'belly', 'পেট'],
+    'back': ['back', 'পিঠ', 'কোমর'],
+    'arm': ['arm', 'shoulder', 'elbow', 'wrist', 'হাত', 'কাঁধ'],
+    'leg': ['leg', 'knee', 'ankle', 'foot', 'feet', 'hip', 'হাঁটু'],
+    'joint': ['joint', 'গাঁট', 'গিরা'],
+    'skin': ['skin', 'ত্বক', 'চামড়া'],
+    'tooth': ['tooth', 'teeth', 'দাঁত']
+}
+
+# Cues negating the next few words ("no fever", "don't have a cough") and,
+# for Bengali, the word before them ("জ্বর নেই")
+NEGATION_CUES = ['no', 'not', 'without', 'never', 'none', 'neither', 'nor', 'deny', 'denies', 'denied',
+                 'free of', r"(?:don|doesn|didn|haven|hasn|isn|aren|wasn)(?:'|\s+)?t"]
+NEGATION_POST_CUES = ['নেই', 'নাই', 'না']
+NEGATION_SCOPE = 3  # content words negated after a cue
+SCOPE_BREAKERS = frozenset({'but', 'however', 'although', 'though', 'except', 'yet', 'তবে', 'কিন্তু'})
+
+def _alternation(phrases, literal=True):
+    """Regex alternation of phrases, longest first so longer phrases win at the same position"""
+    phrases = sorted(phrases, key=len, reverse=True)
+    if literal:
+        phrases = [re.escape(phrase) for phrase in phrases]
+    return '|'.join(phrase.replace('\\ ', ' ').replace(' ', r'\s+') for phrase in phrases)
+
+def _lookup(categories):
+    """Indicator -> (priority, category)"""
+    return {
+        indicator: (priority, category)
+        for priority, (category, indicators) in enumerate(categories.items())
+        for indicator in indicators
+    }
+
+_DURATION_LOOKUP = _lookup(DURATION_INDICATORS)
+_SEVERITY_LOOKUP = _lookup(SEVERITY_INDICATORS)
+_LOCATION_LOOKUP = {term: location for location, terms in BODY_LOCATIONS.items() for term in terms}
+# The Bengali danda ends a sentence but stays attached to the word before it
+# in tokens, so the feature scan treats it as a boundary itself
+_BOUNDARIES = re.escape(PUNCTUATION + QUOTES + '।')
+_WORD_START = rf"(?<![^\s{_BOUNDARIES}])"
+_NOT_WORD = rf"(?![^\s{_BOUNDARIES}])"
+
+# Every indicator, body location and negation cue in one compiled pattern,
+# so a single scan of the text finds all of them. It is matched against
+# lowercased text: IGNORECASE makes the scan about twice as slow.
+FEATURE_PATTERN = re.compile(
+    rf"{_WORD_START}(?:"
+    rf"(?P<duration>{_alternation(_DURATION_LOOKUP)})"
+    rf"|(?P<severity>{_alternation(_SEVERITY_LOOKUP)})"
+    rf"|(?P<location>{_alternation(_LOCATION_LOOKUP)})(?:s|es|ache|aches|[\u0980-\u09FF]*){_NOT_WORD}"
+    rf"|(?P<negation>{_alternation(NEGATION_CUES, literal=False)}){_NOT_WORD}"
+    rf"|(?P<post_negation>{_alternation(NEGATION_POST_CUES)}){_NOT_WORD}"
+    rf")"
+)
+_CLAUSE_BREAKS = SCOPE_BREAKERS | frozenset(PUNCTUATION + QUOTES) | {'...', '--', '।'}
+
 class TextProcessor:
     def __init__(self):
         """Initialize the text processor."""
-        # Download NLTK resources if not already downloaded
-        try:
-            nltk.data.find('tokenizers/punkt')
-            nltk.data.find('corpora/stopwords')
-        except LookupError:
-            nltk.download('punkt')
-            nltk.download('stopwords')
-        
         self.stemmer = PorterStemmer()
-        self.stop_words = set(stopwords.words('english'))
         
         # Add medical stop words that shouldn't be removed
-        self.medical_terms = {
+        self.medical_terms = frozenset({
             'pain', 'ache', 'sore', 'hurt', 'fever', 'cough', 'cold',
             'nausea', 'vomit', 'dizzy', 'tired', 'weak', 'fatigue'
-        }
-        self.stop_words = self.stop_words - self.medical_terms
+        })
+        self.stop_words = ENGLISH_STOPWORDS - self.medical_terms
     
     def preprocess(self, text):
         """
@@ -41,16 +113,8 @@ class TextProcessor:
         Returns:
             str: Preprocessed text
         """
-        # Convert to lowercase
-        text = text.lower()
-        
-        # Remove punctuation
-        text = re.sub(f'[{string.punctuation}]', ' ', text)
-        
-        # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text).strip()
-        
-        return text
+        # Lowercase, remove punctuation and extra whitespace
+        return normalize(text)
     
     def tokenize(self, text):
         """
@@ -62,7 +126,7 @@ class TextProcessor:
         Returns:
             list: List of tokens
         """
-        return word_tokenize(text)
+        return tokenize(text)
     
     def remove_stopwords(self, tokens):
         """
@@ -92,52 +156,85 @@ class TextProcessor:
         """
         Extract features from text for ML models.
         
+        Duration, severity, negated terms and body locations are found by one
+        scan with a single compiled pattern; tokens come from one tokenizer
+        pass over the preprocessed text with stopwords filtered on the way.
+        
+        Pass the text as written, not the ``preprocess`` output: negation
+        scope ends at punctuation ("no fever. headache" negates only fever),
+        which preprocessing removes.
+        
         Args:
             text (str): Input text
             
         Returns:
             dict: Features extracted from text
         """
-        # Tokenize
-        tokens = self.tokenize(text)
-        
-        # Remove stopwords
-        filtered_tokens = self.remove_stopwords(tokens)
+        stop_words = self.stop_words
+        tokens = [token for token in tokenize(normalize(text)) if token not in stop_words]
+        duration = severity = None
+        negated_terms = []
+        body_locations = []
+        text = text.lower()
         
-        # Count tokens
-        token_count = len(filtered_tokens)
+        for match in FEATURE_PATTERN.finditer(text):
+            kind = match.lastgroup
+            indicator = match.group(kind)
+            if kind == 'duration':
+                found = _DURATION_LOOKUP[' '.join(indicator.split())]
+                if duration is None or found < duration:
+                    duration = found
+            elif kind == 'severity':
+                found = _SEVERITY_LOOKUP[' '.join(indicator.split())]
+                if severity is None or found < severity:
+                    severity = found
+            elif kind == 'location':
+                location = _LOCATION_LOOKUP[indicator]
+                if location not in body_locations:
+                    body_locations.append(location)
+            elif kind == 'negation':
+                scope = self._negation_scope(text, match.end())
+                negated_terms.extend(term for term in scope if term not in negated_terms)
+            else:
+                # Bengali negation follows the word it negates
+                preceding = [token for token in tokenize(text[:match.start()]) if token not in stop_words]
+                if preceding and preceding[-1] not in _CLAUSE_BREAKS and preceding[-1] not in negated_terms:
+                    negated_terms.append(preceding[-1])
         
-        # Extract symptom duration indicators
-        duration_indicators = {
-            'today': ['today', 'just', 'now', 'recent', 'hour', 'morning'],
-            'days': ['day', 'days', 'yesterday', 'few days', 'since monday'],
-            'weeks': ['week', 'weeks', 'fortnight', 'several days'],
-            'months': ['month', 'months', 'long time', 'chronic', 'years', 'year']
+        # Return features
+        return {
+            'token_count': len(tokens),
+            'duration': duration[1] if duration else 'unknown',
+            'severity': severity[1] if severity else 'unknown',
+            'tokens': tokens,
+            'negated_terms': negated_terms,
+            'body_locations': body_locations
         }
-        
-        duration = 'unknown'
-        for dur, indicators in duration_indicators.items():
-            if any(ind in text for ind in indicators):
-                duration = dur
+    
+    def _negation_scope(self, text, start):
+        """Content words negated by a cue ending at ``start``: the next few, up to a clause break"""
+        scope = []
+        for match in TOKEN_PATTERN.finditer(text, start):
+            token = match.group()
+            if token in _CLAUSE_BREAKS or len(scope) >= NEGATION_SCOPE:
                 break
-        
-        # Extract symptom severity indicators
-        severity_indicators = {
-            'mild': ['mild', 'slight', 'little', 'minor', 'barely', 'somewhat'],
-            'moderate': ['moderate', 'medium', 'average', 'noticeable'],
-            'severe': ['severe', 'intense', 'extreme', 'worst', 'unbearable', 'terrible', 'very bad']
-        }
-        
-        severity = 'unknown'
-        for sev, indicators in severity_indicators.items():
-            if any(ind in text for ind in indicators):
-                severity = sev
+            sentence_end = token.endswith('।')
+            token = token.rstrip('।')
+            if token not in self.stop_words:
+                scope.append(token)
+            if sentence_end:
                 break
+        return scope
+    
+    def extract_features_batch(self, texts):
+        """
+        Extract features for a list of texts.
         
-        # Return features
-        return {
-            'token_count': token_count,
-            'duration': duration,
-            'severity': severity,
-            'tokens': filtered_tokens
-        }
+        Args:
+            texts (list): Input texts, as written (see ``extract_features``)
+            
+        Returns:
+            list: One features dict per text, in order
+        """
+        extract_features = self.extract_features
+        return [extract_features(text) for text in texts]
@@ -0,0 +1,75 @@
+import re
+import string
+
+# ASCII punctuation removed by normalize(). Backslash stays: the historical
+# f'[{string.punctuation}]' pattern read it as an escape, so never matched it.
+PUNCTUATION = string.punctuation.replace('\\', '')
+PUNCTUATION_PATTERN = re.compile(f'[{re.escape(PUNCTUATION)}]+')
+
+# Opening/closing typographic quotes, split off as tokens like NLTK's Treebank rules
+QUOTES = '«“‘„»”’'
+
+# A word: anything that is not whitespace, punctuation or a quote, so Bengali
+# vowel signs and the virama (which are not \w) stay inside their word.
+# Hyphens and periods between word characters are kept ("well-known", "3.5").
+_WORD = rf"[^\s{re.escape(PUNCTUATION + QUOTES)}]"
+TOKEN_PATTERN = re.compile(
+    # NLTK's fused forms: cannot, gimme, gonna, gotta, lemme, wanna
+    rf"(?=[cglw])\b(?:can(?=not\b)|gim(?=me\b)|gon(?=na\b)|got(?=ta\b)|lem(?=me\b)|wan(?=na(?![-.]?{_WORD})))"
+    rf"|{_WORD}+?(?=n't\b)"                     # "do" of "don't"
+    rf"|n't\b"                                  # the negation itself
+    rf"|'(?:(?:s|re|ve|ll|d|m)\b"               # clitics: 's 're 've 'll 'd 'm
+    rf"|ye\b(?<=\bd'ye)|n\b(?<=\bmore'n)"       # d'ye, more'n
+    rf"|(?<!\S')t(?=(?:is|was)\b))"             # 'tis, 'twas
+    rf"|{_WORD}+(?:[-.]{_WORD}+)*"              # words, numbers, hyphenated words
+    rf"|\.\.\.|--"                              # ellipsis and double dash stay whole
+    rf"|[{re.escape(PUNCTUATION + QUOTES)}]",   # any other punctuation, one per token
+    re.IGNORECASE
+)
+
+# NLTK's English stopword list (nltk_data corpora/stopwords/english)
+ENGLISH_STOPWORDS = frozenset("""
+i me my myself we our ours ourselves you you're you've you'll you'd your yours
+yourself yourselves he him his himself she she's her hers herself it it's its
+itself they them their theirs themselves what which who whom this that that'll
+these those am is are was were be been being have has had having do does did
+doing a an the and but if or because as until while of at by for with about
+against between into through during before after above below to from up down
+in out on off over under again further then once here there when where why how
+all any both each few more most other some such no nor not only own same so
+than too very s t can will just don don't should should've now d ll m o re ve
+y ain aren aren't couldn couldn't didn didn't doesn doesn't hadn hadn't hasn
+hasn't haven haven't isn isn't ma mightn mightn't mustn mustn't needn needn't
+shan shan't shouldn shouldn't wasn wasn't weren weren't won won't wouldn
+wouldn't
+""".split())
+
+def normalize(text):
+    """
+    Lowercase text, replace ASCII punctuation with spaces and collapse whitespace.
+
+    Args:
+        text (str): Input text (English, Bengali or mixed)
+
+    Returns:
+        str: Normalized text
+    """
+    return ' '.join(PUNCTUATION_PATTERN.sub(' ', text.lower()).split())
+
+def tokenize(text):
+    """
+    Split text into word tokens.
+
+    On normalized text this gives the same tokens as NLTK's ``word_tokenize``
+    (whitespace-separated words, typographic quotes split off); on raw text
+    it also splits punctuation, English contractions and NLTK's fused forms
+    ("cannot" -> can, not; "gonna" -> gon, na) the same way for common
+    input, without needing the punkt model.
+
+    Args:
+        text (str): Input text
+
+    Returns:
+        list: List of tokens
+    """
+    return TOKEN_PATTERN.findall(text)
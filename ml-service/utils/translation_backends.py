@@ -0,0 +1,77 @@
+import logging
+import requests
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class DictionaryBackend:
+    def __init__(self, translate):
+        """
+        Local translation backend using the built-in dictionary.
+
+        Args:
+            translate (callable): ``translate(text, source, target)`` for one text
+        """
+        self.translate = translate
+
+    def translate_batch(self, texts, source, target):
+        """
+        Translate a batch of texts.
+
+        Args:
+            texts (list): Texts to translate
+            source (str): Source language code
+            target (str): Target language code
+
+        Returns:
+            list: Translations, in order
+        """
+        return [self.translate(text, source, target) for text in texts]
+
+class HttpTranslationBackend:
+    def __init__(self, url, api_key=None, timeout=5.0):
+        """
+        External translation service, called with whole batches.
+
+        The service receives ``POST {url}`` with
+        ``{"texts": [...], "source": "bn", "target": "en"}`` and answers
+        ``{"translations": [...]}`` in the same order. A pooled session keeps
+        the connection open between batches.
+        ``scripts/translation_stub_server.py`` implements the protocol locally.
+
+        Args:
+            url (str): Batch translation endpoint
+            api_key (str): Bearer token, if the service needs one
+            timeout (float): Request timeout in seconds
+        """
+        self.url = url
+        self.timeout = timeout
+        self.session = requests.Session()
+        if api_key:
+            self.session.headers['Authorization'] = f'Bearer {api_key}'
+
+    def translate_batch(self, texts, source, target):
+        """
+        Translate a batch of texts with one request.
+
+        Args:
+            texts (list): Texts to translate
+            source (str): Source language code
+            target (str): Target language code
+
+        Returns:
+            list: Translations, in order
+        """
+        response = self.session.post(
+            self.url,
+            json={'texts': list(texts), 'source': source, 'target': target},
+            timeout=self.timeout
+        )
+        if response.status_code != 200:
+            raise Exception(f"API error: {response.status_code}")
+
+        translations = response.json()['translations']
+        if len(translations) != len(texts):
+            raise Exception(f"API returned {len(translations)} translations for {len(texts)} texts")
+        return translations
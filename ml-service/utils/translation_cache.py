@@ -0,0 +1,139 @@
+import logging
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def normalize_phrase(text):
+    """
+    Cache key form of a phrase: lowercase with whitespace collapsed.
+
+    Args:
+        text (str): Phrase
+
+    Returns:
+        str: Normalized phrase
+    """
+    return ' '.join(text.lower().split())
+
+class TranslationCache:
+    def __init__(self, max_size=10000, path=None):
+        """
+        Two-level translation cache keyed by (source, target, normalized phrase).
+
+        An in-process LRU answers repeated phrases without any I/O. With a
+        ``path``, entries are also persisted in SQLite, so they survive
+        restarts and are shared by every worker on the host; disk hits are
+        promoted into the LRU.
+
+        Args:
+            max_size (int): Maximum LRU entries
+            path (str): Optional SQLite file for the persistent cache
+        """
+        self.max_size = max_size
+        self.path = path
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        self.stats = {'hits': 0, 'disk_hits': 0, 'misses': 0}
+
+        if path:
+            try:
+                directory = os.path.dirname(os.path.abspath(path))
+                os.makedirs(directory, exist_ok=True)
+                self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+                self._db.execute('PRAGMA journal_mode=WAL')
+                self._db.execute(
+                    'CREATE TABLE IF NOT EXISTS translations ('
+                    'source TEXT, target TEXT, phrase TEXT, translation TEXT, '
+                    'PRIMARY KEY (source, target, phrase))'
+                )
+            except sqlite3.Error as e:
+                logger.error(f"Error opening translation cache {path}: {str(e)}")
+                self._db = None
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get_many(self, phrases, source, target):
+        """
+        Look up normalized phrases.
+
+        Args:
+            phrases (list): Normalized phrases
+            source (str): Source language code
+            target (str): Target language code
+
+        Returns:
+            dict: Phrase -> translation for the phrases found
+        """
+        found = {}
+        missing = []
+        with self._lock:
+            for phrase in phrases:
+                key = (source, target, phrase)
+                translation = self._entries.get(key)
+                if translation is None:
+                    missing.append(phrase)
+                    continue
+                self._entries.move_to_end(key)
+                found[phrase] = translation
+            self.stats['hits'] += len(found)
+
+            if missing and self._db is not None:
+                stored = self._select(missing, source, target)
+                for phrase, translation in stored.items():
+                    self._store((source, target, phrase), translation)
+                found.update(stored)
+                self.stats['disk_hits'] += len(stored)
+            self.stats['misses'] += len(phrases) - len(found)
+        return found
+
+    def put_many(self, translations, source, target):
+        """
+        Store translations of normalized phrases.
+
+        Args:
+            translations (dict): Phrase -> translation
+            source (str): Source language code
+            target (str): Target language code
+        """
+        if not translations:
+            return
+        with self._lock:
+            for phrase, translation in translations.items():
+                self._store((source, target, phrase), translation)
+            if self._db is not None:
+                try:
+                    self._db.executemany(
+                        'INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?)',
+                        [(source, target, phrase, translation) for phrase, translation in translations.items()]
+                    )
+                except sqlite3.Error as e:
+                    logger.error(f"Error writing translation cache: {str(e)}")
+
+    def _store(self, key, translation):
+        self._entries[key] = translation
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def _select(self, phrases, source, target):
+        """Disk lookup, in chunks below SQLite's bound-parameter limit"""
+        stored = {}
+        try:
+            for start in range(0, len(phrases), 500):
+                chunk = phrases[start:start + 500]
+                rows = self._db.execute(
+                    'SELECT phrase, translation FROM translations WHERE source = ? AND target = ? '
+                    f"AND phrase IN ({', '.join('?' * len(chunk))})",
+                    [source, target, *chunk]
+                )
+                stored.update(rows)
+        except sqlite3.Error as e:
+            logger.error(f"Error reading translation cache: {str(e)}")
+        return stored
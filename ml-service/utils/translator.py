@@ -1,20 +1,87 @@
 import logging
-import requests
 import os
+import re
 import json
+import threading
+from concurrent.futures import Future
+from difflib import SequenceMatcher
+
+from utils.phrase_trie import PhraseTrie
+from utils.translation_backends import DictionaryBackend, HttpTranslationBackend
+from utils.translation_cache import TranslationCache, normalize_phrase
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Phrases are translated and cached between these delimiters
+SEGMENT_PATTERN = re.compile(r'([।,.;:!?\n]+)')
+WHITESPACE_PATTERN = re.compile(r'(\s+)')
+
+def _apply_translation(segment, translation):
+    """
+    Put a normalized phrase's translation back into the segment it came from.
+
+    Phrases are translated in their normalized (lowercase, single-spaced)
+    form. Runs of words the translation left unchanged are taken from the
+    original segment, with its case and spacing; only the translated runs
+    come from the translation.
+
+    Args:
+        segment (str): Original text between delimiters
+        translation (str): Translation of ``normalize_phrase(segment)``
+
+    Returns:
+        str: Translated segment
+    """
+    leading = segment[:len(segment) - len(segment.lstrip())]
+    trailing = segment[len(segment.rstrip()):]
+    parts = WHITESPACE_PATTERN.split(segment.strip())
+    words, separators = parts[::2], parts[1::2]
+    translated = translation.split()
+    
+    # (text, first original word, end original word) per output run
+    runs = []
+    matcher = SequenceMatcher(None, [word.lower() for word in words], translated, autojunk=False)
+    for tag, start, end, translated_start, translated_end in matcher.get_opcodes():
+        if tag == 'equal':
+            text = ''.join(
+                word + (separators[index] if index < end - 1 else '')
+                for index, word in enumerate(words[start:end], start)
+            )
+        else:
+            text = ' '.join(translated[translated_start:translated_end])
+        if text:
+            runs.append((text, start, end))
+    
+    pieces = []
+    for index, (text, start, end) in enumerate(runs):
+        if index:
+            previous_end = runs[index - 1][2]
+            # Keep the original spacing where the runs meet at an original word boundary
+            pieces.append(separators[start - 1] if previous_end == start and 0 < start < len(words) else ' ')
+        pieces.append(text)
+    return f"{leading}{''.join(pieces)}{trailing}"
+
 class Translator:
-    def __init__(self):
+    def __init__(self, lexicon_path=None, backend=None, cache=None):
         """
         Initialize the translator.
         
         In a production environment, this would use a proper translation API
         like Google Translate, Microsoft Translator, or a custom NMT model.
         For this example, we'll use a simplified approach.
+        
+        Args:
+            lexicon_path (str): Optional JSON file of extra Bengali -> English
+                entries (defaults to the TRANSLATOR_LEXICON_PATH environment
+                variable)
+            backend: Object with ``translate_batch(texts, source, target)``;
+                defaults to the external API when TRANSLATOR_API_URL is set,
+                else the built-in dictionary
+            cache (TranslationCache): Phrase cache; defaults to an LRU of
+                TRANSLATION_CACHE_SIZE entries, persisted to
+                TRANSLATION_CACHE_PATH when set
         """
         # Load basic Bengali-English dictionary for common medical terms
         self.bn_to_en = {
@@ -45,11 +112,40 @@ class Translator:
             'হৃদরোগ': 'heart disease'
         }
         
+        lexicon_path = lexicon_path or os.environ.get('TRANSLATOR_LEXICON_PATH')
+        if lexicon_path:
+            self.bn_to_en.update(self._load_lexicon(lexicon_path))
+        
         # English to Bengali dictionary (reverse of above)
         self.en_to_bn = {v: k for k, v in self.bn_to_en.items()}
         
+        # Longest-match phrase tries; English phrases only match whole words
+        self.bn_to_en_trie = PhraseTrie(self.bn_to_en)
+        self.en_to_bn_trie = PhraseTrie(self.en_to_bn, whole_words=True)
+        
         # API key for translation service (if using external API)
         self.api_key = os.environ.get('TRANSLATOR_API_KEY')
+        
+        if backend is None:
+            api_url = os.environ.get('TRANSLATOR_API_URL')
+            if api_url:
+                backend = HttpTranslationBackend(api_url, self.api_key)
+            else:
+                backend = DictionaryBackend(self._dictionary_translate)
+        self.backend = backend
+        self.batch_size = int(os.environ.get('TRANSLATOR_BATCH_SIZE') or 64)
+        
+        if cache is None:
+            cache = TranslationCache(
+                max_size=int(os.environ.get('TRANSLATION_CACHE_SIZE') or 10000),
+                path=os.environ.get('TRANSLATION_CACHE_PATH')
+            )
+        self.cache = cache
+        
+        # Phrases currently being translated, so concurrent callers share one backend call
+        self._in_flight = {}
+        self._in_flight_lock = threading.Lock()
+        self.stats = {'backend_calls': 0, 'backend_phrases': 0, 'coalesced': 0}
     
     def translate(self, text, source='bn', target='en'):
         """
@@ -67,43 +163,162 @@ class Translator:
         if source == target:
             return text
         
-        try:
-            # If using an external API (in production)
-            if self.api_key:
-                return self._translate_with_api(text, source, target)
+        return self.translate_batch([text], source, target)[0]
+    
+    def translate_batch(self, texts, source='bn', target='en'):
+        """
+        Translate several texts with at most one backend call per batch of new phrases.
+        
+        Texts are split into phrases at punctuation, and phrases are
+        translated and cached in normalized form (see ``normalize_phrase``);
+        words a translation leaves unchanged keep their original case and
+        spacing. Phrases already in the cache are answered locally, phrases
+        another thread is translating right now are awaited instead of
+        requested again, and the rest go to the backend together.
+        
+        Args:
+            texts (list): Texts to translate
+            source (str): Source language code ('en' or 'bn')
+            target (str): Target language code ('en' or 'bn')
             
-            # Simple dictionary-based translation for demo
-            return self._dictionary_translate(text, source, target)
+        Returns:
+            list: Translated texts, in order
+        """
+        if source == target:
+            return list(texts)
         
+        segmented = []
+        for text in texts:
+            try:
+                segmented.append(SEGMENT_PATTERN.split(text))
+            except Exception as e:
+                logger.error(f"Translation error: {str(e)}")
+                segmented.append(None)
+        phrases = list(dict.fromkeys(
+            normalize_phrase(segment)
+            for segments in segmented if segments is not None
+            for segment in segments[::2]
+            if segment.strip()
+        ))
+        try:
+            translations = self._translate_phrases(phrases, source, target)
         except Exception as e:
             logger.error(f"Translation error: {str(e)}")
-            # Return original text if translation fails
-            return text
+            translations = {}
+        
+        results = []
+        for text, segments in zip(texts, segmented):
+            # Phrases (even positions) are replaced, delimiters kept as is
+            for index in range(0, len(segments or []), 2):
+                segment = segments[index]
+                phrase = normalize_phrase(segment)
+                if phrase:
+                    if phrase not in translations:
+                        segments = None
+                        break
+                    segments[index] = _apply_translation(segment, translations[phrase])
+            # Return the original text if any part of it failed to translate
+            results.append(text if segments is None else ''.join(segments))
+        return results
     
-    def _translate_with_api(self, text, source, target):
+    def _translate_phrases(self, phrases, source, target):
         """
-        Translate text using an external API.
-        This is a placeholder for actual API implementation.
+        Translate normalized phrases through the cache, in-flight requests and the backend.
+        
+        A backend batch that fails is retried phrase by phrase, so one bad
+        phrase doesn't cost the others their translation.
+        
+        Args:
+            phrases (list): Unique normalized phrases
+            source (str): Source language code
+            target (str): Target language code
+            
+        Returns:
+            dict: Phrase -> translation, without the phrases that failed
         """
-        # In a real implementation, this would call a translation API
-        # Example with a generic REST API:
+        translations = self.cache.get_many(phrases, source, target)
+        
+        owned, waiting = [], {}
+        with self._in_flight_lock:
+            for phrase in phrases:
+                if phrase in translations:
+                    continue
+                key = (source, target, phrase)
+                future = self._in_flight.get(key)
+                if future is None:
+                    future = self._in_flight[key] = Future()
+                    owned.append(phrase)
+                else:
+                    self.stats['coalesced'] += 1
+                waiting[phrase] = future
+        
+        if owned:
+            fetched, errors = {}, {}
+            try:
+                for start in range(0, len(owned), self.batch_size):
+                    translated, failed = self._fetch(owned[start:start + self.batch_size], source, target)
+                    fetched.update(translated)
+                    errors.update(failed)
+                try:
+                    self.cache.put_many(fetched, source, target)
+                except Exception as e:
+                    logger.error(f"Translation cache error: {str(e)}")
+            finally:
+                for phrase in owned:
+                    if phrase in fetched:
+                        waiting[phrase].set_result(fetched[phrase])
+                    else:
+                        waiting[phrase].set_exception(errors.get(phrase) or LookupError(f"No translation for {phrase!r}"))
+                with self._in_flight_lock:
+                    for phrase in owned:
+                        self._in_flight.pop((source, target, phrase), None)
+        
+        for phrase, future in waiting.items():
+            if future.exception() is None:
+                translations[phrase] = future.result()
+        return translations
+    
+    def _fetch(self, phrases, source, target):
         """
-        response = requests.post(
-            'https://api.translation-service.com/translate',
-            headers={'Authorization': f'Bearer {self.api_key}'},
-            json={
-                'text': text,
-                'source': source,
-                'target': target
-            }
-        )
-        
-        if response.status_code == 200:
-            return response.json()['translation']
-        else:
-            raise Exception(f"API error: {response.status_code}")
+        Translate phrases with one backend call, retrying them one by one if it fails.
+        
+        Returns:
+            tuple: (phrase -> translation, phrase -> exception)
         """
-        pass
+        self.stats['backend_calls'] += 1
+        self.stats['backend_phrases'] += len(phrases)
+        try:
+            return dict(zip(phrases, self.backend.translate_batch(phrases, source, target))), {}
+        except Exception as e:
+            logger.error(f"Translation error: {str(e)}")
+            if len(phrases) == 1:
+                return {}, {phrases[0]: e}
+        
+        fetched, errors = {}, {}
+        for phrase in phrases:
+            translated, failed = self._fetch([phrase], source, target)
+            fetched.update(translated)
+            errors.update(failed)
+        return fetched, errors
+    
+    def _load_lexicon(self, path):
+        """
+        Load Bengali -> English entries from a JSON object.
+        
+        Args:
+            path (str): Path to the lexicon file
+            
+        Returns:
+            dict: Lexicon entries (empty if the file can't be read)
+        """
+        try:
+            with open(path, encoding='utf-8') as f:
+                lexicon = json.load(f)
+            logger.info(f"Loaded {len(lexicon)} lexicon entries from {path}")
+            return lexicon
+        except (OSError, ValueError) as e:
+            logger.error(f"Error loading lexicon {path}: {str(e)}")
+            return {}
     
     def _dictionary_translate(self, text, source, target):
         """
@@ -111,15 +326,11 @@ class Translator:
         This is a simplified approach for demonstration.
         """
         if source == 'bn' and target == 'en':
-            dictionary = self.bn_to_en
+            trie = self.bn_to_en_trie
         elif source == 'en' and target == 'bn':
-            dictionary = self.en_to_bn
+            trie = self.en_to_bn_trie
         else:
             return text
         
-        # Simple word replacement
-        translated_text = text
-        for word, translation in dictionary.items():
-            translated_text = translated_text.replace(word, translation)
-        
-        return translated_text
+        # Longest-match phrase replacement in one pass
+        return trie.replace(text)